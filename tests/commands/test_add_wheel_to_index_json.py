@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from shutil import copy
+
+import pytest
+from variantlib.commands.add_wheel_to_index_json import NotWheelVariantError
+from variantlib.commands.main import main
+from variantlib.constants import NULL_VARIANT_LABEL
+
+ARTIFACT_DIR = Path("tests/artifacts/test-package/dist")
+WHEELS = [
+    f"test_package-0-py3-none-any-{NULL_VARIANT_LABEL}.whl",
+    "test_package-0-py3-none-any-5d8be4b9.whl",
+    "test_package-0-py3-none-any-fbe82642.whl",
+]
+
+
+@pytest.fixture
+def expected_json(tmp_path: Path) -> str:
+    index_dir = tmp_path / "index"
+    index_dir.mkdir()
+    for filename in WHEELS:
+        copy(ARTIFACT_DIR / filename, index_dir / filename)
+    main(["generate-index-json", "-d", str(index_dir)])
+    return (index_dir / "test_package-0-variants.json").read_text()
+
+
+def test_add_wheels(tmp_path: Path, expected_json: str) -> None:
+    main(
+        [
+            "add-wheel-to-index-json",
+            "-o",
+            str(tmp_path),
+            "-f",
+            *(str(ARTIFACT_DIR / filename) for filename in WHEELS),
+        ]
+    )
+    assert (tmp_path / "test_package-0-variants.json").read_text() == expected_json
+    # The lock file is hidden, so that it can be excluded from publishing
+    assert [path.name for path in tmp_path.glob("*.lock")] == [
+        ".test_package-0-variants.json.lock"
+    ]
+
+
+def test_add_wheels_glob_and_input(tmp_path: Path, expected_json: str) -> None:
+    output_file = tmp_path / "test_package-0-variants.json"
+    main(
+        [
+            "add-wheel-to-index-json",
+            "-o",
+            str(tmp_path),
+            "-f",
+            str(ARTIFACT_DIR / WHEELS[0]),
+        ]
+    )
+    main(
+        [
+            "add-wheel-to-index-json",
+            "-i",
+            str(output_file),
+            "-o",
+            str(tmp_path),
+            "-w",
+            "-f",
+            str(ARTIFACT_DIR / "test_package-0-py3-none-any-[5f][db]*.whl"),
+        ]
+    )
+    assert output_file.read_text() == expected_json
+
+
+def test_add_wheels_not_variant(tmp_path: Path) -> None:
+    with pytest.raises(NotWheelVariantError):
+        main(
+            [
+                "add-wheel-to-index-json",
+                "-o",
+                str(tmp_path),
+                "-f",
+                str(ARTIFACT_DIR / "test_package-0-py3-none-any.whl"),
+                str(ARTIFACT_DIR / WHEELS[0]),
+            ]
+        )
+    assert not (tmp_path / "test_package-0-variants.json").exists()
+
+
+def test_add_wheels_missing(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError, match="File not found"):
+        main(
+            [
+                "add-wheel-to-index-json",
+                "-o",
+                str(tmp_path),
+                "-f",
+                str(ARTIFACT_DIR / "nonexistent-*.whl"),
+            ]
+        )
+
+
+def test_add_wheels_concurrent(tmp_path: Path, expected_json: str) -> None:
+    output_file = tmp_path / "test_package-0-variants.json"
+    main(
+        [
+            "add-wheel-to-index-json",
+            "-o",
+            str(tmp_path),
+            "-f",
+            str(ARTIFACT_DIR / WHEELS[0]),
+        ]
+    )
+
+    def add_wheel(filename: str) -> None:
+        main(
+            [
+                "add-wheel-to-index-json",
+                "-i",
+                str(output_file),
+                "-o",
+                str(tmp_path),
+                "-w",
+                "-f",
+                str(ARTIFACT_DIR / filename),
+            ]
+        )
+
+    threads = [
+        threading.Thread(target=add_wheel, args=(filename,)) for filename in WHEELS[1:]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert output_file.read_text() == expected_json
@@ -2,10 +2,20 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import pytest
+from variantlib.api import check_variant_supported
+from variantlib.api import get_variant_label
+from variantlib.api import get_variants_by_priority
 from variantlib.commands.main import main
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantProperty
+from variantlib.models.variant_info import ProviderInfo
+from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
+from variantlib.variants_json import VariantsJson
 
 if TYPE_CHECKING:
-    import pytest
+    from pathlib import Path
 
 
 def test_analyze_platform(
@@ -26,3 +36,86 @@ def test_analyze_platform(
 #############################################################################
 """
     )
+
+
+def test_analyze_platform_profile(
+    capsys: pytest.CaptureFixture[str],
+    mocked_entry_points: None,
+    tmp_path: Path,
+) -> None:
+    main(["analyze-platform", "--profile"])
+    snapshot = PlatformSnapshot.from_str(capsys.readouterr().out)
+    assert snapshot.supported_properties == [
+        VariantProperty("test_namespace", "name1", "val1a"),
+        VariantProperty("test_namespace", "name1", "val1b"),
+        VariantProperty("test_namespace", "name2", "val2a"),
+        VariantProperty("test_namespace", "name2", "val2b"),
+        VariantProperty("test_namespace", "name2", "val2c"),
+        VariantProperty("second_namespace", "name3", "val3a"),
+    ]
+    assert "python-version" in snapshot.environment
+
+    main(["analyze-platform", "-o", str(tmp_path / "profile.json")])
+    assert capsys.readouterr().out == ""
+    assert (
+        PlatformSnapshot.from_str((tmp_path / "profile.json").read_text()).to_dict()
+        == snapshot.to_dict()
+    )
+
+
+@pytest.mark.parametrize("enable_optional_plugins", [False, True, ["second_namespace"]])
+def test_analyze_platform_profile_resolve(
+    capsys: pytest.CaptureFixture[str],
+    mocked_entry_points: None,
+    enable_optional_plugins: bool | list[str],
+) -> None:
+    main(["analyze-platform", "--profile"])
+    snapshot = PlatformSnapshot.from_str(capsys.readouterr().out)
+
+    variants_json = VariantsJson(
+        VariantInfo(
+            namespace_priorities=["test_namespace", "second_namespace", "aot"],
+            providers={
+                "test_namespace": ProviderInfo(
+                    requires=["variantlib"],
+                    plugin_api="tests.mocked_plugins:MockedPluginA",
+                ),
+                "second_namespace": ProviderInfo(
+                    requires=["variantlib"],
+                    plugin_api="tests.mocked_plugins:MockedPluginB",
+                    optional=True,
+                ),
+                "aot": ProviderInfo(plugin_api="aot_plugin", install_time=False),
+            },
+            static_properties={"aot": {"f": ["v"]}},
+        )
+    )
+    for vdesc in [
+        VariantDescription([VariantProperty("test_namespace", "name1", "val1a")]),
+        VariantDescription([VariantProperty("second_namespace", "name3", "val3a")]),
+        VariantDescription([VariantProperty("aot", "f", "v")]),
+        VariantDescription([VariantProperty("aot", "f", "w")]),
+    ]:
+        variants_json.variants[get_variant_label(vdesc)] = vdesc
+
+    # The static properties of the package are not a part of the profile
+    assert all(vprop.namespace != "aot" for vprop in snapshot.supported_properties)
+
+    expected = get_variants_by_priority(
+        variants_json=variants_json, enable_optional_plugins=enable_optional_plugins
+    )
+    assert (
+        get_variants_by_priority(
+            variants_json=variants_json,
+            enable_optional_plugins=enable_optional_plugins,
+            platform_snapshot=snapshot,
+        )
+        == expected
+    )
+    for label, vdesc in variants_json.variants.items():
+        assert check_variant_supported(
+            vdesc=vdesc,
+            variant_info=variants_json,
+            enable_optional_plugins=enable_optional_plugins,
+            platform_snapshot=snapshot,
+        ) is (label in expected)
@@ -5,6 +5,8 @@ from pathlib import Path
 from shutil import copy
 from typing import TYPE_CHECKING
 
+import pytest
+from variantlib.commands import generate_index_json
 from variantlib.commands.main import main
 from variantlib.constants import NULL_VARIANT_LABEL
 from variantlib.constants import VARIANT_INFO_DEFAULT_PRIO_KEY
@@ -12,12 +14,16 @@ from variantlib.constants import VARIANT_INFO_NAMESPACE_KEY
 from variantlib.constants import VARIANT_INFO_PROVIDER_DATA_KEY
 from variantlib.constants import VARIANT_INFO_PROVIDER_OPTIONAL_KEY
 from variantlib.constants import VARIANT_INFO_PROVIDER_REQUIRES_KEY
+from variantlib.constants import VARIANTS_JSON_MANIFEST_FILENAME
+from variantlib.constants import VARIANTS_JSON_RESOLUTION_TABLE_KEY
 from variantlib.constants import VARIANTS_JSON_SCHEMA_KEY
 from variantlib.constants import VARIANTS_JSON_SCHEMA_URL
 from variantlib.constants import VARIANTS_JSON_VARIANT_DATA_KEY
+from variantlib.resolution_table import ResolutionTable
+from variantlib.variants_json import VariantsJson
 
 if TYPE_CHECKING:
-    import pytest
+    import pytest_mock
 
 
 def test_generate_index_json(
@@ -79,3 +85,134 @@ def test_duplicate_descriptions(
         "Multiple `test_package-0` wheels share the same variant properties: "
         "all of ['60567bd9', 'foo'] correspond to variant hash `60567bd9`"
     ) in caplog.text
+
+
+def test_generate_index_json_compact(tmp_path: Path) -> None:
+    filename = "test_package-0-py3-none-any-5d8be4b9.whl"
+    copy(Path("tests/artifacts/test-package/dist") / filename, tmp_path / filename)
+
+    main(["generate-index-json", "-d", str(tmp_path), "--compact"])
+    compact = (tmp_path / "test_package-0-variants.json").read_text()
+    assert "\n" not in compact
+
+    main(["generate-index-json", "-d", str(tmp_path)])
+    indented = (tmp_path / "test_package-0-variants.json").read_text()
+    assert json.loads(compact) == json.loads(indented)
+    assert compact == json.dumps(
+        json.loads(indented), sort_keys=True, separators=(",", ":")
+    )
+
+
+def test_generate_index_json_resolution_table(tmp_path: Path) -> None:
+    artifact_dir = Path("tests/artifacts/test-package/dist")
+    for wheel in artifact_dir.glob("test_package-0-*.whl"):
+        copy(wheel, tmp_path / wheel.name)
+    output_file = tmp_path / "test_package-0-variants.json"
+
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert VARIANTS_JSON_RESOLUTION_TABLE_KEY not in json.loads(output_file.read_text())
+
+    # Changing the option regenerates all files.
+    main(
+        [
+            "generate-index-json",
+            "-d",
+            str(tmp_path),
+            "--incremental",
+            "--resolution-table",
+        ]
+    )
+    variants_json = VariantsJson(json.loads(output_file.read_text()))
+    assert variants_json.resolution_table == ResolutionTable.build(
+        variants_json.variants, variants_json
+    )
+
+
+def test_generate_index_json_jobs(tmp_path: Path) -> None:
+    artifact_dir = Path("tests/artifacts/test-package/dist")
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    for wheel in artifact_dir.glob("*.whl"):
+        copy(wheel, serial_dir / wheel.name)
+        copy(wheel, parallel_dir / wheel.name)
+
+    main(["generate-index-json", "-d", str(serial_dir)])
+    main(["generate-index-json", "-d", str(parallel_dir), "--jobs", "4"])
+
+    serial_files = sorted(serial_dir.glob("*.json"))
+    assert serial_files
+    for serial_file in serial_files:
+        assert (parallel_dir / serial_file.name).read_text() == serial_file.read_text()
+    assert {path.name for path in serial_dir.glob("*.lock")} == {
+        f".{serial_file.name}.lock" for serial_file in serial_files
+    }
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1"])
+def test_generate_index_json_invalid_jobs(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], jobs: str
+) -> None:
+    with pytest.raises(SystemExit):
+        main(["generate-index-json", "-d", str(tmp_path), "--jobs", jobs])
+    assert f"error: --jobs must be at least 1, got {jobs}" in capsys.readouterr().err
+
+
+def test_generate_index_json_incremental(
+    tmp_path: Path, mocker: pytest_mock.MockerFixture
+) -> None:
+    artifact_dir = Path("tests/artifacts/test-package/dist")
+    filenames = [
+        "test_package-0-py3-none-any-5d8be4b9.whl",
+        "test_package-0-py3-none-any-60567bd9.whl",
+        "test_package-0-py3-none-any-fbe82642.whl",
+    ]
+    for filename in filenames:
+        copy(artifact_dir / filename, tmp_path / filename)
+    output_file = tmp_path / "test_package-0-variants.json"
+    read_wheel = mocker.spy(generate_index_json, "_read_wheel")
+
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert read_wheel.call_count == 3
+    assert (tmp_path / VARIANTS_JSON_MANIFEST_FILENAME).exists()
+    full_output = output_file.read_text()
+    main(["generate-index-json", "-d", str(tmp_path)])
+    assert output_file.read_text() == full_output
+
+    # Nothing changed, nothing is rewritten.
+    output_file.write_text("unchanged")
+    read_wheel.reset_mock()
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert read_wheel.call_count == 0
+    assert output_file.read_text() == "unchanged"
+
+    # Removed output files are regenerated from the manifest.
+    output_file.unlink()
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert read_wheel.call_count == 0
+    assert output_file.read_text() == full_output
+
+    # Only the new wheel is read.
+    copy(
+        artifact_dir / f"test_package-0-py3-none-any-{NULL_VARIANT_LABEL}.whl",
+        tmp_path / f"test_package-0-py3-none-any-{NULL_VARIANT_LABEL}.whl",
+    )
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert read_wheel.call_count == 1
+    assert NULL_VARIANT_LABEL in json.loads(output_file.read_text())["variants"]
+    incremental_output = output_file.read_text()
+    main(["generate-index-json", "-d", str(tmp_path)])
+    assert output_file.read_text() == incremental_output
+
+    # Removed wheels are removed from the output.
+    for filename in filenames:
+        (tmp_path / filename).unlink()
+    read_wheel.reset_mock()
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert read_wheel.call_count == 0
+    assert json.loads(output_file.read_text())["variants"] == {NULL_VARIANT_LABEL: {}}
+
+    (tmp_path / f"test_package-0-py3-none-any-{NULL_VARIANT_LABEL}.whl").unlink()
+    main(["generate-index-json", "-d", str(tmp_path), "--incremental"])
+    assert not output_file.exists()
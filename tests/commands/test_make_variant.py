@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import itertools
+import shutil
+import zipfile
 from typing import TYPE_CHECKING
 
 import pytest
+from build.env import DefaultIsolatedEnv
 from variantlib.commands.main import main
 from variantlib.constants import NULL_VARIANT_LABEL
+from variantlib.plugins.loader import PluginLoader
+from variantlib.venv_cache import CachedIsolatedEnv
 
 from tests.utils import assert_zips_equal
 
@@ -103,10 +108,163 @@ def test_make_variant(
     assert_zips_equal(target_variant_wheel, output_f)
 
 
+def test_make_variant_multiple(
+    non_variant_wheel: Path,
+    test_artifact_path: Path,
+    tmp_path: Path,
+    mocked_plugin_reqs: None,
+    mocker: MockerFixture,
+) -> None:
+    zip_open = mocker.spy(zipfile, "ZipFile")
+    main(
+        [
+            "make-variant",
+            "-f",
+            str(non_variant_wheel.resolve()),
+            "-o",
+            str(tmp_path),
+            "--pyproject-toml",
+            str((test_artifact_path / "test-package/pyproject.toml").resolve()),
+            "--variant=null",
+            "--variant",
+            "installable_plugin::feat1::val1c,installable_plugin :: feat2 :: val2b",
+            "--variant=foo=installable_plugin::feat1::val1c",
+            "--variant=installable_plugin::feat2::val2b",
+            "--variant=bar=installable_plugin::feat2::val2b",
+        ]
+    )
+
+    # The input wheel is opened once.
+    assert [
+        call.args[0] for call in zip_open.call_args_list if call.args[1:] != ("w",)
+    ] == [non_variant_wheel.resolve()]
+
+    labels = ["null", "5d8be4b9", "foo", "fbe82642", "bar"]
+    assert sorted(x.name for x in tmp_path.iterdir()) == sorted(
+        f"test_package-0-py3-none-any-{label}.whl" for label in labels
+    )
+    for label in labels:
+        filename = f"test_package-0-py3-none-any-{label}.whl"
+        assert_zips_equal(non_variant_wheel.parent / filename, tmp_path / filename)
+
+
+def test_make_variant_shared_session(
+    non_variant_wheel: Path,
+    test_artifact_path: Path,
+    tmp_path: Path,
+    mocked_plugin_reqs: None,
+    mocker: MockerFixture,
+) -> None:
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    input_wheels = [
+        input_dir / "test_package-0-py3-none-any.whl",
+        input_dir / "test_package-1-py3-none-any.whl",
+    ]
+    for input_wheel in input_wheels:
+        shutil.copy(non_variant_wheel, input_wheel)
+
+    env_factory = mocker.patch(
+        "variantlib.commands.make_variant.DefaultIsolatedEnv",
+        wraps=DefaultIsolatedEnv,
+    )
+    load_plugins = mocker.spy(PluginLoader, "_load_all_plugins")
+    main(
+        [
+            "make-variant",
+            "-f",
+            *map(str, input_wheels),
+            "-o",
+            str(output_dir),
+            "--pyproject-toml",
+            str((test_artifact_path / "test-package/pyproject.toml").resolve()),
+            "--variant=installable_plugin::feat1::val1c",
+            "--variant=installable_plugin::feat2::val2b",
+        ]
+    )
+
+    # The environment and plugins are loaded once for all wheels.
+    assert env_factory.call_count == 1
+    assert load_plugins.call_count == 1
+
+    for version, label in itertools.product(["0", "1"], ["60567bd9", "fbe82642"]):
+        assert_zips_equal(
+            non_variant_wheel.parent / f"test_package-0-py3-none-any-{label}.whl",
+            output_dir / f"test_package-{version}-py3-none-any-{label}.whl",
+        )
+
+
+def test_make_variant_venv_cache(
+    non_variant_wheel: Path,
+    test_artifact_path: Path,
+    tmp_path: Path,
+    mocked_plugin_reqs: None,
+    mocker: MockerFixture,
+) -> None:
+    cache_dir = tmp_path / "cache"
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    create = mocker.spy(CachedIsolatedEnv, "_create")
+
+    for _ in range(2):
+        main(
+            [
+                "make-variant",
+                "-f",
+                str(non_variant_wheel.resolve()),
+                "-o",
+                str(output_dir),
+                "--pyproject-toml",
+                str((test_artifact_path / "test-package/pyproject.toml").resolve()),
+                "--venv-cache-dir",
+                str(cache_dir),
+                "-p",
+                "installable_plugin::feat1::val1c",
+            ]
+        )
+
+    # The environment is created once, and reused by the second run.
+    assert create.call_count == 1
+    assert len([x for x in cache_dir.iterdir() if x.is_dir()]) == 1
+    filename = "test_package-0-py3-none-any-60567bd9.whl"
+    assert_zips_equal(non_variant_wheel.parent / filename, output_dir / filename)
+
+
+def test_make_variant_multiple_duplicate(
+    non_variant_wheel: Path,
+    test_artifact_path: Path,
+    tmp_path: Path,
+) -> None:
+    with pytest.raises(ValueError, match=r"Duplicate variant label: `foo`"):
+        main(
+            [
+                "make-variant",
+                "-f",
+                str(non_variant_wheel.resolve()),
+                "-o",
+                str(tmp_path),
+                "--pyproject-toml",
+                str((test_artifact_path / "test-package/pyproject.toml").resolve()),
+                "--skip-plugin-validation",
+                "--variant=foo=installable_plugin::feat1::val1c",
+                "--variant=foo=installable_plugin::feat2::val2b",
+            ]
+        )
+    assert list(tmp_path.iterdir()) == []
+
+
 @pytest.mark.parametrize(
     ("args", "error"),
     [
-        ([], "error: one of the arguments -p/--property --null-variant is required"),
+        (
+            [],
+            (
+                "error: one of the arguments -p/--property --null-variant --variant "
+                "is required"
+            ),
+        ),
         (["--property=x::y"], "argument -p/--property: invalid from_str value"),
         (
             ["--property=x::y::z", "--variant-label=12345678901234567"],
@@ -120,6 +278,19 @@ def test_make_variant(
             ["--null-variant", "--variant-label=null"],
             "error: --variant-label cannot be used with --null-variant",
         ),
+        (
+            ["--variant=x::y::z", "--variant-label=foo"],
+            "error: --variant-label cannot be used with --variant",
+        ),
+        (["--variant=x::y"], "argument --variant: Invalid format: `x::y`"),
+        (["--variant=null=x::y::z"], "argument --variant: invalid variant label"),
+        (
+            ["--variant=foo=null"],
+            (
+                "argument --variant: custom variant label cannot be used with the "
+                "null variant"
+            ),
+        ),
     ],
 )
 def test_make_variant_error(
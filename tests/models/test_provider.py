@@ -5,8 +5,12 @@ from types import SimpleNamespace
 import pytest
 from variantlib.errors import ValidationError
 from variantlib.models.provider import ProviderConfig
+from variantlib.models.provider import ProviderConfigSnapshot
 from variantlib.models.provider import VariantFeatureConfig
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
 from variantlib.models.variant import VariantProperty
+from variantlib.models.variant import VariantValidationResult
 
 # ======================== VariantFeatureConfig ======================== #
 
@@ -248,3 +252,54 @@ def test_to_list_of_properties() -> None:
         VariantProperty("ns", "c", "c1"),
         VariantProperty("ns", "b", "b1"),
     ]
+
+
+# ======================== ProviderConfigSnapshot ======================== #
+
+
+def test_provider_config_snapshot_validate() -> None:
+    snapshot = ProviderConfigSnapshot.from_provider_configs(
+        {
+            "ns": ProviderConfig(
+                namespace="ns",
+                configs=[
+                    VariantFeatureConfig("a", ["a1", "a2"], multi_value=True),
+                    VariantFeatureConfig("b", ["b1", "b2"], multi_value=False),
+                ],
+            ),
+        }
+    )
+
+    vdescs = [
+        VariantDescription(
+            [
+                VariantProperty("ns", "a", "a1"),
+                VariantProperty("ns", "a", "a2"),
+                VariantProperty("ns", "b", "b1"),
+                VariantProperty("ns", "b", "b3"),
+                VariantProperty("ns", "c", "c1"),
+                VariantProperty("other", "a", "a1"),
+            ]
+        ),
+        VariantDescription([VariantProperty("ns", "b", "b2")]),
+        VariantDescription([]),
+    ]
+
+    assert snapshot.validate_many(vdescs) == [
+        VariantValidationResult(
+            results={
+                VariantProperty("ns", "a", "a1"): True,
+                VariantProperty("ns", "a", "a2"): True,
+                VariantProperty("ns", "b", "b1"): True,
+                VariantProperty("ns", "b", "b3"): False,
+                VariantProperty("ns", "c", "c1"): False,
+                VariantProperty("other", "a", "a1"): None,
+            },
+            multi_value_violations=frozenset({VariantFeature("ns", "b")}),
+        ),
+        VariantValidationResult(
+            results={VariantProperty("ns", "b", "b2"): True},
+            multi_value_violations=frozenset(),
+        ),
+        VariantValidationResult(results={}, multi_value_violations=frozenset()),
+    ]
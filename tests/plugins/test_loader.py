@@ -4,6 +4,7 @@ import re
 import sys
 from functools import partial
 from pathlib import Path
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 import pytest
@@ -22,6 +23,7 @@ from variantlib.models.provider import VariantFeatureConfig
 from variantlib.models.variant_info import ProviderInfo
 from variantlib.models.variant_info import VariantInfo
 from variantlib.plugins.loader import BasePluginLoader
+from variantlib.plugins.loader import ConfigsQuery
 from variantlib.plugins.loader import EntryPointPluginLoader
 from variantlib.plugins.loader import ListPluginLoader
 from variantlib.plugins.loader import PluginLoader
@@ -31,9 +33,13 @@ from variantlib.protocols import VariantNamespace
 from variantlib.pyproject_toml import VariantPyProjectToml
 from variantlib.variants_json import VariantsJson
 
+from tests.mocked_plugins import MockedEntryPoint
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    import pytest_mock
+
 
 if sys.version_info >= (3, 11):
     import tomllib
@@ -156,6 +162,42 @@ def test_get_supported_configs(
     }
 
 
+@pytest.mark.parametrize("method", GET_CONFIG_METHODS)
+def test_get_configs_namespaces(
+    mocked_plugin_loader: BasePluginLoader, method: str
+) -> None:
+    all_configs = getattr(mocked_plugin_loader, method)()
+    namespaces = ["second_namespace", "unknown_namespace"]
+    assert getattr(mocked_plugin_loader, method)(namespaces=namespaces) == {
+        "second_namespace": all_configs["second_namespace"]
+    }
+    assert getattr(mocked_plugin_loader, method)(namespaces=[]) == {}
+
+
+def test_query_configs(
+    mocked_plugin_loader: BasePluginLoader, mocker: pytest_mock.MockerFixture
+) -> None:
+    run_call_subprocess = mocker.spy(BasePluginLoader, "_run_call_subprocess")
+    results = mocked_plugin_loader.query_configs(
+        {
+            "get_all_configs": ConfigsQuery(),
+            "get_supported_configs": ConfigsQuery(
+                namespaces=frozenset({"test_namespace"})
+            ),
+        }
+    )
+    assert run_call_subprocess.call_count == 1
+    assert set(results["get_supported_configs"]) == {"test_namespace"}
+
+    # Subsequent queries are served from the cache.
+    assert mocked_plugin_loader.get_all_configs() == results["get_all_configs"]
+    assert (
+        mocked_plugin_loader.get_supported_configs(namespaces=["test_namespace"])
+        == results["get_supported_configs"]
+    )
+    assert run_call_subprocess.call_count == 1
+
+
 def test_namespace_clash() -> None:
     with (
         pytest.raises(
@@ -434,6 +476,19 @@ def test_load_plugins_from_entry_points(mocked_entry_points: None) -> None:
         }
 
 
+def test_get_plugin_versions_entry_points(mocker: pytest_mock.MockerFixture) -> None:
+    mocker.patch("variantlib.plugins.loader.entry_points")().select.return_value = [
+        MockedEntryPoint(
+            "test",
+            "tests.mocked_plugins:MockedPluginA",
+            SimpleNamespace(name="plugin-a", version="1.2"),  # type: ignore[arg-type]
+        ),
+        MockedEntryPoint("second", "tests.mocked_plugins:MockedPluginB"),
+    ]
+    with EntryPointPluginLoader() as loader:
+        assert loader.get_plugin_versions() == {"test_namespace": "plugin-a==1.2"}
+
+
 def test_plugin_in_venv(test_plugin_package_req: str) -> None:
     variant_info = VariantInfo(
         namespace_priorities=["installable_plugin"],
@@ -118,3 +118,22 @@ def test_inject_abi_dependency_envvar(
 
     assert namespace_priorities == [VARIANT_ABI_DEPENDENCY_NAMESPACE]
     assert set(supported_vprops) == expected
+
+
+def test_inject_abi_dependency_explicit(mocker: pytest_mock.MockerFixture) -> None:
+    distributions = mocker.patch("importlib.metadata.distributions")
+
+    namespace_priorities: list[VariantNamespace] = []
+    supported_vprops: list[VariantProperty] = []
+    inject_abi_dependency(supported_vprops, namespace_priorities, {"b": "2", "a": "1"})
+
+    assert namespace_priorities == [VARIANT_ABI_DEPENDENCY_NAMESPACE]
+    assert supported_vprops == [
+        VariantProperty("abi_dependency", "a", "1"),
+        VariantProperty("abi_dependency", "a", "1.0"),
+        VariantProperty("abi_dependency", "a", "1.0.0"),
+        VariantProperty("abi_dependency", "b", "2"),
+        VariantProperty("abi_dependency", "b", "2.0"),
+        VariantProperty("abi_dependency", "b", "2.0.0"),
+    ]
+    distributions.assert_not_called()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.resolver.index import IndexedVariantSet
+from variantlib.resolver.lib import filter_variants
+from variantlib.resolver.lib import sort_and_filter_supported_variants
+from variantlib.variants_json import VariantsJson
+
+
+@pytest.fixture(scope="module")
+def variants_json() -> VariantsJson:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        return VariantsJson(json.load(f))
+
+
+@pytest.fixture(scope="module")
+def supported_vprops() -> list[VariantProperty]:
+    return [
+        VariantProperty("fictional_hw", "architecture", "deepthought"),
+        VariantProperty("fictional_hw", "architecture", "hal9000"),
+        VariantProperty("fictional_hw", "compute_accuracy", "0"),
+        VariantProperty("fictional_hw", "compute_accuracy", "10"),
+        VariantProperty("fictional_hw", "compute_capability", "10"),
+        VariantProperty("fictional_hw", "compute_capability", "6"),
+        VariantProperty("fictional_hw", "humor", "2"),
+        VariantProperty("fictional_tech", "quantum", "foam"),
+        VariantProperty("fictional_tech", "risk_exposure", "25"),
+        VariantProperty("fictional_tech", "technology", "auto_chef"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("forbidden_namespaces", "forbidden_features", "forbidden_properties"),
+    [
+        (None, None, None),
+        (["fictional_tech"], None, None),
+        (None, [VariantFeature("fictional_hw", "humor")], None),
+        (None, None, [VariantProperty("fictional_hw", "compute_capability", "10")]),
+        (
+            ["fictional_tech"],
+            [VariantFeature("fictional_hw", "humor")],
+            [VariantProperty("fictional_hw", "architecture", "hal9000")],
+        ),
+    ],
+)
+def test_indexed_variant_set_filter(
+    variants_json: VariantsJson,
+    supported_vprops: list[VariantProperty],
+    forbidden_namespaces: list[str] | None,
+    forbidden_features: list[VariantFeature] | None,
+    forbidden_properties: list[VariantProperty] | None,
+) -> None:
+    vdescs = list(variants_json.variants.values())
+    variant_set = IndexedVariantSet(vdescs)
+
+    # The same index is queried with different supported properties.
+    for allowed_properties in (supported_vprops, supported_vprops[::2], []):
+        expected = list(
+            filter_variants(
+                vdescs,
+                allowed_properties=allowed_properties,
+                forbidden_namespaces=forbidden_namespaces,
+                forbidden_features=forbidden_features,
+                forbidden_properties=forbidden_properties,
+            )
+        )
+        assert (
+            list(
+                filter_variants(
+                    variant_set,
+                    allowed_properties=allowed_properties,
+                    forbidden_namespaces=forbidden_namespaces,
+                    forbidden_features=forbidden_features,
+                    forbidden_properties=forbidden_properties,
+                )
+            )
+            == expected
+        )
+
+
+def test_indexed_variant_set_duplicates() -> None:
+    vdesc = VariantDescription([VariantProperty("a", "b", "c")])
+    variant_set = IndexedVariantSet([vdesc, vdesc])
+    assert len(variant_set) == 1
+    assert vdesc in variant_set
+    assert VariantDescription() not in variant_set
+    assert variant_set.filter_ids([VariantProperty("a", "b", "c")]) == [0]
+
+
+def test_sort_and_filter_supported_variants_indexed(
+    variants_json: VariantsJson,
+    supported_vprops: list[VariantProperty],
+) -> None:
+    vdescs = [
+        vdesc
+        for vdesc in variants_json.variants.values()
+        if not vdesc.is_null_variant()
+    ]
+    variant_set = IndexedVariantSet(vdescs)
+    namespace_priorities = ["fictional_tech", "fictional_hw"]
+    feature_priorities = {"fictional_hw": ["compute_capability", "humor"]}
+    property_priorities = {"fictional_hw": {"compute_capability": ["6"]}}
+
+    expected = sort_and_filter_supported_variants(
+        vdescs.copy(),
+        supported_vprops,
+        namespace_priorities=namespace_priorities,
+        feature_priorities=feature_priorities,
+        property_priorities=property_priorities,
+    )
+    assert expected[-1] == VariantDescription()
+    assert (
+        sort_and_filter_supported_variants(
+            variant_set,
+            supported_vprops,
+            namespace_priorities=namespace_priorities,
+            feature_priorities=feature_priorities,
+            property_priorities=property_priorities,
+        )
+        == expected
+    )
+    # The null variant is not added to the set.
+    assert VariantDescription() not in variant_set
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.resolver.index import IndexedVariantSet
+from variantlib.resolver.lib import filter_variants
+from variantlib.resolver.rejections import RejectionLog
+from variantlib.resolver.rejections import RejectionReason
+from variantlib.resolver.rejections import VariantRejection
+from variantlib.resolver.table import filter_variants_table
+from variantlib.variants_json import VariantsJson
+from variantlib.variants_table import VariantsTable
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+VDESC_A = VariantDescription([VariantProperty("ns1", "f1", "a")])
+VDESC_B = VariantDescription(
+    [VariantProperty("ns1", "f1", "b"), VariantProperty("ns1", "f1", "c")]
+)
+VDESC_C = VariantDescription([VariantProperty("ns1", "f2", "a")])
+VDESC_D = VariantDescription([VariantProperty("ns2", "f1", "a")])
+VDESC_E = VariantDescription([VariantProperty("ns3", "f3", "a")])
+
+
+@pytest.mark.parametrize(
+    "vdescs",
+    [
+        [VDESC_A, VDESC_B, VDESC_C, VDESC_D, VDESC_E, VDESC_A],
+        IndexedVariantSet([VDESC_A, VDESC_B, VDESC_C, VDESC_D, VDESC_E]),
+    ],
+)
+def test_filter_variants_rejections(
+    vdescs: list[VariantDescription] | IndexedVariantSet,
+) -> None:
+    rejections = RejectionLog(keep_records=True)
+    assert list(
+        filter_variants(
+            vdescs,
+            allowed_properties=[
+                VariantProperty("ns1", "f1", "a"),
+                VariantProperty("ns1", "f1", "b"),
+                VariantProperty("ns3", "f3", "a"),
+            ],
+            forbidden_namespaces=["ns2"],
+            forbidden_features=[VariantFeature("ns3", "f3")],
+            forbidden_properties=[VariantProperty("ns1", "f1", "b")],
+            rejections=rejections,
+        )
+    ) == [VDESC_A]
+
+    expected = [
+        VariantRejection(
+            RejectionReason.FORBIDDEN_NAMESPACE,
+            VDESC_D.hexdigest,
+            (VariantProperty("ns2", "f1", "a"),),
+        ),
+        VariantRejection(
+            RejectionReason.FORBIDDEN_FEATURE,
+            VDESC_E.hexdigest,
+            (VariantProperty("ns3", "f3", "a"),),
+        ),
+        VariantRejection(
+            RejectionReason.UNSUPPORTED_PROPERTY,
+            VDESC_B.hexdigest,
+            (VariantProperty("ns1", "f1", "b"), VariantProperty("ns1", "f1", "c")),
+        ),
+        VariantRejection(
+            RejectionReason.UNSUPPORTED_FEATURE,
+            VDESC_C.hexdigest,
+            (VariantProperty("ns1", "f2", "a"),),
+        ),
+    ]
+    if isinstance(vdescs, list):
+        expected.insert(
+            0, VariantRejection(RejectionReason.DUPLICATE, VDESC_A.hexdigest)
+        )
+    assert rejections.records is not None
+    assert sorted(rejections.records, key=str) == sorted(expected, key=str)
+    assert rejections.total == len(expected)
+
+
+def test_rejection_log_lazy(caplog: pytest.LogCaptureFixture) -> None:
+    def vprops() -> Generator[VariantProperty]:
+        raise AssertionError("properties should not be consumed")
+        yield  # pragma: no cover
+
+    caplog.set_level(logging.INFO)
+    rejections = RejectionLog()
+    rejections.add(RejectionReason.UNSUPPORTED_PROPERTY, "12345678", vprops())
+    assert rejections.counts == {RejectionReason.UNSUPPORTED_PROPERTY: 1}
+    assert rejections.records is None
+
+
+def test_rejection_log_rate_limit(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.DEBUG, "variantlib.resolver.rejections")
+    rejections = RejectionLog(max_logged=3)
+    for index in range(10):
+        rejections.add(
+            RejectionReason.UNSUPPORTED_PROPERTY,
+            f"{index:08x}",
+            [VariantProperty("ns", "f", "a")],
+        )
+    rejections.add(RejectionReason.DUPLICATE, "deadbeef")
+    rejections.log_summary()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        (
+            "Variant `00000000` has been rejected because none of the variant "
+            "properties `[ns :: f :: a]` are compatible with this platform."
+        ),
+        (
+            "Variant `00000001` has been rejected because none of the variant "
+            "properties `[ns :: f :: a]` are compatible with this platform."
+        ),
+        (
+            "Variant `00000002` has been rejected because none of the variant "
+            "properties `[ns :: f :: a]` are compatible with this platform."
+        ),
+        "11 variants have been rejected: 1 duplicate, 10 unsupported-property",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("forbidden_namespaces", "forbidden_features"),
+    [
+        (None, None),
+        (["fictional_tech"], [VariantFeature("fictional_hw", "humor")]),
+    ],
+)
+def test_rejection_counts_match(
+    forbidden_namespaces: list[str] | None,
+    forbidden_features: list[VariantFeature] | None,
+) -> None:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        variants_json = VariantsJson(json.load(f))
+    vdescs = list(variants_json.variants.values())
+    allowed_properties = [
+        VariantProperty("fictional_hw", "architecture", "deepthought"),
+        VariantProperty("fictional_hw", "compute_capability", "10"),
+        VariantProperty("fictional_hw", "humor", "2"),
+        VariantProperty("fictional_tech", "quantum", "foam"),
+    ]
+
+    expected = RejectionLog()
+    list(
+        filter_variants(
+            vdescs,
+            allowed_properties,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            rejections=expected,
+        )
+    )
+    assert expected.total > 0
+
+    rejections = RejectionLog()
+    IndexedVariantSet(vdescs).filter(
+        allowed_properties,
+        forbidden_namespaces=forbidden_namespaces,
+        forbidden_features=forbidden_features,
+        rejections=rejections,
+    )
+    assert rejections.counts == expected.counts
+
+    rejections = RejectionLog()
+    filter_variants_table(
+        VariantsTable.from_mapping(variants_json.variants),
+        allowed_properties,
+        forbidden_namespaces=forbidden_namespaces,
+        forbidden_features=forbidden_features,
+        rejections=rejections,
+    )
+    assert rejections.counts == expected.counts
+
+
+@pytest.mark.parametrize(
+    ("allowed_properties", "expected_reason"),
+    [
+        ([VariantProperty("a", "f", "2")], RejectionReason.UNSUPPORTED_PROPERTY),
+        ([VariantProperty("b", "g", "2")], RejectionReason.UNSUPPORTED_FEATURE),
+    ],
+)
+def test_rejection_reason_first_feature(
+    allowed_properties: list[VariantProperty], expected_reason: RejectionReason
+) -> None:
+    # Both features of the variant fail, the first one determines the reason.
+    # The other variant makes `b :: g` come first in the index.
+    other = VariantDescription([VariantProperty("b", "g", "2")])
+    vdesc = VariantDescription(
+        [VariantProperty("a", "f", "1"), VariantProperty("b", "g", "1")]
+    )
+    expected = VariantRejection(
+        expected_reason, vdesc.hexdigest, (VariantProperty("a", "f", "1"),)
+    )
+
+    for vdescs in ([other, vdesc], IndexedVariantSet([other, vdesc])):
+        rejections = RejectionLog(keep_records=True)
+        list(filter_variants(vdescs, allowed_properties, rejections=rejections))
+        assert rejections.records is not None
+        assert rejections.records[-1] == expected
+
+    rejections = RejectionLog(keep_records=True)
+    filter_variants_table(
+        VariantsTable.from_mapping({other.hexdigest: other, vdesc.hexdigest: vdesc}),
+        allowed_properties,
+        rejections=rejections,
+    )
+    assert rejections.records is not None
+    assert rejections.records[-1] == expected
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.resolver.lib import filter_variants
+from variantlib.resolver.lib import sort_and_filter_supported_variants
+from variantlib.resolver.lib import sort_and_filter_supported_variants_table
+from variantlib.resolver.table import filter_variants_table
+from variantlib.resolver.table import sort_variants_table
+from variantlib.variants_json import VariantsJson
+from variantlib.variants_table import VariantsTable
+
+
+@pytest.fixture(scope="module")
+def variants_json() -> VariantsJson:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        return VariantsJson(json.load(f))
+
+
+@pytest.fixture(scope="module")
+def supported_vprops() -> list[VariantProperty]:
+    return [
+        VariantProperty("fictional_hw", "architecture", "deepthought"),
+        VariantProperty("fictional_hw", "architecture", "hal9000"),
+        VariantProperty("fictional_hw", "architecture", "tars"),
+        VariantProperty("fictional_hw", "compute_accuracy", "0"),
+        VariantProperty("fictional_hw", "compute_accuracy", "8"),
+        VariantProperty("fictional_hw", "compute_accuracy", "10"),
+        VariantProperty("fictional_hw", "compute_capability", "10"),
+        VariantProperty("fictional_hw", "compute_capability", "8"),
+        VariantProperty("fictional_hw", "compute_capability", "6"),
+        VariantProperty("fictional_hw", "compute_capability", "5"),
+        VariantProperty("fictional_hw", "humor", "10"),
+        VariantProperty("fictional_hw", "humor", "2"),
+        VariantProperty("fictional_hw", "humor", "0"),
+        VariantProperty("fictional_tech", "quantum", "foam"),
+        VariantProperty("fictional_tech", "risk_exposure", "25"),
+        VariantProperty("fictional_tech", "technology", "auto_chef"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("forbidden_namespaces", "forbidden_features", "forbidden_properties"),
+    [
+        (None, None, None),
+        (["fictional_tech"], None, None),
+        (None, [VariantFeature("fictional_hw", "humor")], None),
+        (None, None, [VariantProperty("fictional_hw", "compute_capability", "10")]),
+    ],
+)
+def test_filter_variants_table(
+    variants_json: VariantsJson,
+    supported_vprops: list[VariantProperty],
+    forbidden_namespaces: list[str] | None,
+    forbidden_features: list[VariantFeature] | None,
+    forbidden_properties: list[VariantProperty] | None,
+) -> None:
+    table = VariantsTable.from_mapping(variants_json.variants)
+    vdescs = list(variants_json.variants.values())
+
+    expected = list(
+        filter_variants(
+            vdescs,
+            allowed_properties=supported_vprops,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            forbidden_properties=forbidden_properties,
+        )
+    )
+    assert [
+        table.get_description(index)
+        for index in filter_variants_table(
+            table,
+            allowed_properties=supported_vprops,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            forbidden_properties=forbidden_properties,
+        )
+    ] == expected
+
+
+def test_filter_variants_table_duplicates() -> None:
+    vdesc = VariantDescription([VariantProperty("a", "b", "c")])
+    table = VariantsTable.from_mapping({"foo": vdesc, "bar": vdesc})
+    assert filter_variants_table(table, [VariantProperty("a", "b", "c")]) == [0]
+
+
+def test_sort_and_filter_supported_variants_table(
+    variants_json: VariantsJson,
+    supported_vprops: list[VariantProperty],
+) -> None:
+    table = VariantsTable.from_mapping(variants_json.variants)
+    namespace_priorities = ["fictional_tech", "fictional_hw"]
+    feature_priorities = {"fictional_hw": ["compute_capability", "humor"]}
+    property_priorities = {"fictional_hw": {"compute_capability": ["8"]}}
+
+    expected = sort_and_filter_supported_variants(
+        list(variants_json.variants.values()),
+        supported_vprops,
+        namespace_priorities=namespace_priorities,
+        feature_priorities=feature_priorities,
+        property_priorities=property_priorities,
+    )
+    assert [
+        table.get_description(index)
+        for index in sort_and_filter_supported_variants_table(
+            table,
+            supported_vprops,
+            namespace_priorities=namespace_priorities,
+            feature_priorities=feature_priorities,
+            property_priorities=property_priorities,
+        )
+    ] == expected
+
+
+def test_sort_variants_table_unfiltered() -> None:
+    table = VariantsTable.from_mapping(
+        {"foo": VariantDescription([VariantProperty("a", "b", "c")])}
+    )
+    with pytest.raises(ValidationError, match="Filtering should be applied first"):
+        sort_variants_table(table, [0], [VariantProperty("a", "x", "c")])
+    with pytest.raises(ValidationError, match="Filtering should be applied first"):
+        sort_variants_table(table, [0], [VariantProperty("a", "b", "x")])
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+from variantlib.api import get_variants_by_priority
+from variantlib.models.configuration import VariantConfiguration
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.models.variant_info import ProviderInfo
+from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
+from variantlib.resolver.index import IndexedVariantSet
+from variantlib.resolver.lib import sort_and_filter_supported_variants
+from variantlib.resolver.rejections import RejectionReason
+from variantlib.resolver.trace import PrioritySource
+from variantlib.resolver.trace import RankedVariant
+from variantlib.resolver.trace import ResolutionTrace
+from variantlib.variants_json import VariantsJson
+
+VDESC_A = VariantDescription([VariantProperty("ns1", "f1", "a")])
+VDESC_B = VariantDescription([VariantProperty("ns1", "f1", "b")])
+VDESC_C = VariantDescription([VariantProperty("ns1", "f1", "c")])
+VDESC_X = VariantDescription([VariantProperty("ns1", "f2", "x")])
+VDESC_P = VariantDescription([VariantProperty("ns2", "g1", "p")])
+VDESC_NULL = VariantDescription()
+
+SUPPORTED_VPROPS = [
+    VariantProperty("ns1", "f1", "a"),
+    VariantProperty("ns1", "f1", "b"),
+    VariantProperty("ns1", "f2", "x"),
+    VariantProperty("ns2", "g1", "p"),
+]
+MAX = sys.maxsize
+
+
+def resolve(
+    vdescs: list[VariantDescription] | IndexedVariantSet,
+    trace: ResolutionTrace | None = None,
+) -> list[VariantDescription]:
+    # user configuration prefers `b`, variants.json prefers `a`
+    return sort_and_filter_supported_variants(
+        vdescs,
+        SUPPORTED_VPROPS,
+        namespace_priorities=["ns1", "ns2"],
+        property_priorities={"ns1": {"f1": ["b", "a"]}},
+        abi_dependencies={},
+        trace=trace,
+    )
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_trace(indexed: bool) -> None:
+    vdescs = [VDESC_P, VDESC_X, VDESC_C, VDESC_A, VDESC_B]
+    expected = resolve(IndexedVariantSet(vdescs) if indexed else vdescs)
+    assert expected == [VDESC_B, VDESC_A, VDESC_X, VDESC_P, VDESC_NULL]
+
+    trace = ResolutionTrace(
+        VariantConfiguration(
+            namespace_priorities=[], property_priorities={"ns1": {"f1": ["b"]}}
+        )
+    )
+    assert resolve(IndexedVariantSet(vdescs) if indexed else vdescs, trace) == expected
+
+    assert [
+        (rejection.reason, rejection.vhash, rejection.vprops)
+        for rejection in trace.rejections.records or []
+    ] == [
+        (
+            RejectionReason.UNSUPPORTED_PROPERTY,
+            VDESC_C.hexdigest,
+            (VariantProperty("ns1", "f1", "c"),),
+        )
+    ]
+    assert trace.dimensions == {
+        ("ns1", "f1"): ["b", "a"],
+        ("ns1", "f2"): ["x"],
+        ("ns2", "g1"): ["p"],
+    }
+    assert trace.ranked == [
+        RankedVariant(
+            VDESC_B.hexdigest,
+            (0, MAX, MAX),
+            VariantFeature("ns1", "f1"),
+            PrioritySource.USER_CONFIG,
+        ),
+        RankedVariant(
+            VDESC_A.hexdigest,
+            (1, MAX, MAX),
+            VariantFeature("ns1", "f1"),
+            PrioritySource.VARIANTS_JSON,
+        ),
+        RankedVariant(
+            VDESC_X.hexdigest,
+            (MAX, 0, MAX),
+            VariantFeature("ns1", "f2"),
+            PrioritySource.PLUGIN_ORDER,
+        ),
+        RankedVariant(
+            VDESC_P.hexdigest,
+            (MAX, MAX, 0),
+            VariantFeature("ns2", "g1"),
+            PrioritySource.PLUGIN_ORDER,
+        ),
+        RankedVariant(VDESC_NULL.hexdigest, (MAX, MAX, MAX)),
+    ]
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_trace_forbidden(indexed: bool) -> None:
+    vdesc_feat = VariantDescription(
+        [VariantProperty("ns1", "f1", "a"), VariantProperty("ns1", "f2", "x")]
+    )
+    vdesc_ns = VariantDescription(
+        [
+            VariantProperty("ns1", "f1", "b"),
+            VariantProperty("ns2", "g1", "p"),
+            VariantProperty("ns2", "g2", "q"),
+        ]
+    )
+    vdescs = [vdesc_feat, VDESC_P, vdesc_ns, VDESC_A, VDESC_B]
+
+    trace = ResolutionTrace()
+    assert sort_and_filter_supported_variants(
+        IndexedVariantSet(vdescs) if indexed else vdescs,
+        SUPPORTED_VPROPS,
+        namespace_priorities=["ns1", "ns2"],
+        forbidden_namespaces=["ns3", "ns2"],
+        forbidden_features=[VariantFeature("ns1", "f2"), VariantFeature("ns1", "f1")],
+        forbidden_properties=[VariantProperty("ns1", "f1", "b")],
+        abi_dependencies={},
+        trace=trace,
+    ) == [VDESC_NULL]
+
+    # every offending property is reported, in the order of variants
+    assert [
+        (rejection.reason, rejection.vhash, rejection.vprops)
+        for rejection in trace.rejections.records or []
+    ] == [
+        (
+            RejectionReason.FORBIDDEN_FEATURE,
+            vdesc_feat.hexdigest,
+            (VariantProperty("ns1", "f1", "a"), VariantProperty("ns1", "f2", "x")),
+        ),
+        (
+            RejectionReason.FORBIDDEN_NAMESPACE,
+            VDESC_P.hexdigest,
+            (VariantProperty("ns2", "g1", "p"),),
+        ),
+        (
+            RejectionReason.FORBIDDEN_NAMESPACE,
+            vdesc_ns.hexdigest,
+            (VariantProperty("ns2", "g1", "p"), VariantProperty("ns2", "g2", "q")),
+        ),
+        (
+            RejectionReason.FORBIDDEN_FEATURE,
+            VDESC_A.hexdigest,
+            (VariantProperty("ns1", "f1", "a"),),
+        ),
+        (
+            RejectionReason.FORBIDDEN_FEATURE,
+            VDESC_B.hexdigest,
+            (VariantProperty("ns1", "f1", "b"),),
+        ),
+    ]
+
+
+def test_trace_to_str() -> None:
+    trace = ResolutionTrace()
+    resolve([VDESC_C, VDESC_A, VDESC_B], trace)
+
+    data = json.loads(trace.to_str())
+    assert data["rejected"] == [
+        {
+            "variant": VDESC_C.hexdigest,
+            "reason": "unsupported-property",
+            "properties": ["ns1 :: f1 :: c"],
+        }
+    ]
+    assert data["dimensions"][0] == {
+        "feature": "ns1 :: f1",
+        "values": ["b", "a"],
+        "namespace-source": "variants.json",
+        "feature-source": "plugin-order",
+    }
+    assert data["ranked"][0] == {
+        "variant": VDESC_B.hexdigest,
+        "rank": [0, None, None],
+        "decided-by": "ns1 :: f1",
+        "source": "variants.json",
+    }
+    assert data["ranked"][-1] == {
+        "variant": VDESC_NULL.hexdigest,
+        "rank": [None, None, None],
+        "decided-by": None,
+        "source": None,
+    }
+    assert json.loads(trace.to_str(compact=True)) == data
+
+
+def test_get_variants_by_priority_trace() -> None:
+    variants_json = VariantsJson(
+        VariantInfo(
+            namespace_priorities=["ns1", "ns2"],
+            property_priorities={"ns1": {"f1": ["a"]}},
+            providers={
+                namespace: ProviderInfo(
+                    requires=[f"{namespace}-plugin"], plugin_api=f"{namespace}:Plugin"
+                )
+                for namespace in ["ns1", "ns2"]
+            },
+        )
+    )
+    for vdesc in [VDESC_P, VDESC_X, VDESC_C, VDESC_A, VDESC_B]:
+        variants_json.variants[vdesc.hexdigest] = vdesc
+    snapshot = PlatformSnapshot(
+        supported_properties=SUPPORTED_VPROPS,
+        property_priorities={"ns1": {"f1": ["b"]}},
+    )
+
+    trace = ResolutionTrace()
+    assert get_variants_by_priority(
+        variants_json=variants_json, platform_snapshot=snapshot, trace=trace
+    ) == get_variants_by_priority(
+        variants_json=variants_json, platform_snapshot=snapshot
+    )
+    assert trace.user_config is not None
+    assert trace.user_config.property_priorities == {"ns1": {"f1": ["b"]}}
+    assert [(ranked.vhash, ranked.source) for ranked in trace.ranked] == [
+        (VDESC_B.hexdigest, PrioritySource.USER_CONFIG),
+        (VDESC_A.hexdigest, PrioritySource.VARIANTS_JSON),
+        (VDESC_X.hexdigest, PrioritySource.PLUGIN_ORDER),
+        (VDESC_P.hexdigest, PrioritySource.PLUGIN_ORDER),
+        (VDESC_NULL.hexdigest, None),
+    ]
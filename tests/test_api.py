@@ -15,11 +15,14 @@ from hypothesis import settings
 from hypothesis import strategies as st
 from trycast import trycast
 from variantlib.api import check_variant_supported
+from variantlib.api import get_platform_snapshot
 from variantlib.api import get_variant_environment_dict
 from variantlib.api import get_variant_label
 from variantlib.api import get_variants_by_priority
+from variantlib.api import get_wheels_namever
 from variantlib.api import make_variant_dist_info
 from variantlib.api import validate_variant
+from variantlib.api import validate_variants
 from variantlib.constants import NULL_VARIANT_LABEL
 from variantlib.constants import PYPROJECT_TOML_TOP_KEY
 from variantlib.constants import VALIDATION_FEATURE_NAME_REGEX
@@ -54,8 +57,11 @@ from variantlib.models.variant import VariantProperty
 from variantlib.models.variant import VariantValidationResult
 from variantlib.models.variant_info import ProviderInfo
 from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
+from variantlib.plugins.loader import PluginLoader
 from variantlib.pyproject_toml import VariantPyProjectToml
 from variantlib.variants_json import VariantsJson
+from variantlib.variants_table import ColumnarVariantsJson
 
 from tests.test_pyproject_toml import PYPROJECT_TOML
 from tests.test_pyproject_toml import PYPROJECT_TOML_MINIMAL
@@ -87,11 +93,13 @@ def configs(
 @pytest.mark.parametrize("construct", [False, True])
 @pytest.mark.parametrize("custom_labels", [False, True])
 @pytest.mark.parametrize("explicit_null", [False, True])
+@pytest.mark.parametrize("columnar", [False, True])
 def test_get_variants_by_priority_roundtrip(
     configs: list[ProviderConfig],
     construct: bool,
     custom_labels: bool,
     explicit_null: bool,
+    columnar: bool,
 ) -> None:
     """Test that we can round-trip all combinations via variants.json and get the same
     result."""
@@ -135,7 +143,11 @@ def test_get_variants_by_priority_roundtrip(
 
     # variants_json = VariantsJson(typed_variants_json)
 
-    assert get_variants_by_priority(variants_json=typed_variants_json) == [
+    assert get_variants_by_priority(
+        variants_json=ColumnarVariantsJson(typed_variants_json)
+        if columnar
+        else typed_variants_json
+    ) == [
         f"foo{vdesc.hexdigest[:4]}"
         if custom_labels and not vdesc.is_null_variant()
         else get_variant_label(vdesc)
@@ -210,10 +222,33 @@ def test_get_variants_by_priority_roundtrip_fuzz(
     # The null-variant is always the last one and implicitly added
     combinations: list[VariantDescription] = [*list(get_or_skip_combinations())]
 
+    # Use AoT providers to declare the namespaces without loading any plugins
     variants_json = {
+        VARIANT_INFO_DEFAULT_PRIO_KEY: {
+            VARIANT_INFO_NAMESPACE_KEY: namespace_priorities,
+            VARIANT_INFO_FEATURE_KEY: {
+                provider_cfg.namespace: [
+                    vfeat_cfg.name for vfeat_cfg in provider_cfg.configs
+                ]
+                for provider_cfg in configs
+            },
+        },
+        VARIANT_INFO_PROVIDER_DATA_KEY: {
+            provider_cfg.namespace: {
+                VARIANT_INFO_PROVIDER_PLUGIN_API_KEY: "donotuseme",
+                VARIANT_INFO_PROVIDER_INSTALL_TIME_KEY: False,
+            }
+            for provider_cfg in configs
+        },
+        VARIANT_INFO_STATIC_PROPERTIES_KEY: {
+            provider_cfg.namespace: {
+                vfeat_cfg.name: vfeat_cfg.values for vfeat_cfg in provider_cfg.configs
+            }
+            for provider_cfg in configs
+        },
         VARIANTS_JSON_VARIANT_DATA_KEY: {
             get_variant_label(vdesc): vdesc.to_dict() for vdesc in combinations
-        }
+        },
     }
 
     if (typed_variants_json := trycast(VariantsJsonDict, variants_json)) is None:
@@ -221,10 +256,6 @@ def test_get_variants_by_priority_roundtrip_fuzz(
             f"Did not conform the `VariantsJsonDict` format: {variants_json}"
         )
 
-    mocker.patch(
-        "variantlib.plugins.loader.BasePluginLoader.get_supported_configs"
-    ).return_value = {provider_cfg.namespace: provider_cfg for provider_cfg in configs}
-
     assert get_variants_by_priority(variants_json=typed_variants_json) == [
         get_variant_label(vdesc) for vdesc in combinations
     ]
@@ -355,6 +386,48 @@ def test_validate_variant(optional: bool) -> None:
     assert not res.is_valid()
 
 
+def test_validate_variants(mocker: MockerFixture) -> None:
+    variant_info = VariantInfo(
+        namespace_priorities=["test_namespace", "second_namespace"],
+        providers={
+            "test_namespace": ProviderInfo(
+                requires=["variantlib"],
+                plugin_api="tests.mocked_plugins:MockedPluginA",
+            ),
+            "second_namespace": ProviderInfo(
+                requires=["variantlib"],
+                plugin_api="tests.mocked_plugins:MockedPluginB",
+                install_time=False,
+            ),
+        },
+    )
+    vdescs = [
+        VariantDescription([VariantProperty("test_namespace", "name1", "val1d")]),
+        VariantDescription(
+            [
+                VariantProperty("second_namespace", "name3", "val3a"),
+                VariantProperty("second_namespace", "name3", "val3b"),
+            ]
+        ),
+        VariantDescription(
+            [
+                VariantProperty("test_namespace", "name2", "val2d"),
+                VariantProperty("missing_namespace", "name", "val"),
+            ]
+        ),
+    ]
+
+    enter = mocker.spy(PluginLoader, "__enter__")
+    results = validate_variants(vdescs, variant_info=variant_info)
+    assert enter.call_count == 1
+
+    assert results == [
+        validate_variant(vdesc, variant_info=variant_info) for vdesc in vdescs
+    ]
+    assert [res.is_valid() for res in results] == [True, False, False]
+    assert validate_variants([], variant_info=variant_info) == []
+
+
 @pytest.mark.parametrize(
     "pyproject_toml", [None, PYPROJECT_TOML, PYPROJECT_TOML_MINIMAL]
 )
@@ -491,6 +564,15 @@ def common_variant_info() -> VariantInfo:
             ),
             False,
         ),
+        (
+            VariantDescription(
+                [
+                    VariantProperty("test_namespace", "name1", "val1a"),
+                    VariantProperty("test_namespace", "name1", "val1c"),
+                ]
+            ),
+            True,
+        ),
     ],
 )
 def test_check_variant_supported_dist(
@@ -539,6 +621,104 @@ def test_check_variant_supported_generic() -> None:
     )
 
 
+def test_platform_snapshot(
+    common_variant_info: VariantInfo, mocker: MockerFixture
+) -> None:
+    variants_json = VariantsJson(common_variant_info)
+    for vdesc in [
+        VariantDescription([VariantProperty("test_namespace", "name1", "val1c")]),
+        VariantDescription([VariantProperty("test_namespace", "name2", "val2c")]),
+        VariantDescription([VariantProperty("second_namespace", "name3", "val3a")]),
+    ]:
+        variants_json.variants[get_variant_label(vdesc)] = vdesc
+    expected = get_variants_by_priority(variants_json=variants_json)
+
+    # The snapshot survives a JSON round trip.
+    snapshot = PlatformSnapshot.from_str(
+        get_platform_snapshot(variant_info=variants_json).to_str()
+    )
+
+    enter = mocker.spy(PluginLoader, "__enter__")
+    assert (
+        get_variants_by_priority(
+            variants_json=variants_json, platform_snapshot=snapshot
+        )
+        == expected
+    )
+    for vdesc in variants_json.variants.values():
+        assert check_variant_supported(
+            vdesc=vdesc, variant_info=variants_json, platform_snapshot=snapshot
+        ) is (get_variant_label(vdesc) in expected)
+    assert enter.call_count == 0
+
+
+def test_platform_snapshot_extra_namespaces(
+    common_variant_info: VariantInfo, mocker: MockerFixture
+) -> None:
+    variants_json = VariantsJson(common_variant_info)
+    expected = get_variants_by_priority(variants_json=variants_json)
+
+    # A platform profile usually covers more plugins than the package uses.
+    snapshot = get_platform_snapshot(variant_info=variants_json)
+    snapshot = PlatformSnapshot(
+        supported_properties=[
+            VariantProperty("other_namespace", "name1", "val1a"),
+            *snapshot.supported_properties,
+        ],
+        namespace_priorities=snapshot.namespace_priorities,
+        feature_priorities=snapshot.feature_priorities,
+        property_priorities=snapshot.property_priorities,
+        abi_dependencies=snapshot.abi_dependencies,
+    )
+
+    enter = mocker.spy(PluginLoader, "__enter__")
+    assert (
+        get_variants_by_priority(
+            variants_json=variants_json, platform_snapshot=snapshot
+        )
+        == expected
+    )
+    assert not check_variant_supported(
+        vdesc=VariantDescription(
+            [VariantProperty("other_namespace", "name1", "val1a")]
+        ),
+        variant_info=variants_json,
+        platform_snapshot=snapshot,
+    )
+    assert enter.call_count == 0
+
+
+def test_get_wheels_namever() -> None:
+    assert (
+        get_wheels_namever(
+            [
+                "dist/test_package-0-py3-none-any-foo.whl",
+                "test_package-0-py3-none-any-5d8be4b9.whl",
+            ]
+        )
+        == "test_package-0"
+    )
+
+
+@pytest.mark.parametrize(
+    ("wheel_files", "message"),
+    [
+        (["test_package-0.tar.gz"], r"not a valid Python wheel:"),
+        (["test_package-0-py3-none-any.whl"], r"not a valid Python wheel variant:"),
+        (
+            [
+                "test_package-0-py3-none-any-foo.whl",
+                "test_package-1-py3-none-any-foo.whl",
+            ],
+            r"must be of the same package version",
+        ),
+    ],
+)
+def test_get_wheels_namever_invalid(wheel_files: list[str], message: str) -> None:
+    with pytest.raises(ValidationError, match=message):
+        get_wheels_namever(wheel_files)
+
+
 @pytest.mark.parametrize("label", [None, "foo"])
 def test_get_variant_environment_dict(label: str | None) -> None:
     vdesc = VariantDescription(
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from variantlib import json_codec
+from variantlib.constants import VariantsJsonDict
+from variantlib.variants_json import VariantsJson
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    else:
+        pytest.importorskip("orjson")
+    assert json_codec.get_backend() == request.param
+    return request.param  # type: ignore[no-any-return]
+
+
+@pytest.fixture
+def variants_json_data() -> VariantsJsonDict:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        return json.load(f)  # type: ignore[no-any-return]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        [],
+        {"a": {}, "b": [], "c": [1, 2], "d": {"e": True, "f": None}},
+        {"z": "x", "a": ["y", "\\", '"'], "m": {"ns": {"feat": ["val"]}}},
+        {"non-ascii": "zażółć gęślą jaźń ☃"},
+        {"big": 2**70},
+    ],
+)
+def test_dumps(backend: str, data: Any) -> None:
+    assert json_codec.dumps(data) == json.dumps(data, indent=4, sort_keys=True)
+    assert json_codec.dumps(data, compact=True) == json.dumps(
+        data, sort_keys=True, separators=(",", ":")
+    )
+
+
+def test_variants_json_to_str(
+    backend: str, variants_json_data: VariantsJsonDict
+) -> None:
+    variants_json = VariantsJson(variants_json_data)
+    assert variants_json.to_str() == json.dumps(
+        variants_json_data, indent=4, sort_keys=True
+    )
+    compact = variants_json.to_str(compact=True)
+    assert "\n" not in compact
+    assert json_codec.loads(compact) == variants_json_data
+    assert VariantsJson(json_codec.loads(compact)) == variants_json
+
+
+@pytest.mark.parametrize("data", [b'{"a": ["b"]}', '{"a": ["b"]}'])
+def test_loads(backend: str, data: bytes | str) -> None:
+    assert json_codec.loads(data) == {"a": ["b"]}
+
+
+def test_loads_invalid(backend: str) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b'{"a": ')
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pytest
+from variantlib.constants import PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_ENVIRONMENT_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_PLUGINS_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_PRIORITIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_VERSION
+from variantlib.constants import PLATFORM_SNAPSHOT_VERSION_KEY
+from variantlib.constants import VARIANT_INFO_FEATURE_KEY
+from variantlib.constants import VARIANT_INFO_NAMESPACE_KEY
+from variantlib.constants import PlatformSnapshotJsonDict
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantProperty
+from variantlib.models.variant_info import ProviderInfo
+from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
+
+SNAPSHOT_DICT: PlatformSnapshotJsonDict = {
+    PLATFORM_SNAPSHOT_VERSION_KEY: PLATFORM_SNAPSHOT_VERSION,
+    PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: [
+        "ns2 :: feat :: b",
+        "ns2 :: feat :: a",
+        "ns1 :: feat2 :: x",
+        "ns1 :: feat1 :: y",
+    ],
+    PLATFORM_SNAPSHOT_PRIORITIES_KEY: {
+        VARIANT_INFO_NAMESPACE_KEY: ["ns1"],
+        VARIANT_INFO_FEATURE_KEY: {"ns2": ["feat"]},
+    },
+    PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY: {"foo": "1.2.3"},
+    PLATFORM_SNAPSHOT_PLUGINS_KEY: {"ns1": "ns1_plugin==1.0"},
+    PLATFORM_SNAPSHOT_ENVIRONMENT_KEY: {"platform": "linux"},
+}
+
+
+def test_platform_snapshot_roundtrip() -> None:
+    snapshot = PlatformSnapshot.from_dict(SNAPSHOT_DICT)
+    assert snapshot == PlatformSnapshot(
+        supported_properties=[
+            VariantProperty("ns2", "feat", "b"),
+            VariantProperty("ns2", "feat", "a"),
+            VariantProperty("ns1", "feat2", "x"),
+            VariantProperty("ns1", "feat1", "y"),
+        ],
+        namespace_priorities=["ns1"],
+        feature_priorities={"ns2": ["feat"]},
+        abi_dependencies={"foo": "1.2.3"},
+        plugin_versions={"ns1": "ns1_plugin==1.0"},
+        environment={"platform": "linux"},
+    )
+    assert snapshot.to_dict() == SNAPSHOT_DICT
+    assert PlatformSnapshot.from_str(snapshot.to_str()) == snapshot
+    assert PlatformSnapshot.from_str(snapshot.to_str(compact=True)) == snapshot
+
+
+def test_platform_snapshot_is_supported() -> None:
+    snapshot = PlatformSnapshot.from_dict(SNAPSHOT_DICT)
+    vdescs = [
+        VariantDescription(),
+        VariantDescription(
+            [VariantProperty("ns2", "feat", "a"), VariantProperty("ns2", "feat", "b")]
+        ),
+        VariantDescription([VariantProperty("ns2", "feat", "c")]),
+        VariantDescription([VariantProperty("abi_dependency", "foo", "1.2")]),
+        VariantDescription([VariantProperty("abi_dependency", "foo", "1.3")]),
+        # one supported value is sufficient for a multi-value feature
+        VariantDescription(
+            [VariantProperty("ns2", "feat", "a"), VariantProperty("ns2", "feat", "c")]
+        ),
+    ]
+    assert snapshot.filter_supported(vdescs) == [
+        vdescs[0],
+        vdescs[1],
+        vdescs[3],
+        vdescs[5],
+    ]
+    assert snapshot.is_supported(vdescs[5])
+    assert not snapshot.is_supported(vdescs[2])
+
+
+@pytest.mark.parametrize(
+    ("enable_optional_plugins", "expected"),
+    [
+        (False, ["ns2 :: feat :: b", "ns2 :: feat :: a"]),
+        (
+            ["ns3"],
+            ["ns2 :: feat :: b", "ns2 :: feat :: a", "ns3 :: feat :: c"],
+        ),
+    ],
+)
+def test_platform_snapshot_for_variant_info(
+    enable_optional_plugins: bool | list[str], expected: list[str]
+) -> None:
+    snapshot = PlatformSnapshot.from_dict(
+        {
+            **SNAPSHOT_DICT,
+            PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: [
+                *SNAPSHOT_DICT[PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY],
+                "ns3 :: feat :: c",
+            ],
+        }
+    )
+    # ns1 is not used by the package, ns3 is optional
+    variant_info = VariantInfo(
+        namespace_priorities=["ns2", "ns3"],
+        providers={
+            "ns2": ProviderInfo(
+                requires=["ns2_plugin"], plugin_api="ns2_plugin:Plugin"
+            ),
+            "ns3": ProviderInfo(
+                requires=["ns3_plugin"], plugin_api="ns3_plugin:Plugin", optional=True
+            ),
+        },
+    )
+    package_snapshot = snapshot.for_variant_info(
+        variant_info, enable_optional_plugins=enable_optional_plugins
+    )
+    assert [
+        vprop.to_str() for vprop in package_snapshot.supported_properties
+    ] == expected
+    assert package_snapshot.is_supported(
+        VariantDescription([VariantProperty("ns2", "feat", "a")])
+    )
+    assert not package_snapshot.is_supported(
+        VariantDescription([VariantProperty("ns1", "feat1", "y")])
+    )
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: ["ns :: feat :: a"]},
+        {
+            PLATFORM_SNAPSHOT_VERSION_KEY: PLATFORM_SNAPSHOT_VERSION + 1,
+            PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: ["ns :: feat :: a"],
+        },
+    ],
+)
+def test_platform_snapshot_invalid_version(data: PlatformSnapshotJsonDict) -> None:
+    with pytest.raises(ValidationError, match=r"Unsupported platform snapshot version"):
+        PlatformSnapshot.from_dict(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: ["ns :: feat"]},
+        {PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: {"ns": {"feat": ["a"]}}},
+        {PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY: {"foo": 1}},
+    ],
+)
+def test_platform_snapshot_invalid(data: dict[str, object]) -> None:
+    with pytest.raises(ValidationError):
+        PlatformSnapshot.from_dict(
+            {PLATFORM_SNAPSHOT_VERSION_KEY: PLATFORM_SNAPSHOT_VERSION, **data}  # type: ignore[typeddict-item]
+        )
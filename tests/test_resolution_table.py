@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+from variantlib import json_codec
+from variantlib.api import get_variants_by_priority
+from variantlib.constants import NULL_VARIANT_LABEL
+from variantlib.constants import RESOLUTION_TABLE_PROPERTIES_KEY
+from variantlib.constants import RESOLUTION_TABLE_RANKS_KEY
+from variantlib.constants import VARIANTS_JSON_RESOLUTION_TABLE_KEY
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantProperty
+from variantlib.models.variant_info import ProviderInfo
+from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
+from variantlib.resolution_table import ResolutionTable
+from variantlib.resolution_table import compute_variant_ranks
+from variantlib.variants_json import LazyVariantsJson
+from variantlib.variants_json import VariantsJson
+
+
+@pytest.fixture
+def variants_json() -> VariantsJson:
+    variants_json = VariantsJson(
+        VariantInfo(
+            namespace_priorities=["ns1", "ns2"],
+            feature_priorities={"ns1": ["f1", "f2"]},
+            property_priorities={"ns1": {"f1": ["a", "b", "c"], "f2": ["x"]}},
+            providers={
+                "ns1": ProviderInfo(requires=["ns1-plugin"]),
+                "ns2": ProviderInfo(requires=["ns2-plugin"]),
+            },
+        )
+    )
+    for f1, f2, g1 in itertools.product(
+        ["a", "b", "c", None], ["x", "y", None], ["p", None]
+    ):
+        vprops = [
+            VariantProperty(namespace, feature, value)
+            for namespace, feature, value in [
+                ("ns1", "f1", f1),
+                ("ns1", "f2", f2),
+                ("ns2", "g1", g1),
+            ]
+            if value is not None
+        ]
+        if vprops:
+            vdesc = VariantDescription(vprops)
+            variants_json.variants[vdesc.hexdigest] = vdesc
+    return variants_json
+
+
+def test_build(variants_json: VariantsJson) -> None:
+    table = ResolutionTable.build(variants_json.variants, variants_json)
+
+    a_labels = table.properties[VariantProperty("ns1", "f1", "a")]
+    assert len(a_labels) == 6
+    assert a_labels == [
+        label
+        for label, vdesc in variants_json.variants.items()
+        if VariantProperty("ns1", "f1", "a") in vdesc.properties
+    ]
+
+    assert table.ranks is not None
+    vdesc = VariantDescription([VariantProperty("ns1", "f1", "b")])
+    assert table.ranks[vdesc.hexdigest] == [1, 2, 1]
+    vdesc = VariantDescription(
+        [VariantProperty("ns1", "f2", "y"), VariantProperty("ns2", "g1", "p")]
+    )
+    assert table.ranks[vdesc.hexdigest] == [4, 1, 0]
+
+
+@pytest.mark.parametrize(
+    "variant_info",
+    [
+        # namespace without priority
+        VariantInfo(namespace_priorities=["ns1"]),
+        # two features without priority
+        VariantInfo(namespace_priorities=["ns1", "ns2"]),
+        # two values without priority
+        VariantInfo(
+            namespace_priorities=["ns1", "ns2"],
+            feature_priorities={"ns1": ["f1", "f2"]},
+            property_priorities={"ns1": {"f1": ["a"]}},
+        ),
+    ],
+)
+def test_ranks_undetermined(
+    variants_json: VariantsJson, variant_info: VariantInfo
+) -> None:
+    assert compute_variant_ranks(variants_json.variants, variant_info) is None
+
+
+def test_ranks_multi_value(variants_json: VariantsJson) -> None:
+    vdesc = VariantDescription(
+        [VariantProperty("ns1", "f1", "a"), VariantProperty("ns1", "f1", "b")]
+    )
+    variants_json.variants[vdesc.hexdigest] = vdesc
+    assert compute_variant_ranks(variants_json.variants, variants_json) is None
+
+
+def test_filter_supported() -> None:
+    variants = {
+        "multi": VariantDescription(
+            [VariantProperty("ns", "f", "a"), VariantProperty("ns", "f", "b")]
+        ),
+        "a": VariantDescription([VariantProperty("ns", "f", "a")]),
+        "ag": VariantDescription(
+            [VariantProperty("ns", "f", "a"), VariantProperty("ns", "g", "x")]
+        ),
+        "b": VariantDescription([VariantProperty("ns", "f", "b")]),
+        NULL_VARIANT_LABEL: VariantDescription(),
+    }
+    table = ResolutionTable.build(variants, VariantInfo())
+    assert table.filter_supported(variants, [VariantProperty("ns", "f", "b")]) == [
+        "multi",
+        "b",
+        NULL_VARIANT_LABEL,
+    ]
+
+
+@pytest.mark.parametrize("cls", [VariantsJson, LazyVariantsJson])
+def test_roundtrip(variants_json: VariantsJson, cls: type[VariantsJson]) -> None:
+    table = variants_json.build_resolution_table()
+    data = json_codec.loads(variants_json.to_str())
+    assert set(data[VARIANTS_JSON_RESOLUTION_TABLE_KEY]) == {
+        RESOLUTION_TABLE_PROPERTIES_KEY,
+        RESOLUTION_TABLE_RANKS_KEY,
+    }
+    assert cls(data).resolution_table == table
+
+    # A table not matching the variants is rejected
+    del data[VARIANTS_JSON_RESOLUTION_TABLE_KEY][RESOLUTION_TABLE_RANKS_KEY][
+        next(iter(variants_json.variants))
+    ]
+    with pytest.raises(ValidationError, match=r"ranks do not match variants"):
+        cls(data)
+
+
+@pytest.mark.parametrize(
+    "supported_properties",
+    [
+        [
+            VariantProperty("ns1", "f1", "c"),
+            VariantProperty("ns1", "f1", "a"),
+            VariantProperty("ns1", "f2", "y"),
+            VariantProperty("ns1", "f2", "x"),
+            VariantProperty("ns2", "g1", "p"),
+        ],
+        [
+            VariantProperty("ns2", "g1", "p"),
+            VariantProperty("ns1", "f2", "y"),
+            VariantProperty("ns1", "f1", "b"),
+        ],
+        [],
+    ],
+)
+def test_matches_generic_resolution(
+    variants_json: VariantsJson, supported_properties: list[VariantProperty]
+) -> None:
+    snapshot = PlatformSnapshot(supported_properties=supported_properties)
+    expected = get_variants_by_priority(
+        variants_json=variants_json, platform_snapshot=snapshot
+    )
+
+    variants_json.build_resolution_table()
+    assert (
+        get_variants_by_priority(
+            variants_json=variants_json, platform_snapshot=snapshot
+        )
+        == expected
+    )
+
+    # User priorities override the precomputed ranks.
+    snapshot = PlatformSnapshot(
+        supported_properties=supported_properties, namespace_priorities=["ns2"]
+    )
+    with_table = get_variants_by_priority(
+        variants_json=variants_json, platform_snapshot=snapshot
+    )
+    variants_json.resolution_table = None
+    assert with_table == get_variants_by_priority(
+        variants_json=variants_json, platform_snapshot=snapshot
+    )
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import os
+import sys
+import threading
+import time
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
@@ -9,6 +14,9 @@ from variantlib.models.provider import ProviderConfig
 from variantlib.utils import aggregate_feature_priorities
 from variantlib.utils import aggregate_namespace_priorities
 from variantlib.utils import aggregate_property_priorities
+from variantlib.utils import atomic_write_text
+from variantlib.utils import file_lock
+from variantlib.utils import get_lock_path
 
 from tests.utils import get_combinations
 
@@ -229,3 +237,78 @@ def test_aggregate_property_priorities(
     expected: dict[int, dict[int, list[int]]],
 ) -> None:
     assert aggregate_property_priorities(*dicts) == expected
+
+
+def test_atomic_write_text(tmp_path: Path) -> None:
+    path = tmp_path / "test.json"
+    atomic_write_text(path, "foo")
+    assert path.read_text() == "foo"
+
+    if sys.platform != "win32":
+        path.chmod(0o640)
+    atomic_write_text(path, "bar")
+    assert path.read_text() == "bar"
+    if sys.platform != "win32":
+        assert path.stat().st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no umask on Windows")
+def test_atomic_write_text_umask(tmp_path: Path) -> None:
+    path = tmp_path / "test.json"
+    umask = os.umask(0o027)
+    try:
+        atomic_write_text(path, "foo")
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_atomic_write_text_failure(tmp_path: Path) -> None:
+    path = tmp_path / "test.json"
+    path.write_text("foo")
+    with pytest.raises(TypeError):
+        atomic_write_text(path, 1)  # type: ignore[arg-type]
+    assert path.read_text() == "foo"
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+def test_get_lock_path(tmp_path: Path) -> None:
+    assert get_lock_path(tmp_path / "test.json") == tmp_path / ".test.json.lock"
+
+
+def test_file_lock(tmp_path: Path) -> None:
+    lock_path = tmp_path / "test.lock"
+    counter_path = tmp_path / "counter"
+    counter_path.write_text("0")
+
+    def increment() -> None:
+        with file_lock(lock_path):
+            value = int(counter_path.read_text())
+            time.sleep(0.01)
+            counter_path.write_text(str(value + 1))
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter_path.read_text() == "8"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no shared locks on Windows")
+def test_file_lock_shared(tmp_path: Path) -> None:
+    lock_path = tmp_path / "test.lock"
+    with (
+        file_lock(lock_path, shared=True),
+        file_lock(lock_path, shared=True),
+        pytest.raises(BlockingIOError),
+        file_lock(lock_path, blocking=False),
+    ):
+        pass
+    with (
+        file_lock(lock_path, blocking=False),
+        pytest.raises(BlockingIOError),
+        file_lock(lock_path, shared=True, blocking=False),
+    ):
+        pass
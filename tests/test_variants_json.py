@@ -4,6 +4,7 @@ import copy
 import json
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
 from variantlib.constants import NULL_VARIANT_LABEL
@@ -24,6 +25,8 @@ from variantlib.models.variant import VariantProperty
 from variantlib.models.variant_info import ProviderInfo
 from variantlib.models.variant_info import VariantInfo
 from variantlib.pyproject_toml import VariantPyProjectToml
+from variantlib.variants_json import LazyVariants
+from variantlib.variants_json import LazyVariantsJson
 from variantlib.variants_json import VariantsJson
 
 if TYPE_CHECKING:
@@ -489,6 +492,29 @@ def test_merge_variants() -> None:
         v1.merge(VariantsJson(_json_data))
 
 
+def test_merge_fingerprint_cached(mocker: Any) -> None:
+    data: VariantsJsonDict = {
+        VARIANT_INFO_DEFAULT_PRIO_KEY: {VARIANT_INFO_NAMESPACE_KEY: ["a"]},
+        VARIANT_INFO_PROVIDER_DATA_KEY: {
+            "a": {VARIANT_INFO_PROVIDER_REQUIRES_KEY: ["a"]}
+        },
+    }
+    variants_jsons = [
+        VariantsJson(
+            {**data, VARIANTS_JSON_VARIANT_DATA_KEY: {label: {"a": {"b": [label]}}}}
+        )
+        for label in ("x", "y", "z")
+    ]
+
+    providers_dict = mocker.spy(VariantsJson, "providers_dict")
+    merged = variants_jsons[0]
+    for variants_json in variants_jsons[1:]:
+        merged.merge(variants_json)
+    merged.merge(variants_jsons[1])
+    assert providers_dict.call_count == 3
+    assert list(merged.variants) == ["x", "y", "z"]
+
+
 def test_null_variant_label():
     with pytest.raises(
         ValidationError,
@@ -501,3 +527,63 @@ def test_null_variant_label():
         ValidationError, match=rf"Null variant must use {NULL_VARIANT_LABEL!r} label"
     ):
         VariantsJson({VARIANTS_JSON_VARIANT_DATA_KEY: {"zuul": {}}})
+
+
+def test_lazy_variants_json() -> None:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        data = json.load(f)
+
+    variants_json = VariantsJson(data)
+    lazy = LazyVariantsJson(data)
+    assert isinstance(lazy.variants, LazyVariants)
+    assert lazy.providers == variants_json.providers
+    assert lazy.namespace_priorities == variants_json.namespace_priorities
+    assert list(lazy.variants) == list(variants_json.variants)
+    assert "03e04d5e" in lazy.variants
+    assert lazy.variants["03e04d5e"] == variants_json.variants["03e04d5e"]
+    lazy.validate()
+    assert lazy.variants == variants_json.variants
+    assert lazy.to_str() == variants_json.to_str()
+
+
+@pytest.mark.parametrize(
+    ("variants", "error"),
+    [
+        ({"foo": {"x": {"y": ["z"]}}, "BAD": {}}, r"variants\[1\]: Value `BAD`"),
+        ({"foo": {"x": {"y": "z"}}}, r"variants: expected"),
+        ({"foo": {"x": {"y": ["z", "z"]}}}, r"Duplicate value found"),
+        ({"zuul": {}}, rf"Null variant must use {NULL_VARIANT_LABEL!r} label"),
+    ],
+)
+def test_lazy_variants_json_validate(variants: dict[str, Any], error: str) -> None:
+    data: VariantsJsonDict = {VARIANTS_JSON_VARIANT_DATA_KEY: variants}
+    with pytest.raises(ValidationError, match=error):
+        VariantsJson(data)
+
+    lazy = LazyVariantsJson(data)
+    with pytest.raises(ValidationError, match=error):
+        lazy.validate()
+    with pytest.raises(ValidationError):
+        list(lazy.variants.values())
+
+
+def test_lazy_variants_json_deferred() -> None:
+    lazy = LazyVariantsJson(
+        {
+            VARIANTS_JSON_VARIANT_DATA_KEY: {
+                "foo": {"x": {"y": ["z"]}},
+                "bar": {"x": {"y": ["Z"]}},
+            }
+        }
+    )
+    assert len(lazy.variants) == 2
+    assert lazy.variants["foo"] == VariantDescription([VariantProperty("x", "y", "z")])
+    with pytest.raises(ValidationError, match=r"Value `Z` must match regex"):
+        lazy.variants["bar"]
+
+    # header is still validated eagerly
+    with pytest.raises(ValidationError, match=r"variants: expected"):
+        LazyVariantsJson({VARIANTS_JSON_VARIANT_DATA_KEY: []})  # type: ignore[typeddict-item]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from variantlib.constants import NULL_VARIANT_LABEL
+from variantlib.constants import VARIANTS_JSON_VARIANT_DATA_KEY
+from variantlib.constants import VariantsJsonDict
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantProperty
+from variantlib.models.variant_info import ProviderInfo
+from variantlib.models.variant_info import VariantInfo
+from variantlib.variants_json import VariantsJson
+from variantlib.variants_table import ColumnarVariantsJson
+from variantlib.variants_table import VariantsTable
+
+
+@pytest.fixture
+def variants_json_data() -> VariantsJsonDict:
+    json_file = Path(
+        "tests/artifacts/variant_json_files/dummy_project-1.0.0-variants.json"
+    )
+    with json_file.open() as f:
+        return json.load(f)  # type: ignore[no-any-return]
+
+
+def test_columnar_variants_json(variants_json_data: VariantsJsonDict) -> None:
+    variants_json = VariantsJson(variants_json_data)
+    columnar = ColumnarVariantsJson(variants_json_data)
+
+    assert isinstance(columnar.variants, VariantsTable)
+    assert dict(columnar.variants) == variants_json.variants
+    assert columnar.variants == variants_json.variants
+    assert list(columnar.variants) == list(variants_json.variants)
+    assert columnar.namespace_priorities == variants_json.namespace_priorities
+    assert columnar.feature_priorities == variants_json.feature_priorities
+    assert columnar.property_priorities == variants_json.property_priorities
+    assert columnar.providers == variants_json.providers
+    assert columnar.to_str() == variants_json.to_str()
+
+    table = columnar.variants
+    assert len(table.properties) == len(
+        {
+            vprop
+            for vdesc in variants_json.variants.values()
+            for vprop in vdesc.properties
+        }
+    )
+    for index, (label, vdesc) in enumerate(variants_json.variants.items()):
+        assert table.index(label) == index
+        assert table.hexdigest(index) == vdesc.hexdigest
+        assert table.is_null_variant(index) == vdesc.is_null_variant()
+        assert list(table.iter_properties(index)) == vdesc.properties
+
+    assert "03e04d5e" in table
+    assert "deadbeef" not in table
+    with pytest.raises(KeyError):
+        table["deadbeef"]
+
+
+def test_from_mapping() -> None:
+    vdesc1 = VariantDescription(
+        [VariantProperty("ns2", "f", "v"), VariantProperty("ns1", "f", "v")]
+    )
+    vdesc2 = VariantDescription([VariantProperty("ns1", "f", "v")])
+    variants = {
+        "foo": vdesc1,
+        vdesc2.hexdigest: vdesc2,
+        NULL_VARIANT_LABEL: VariantDescription(),
+    }
+
+    table = VariantsTable.from_mapping(variants)
+    assert table == variants
+    assert table.properties == [
+        VariantProperty("ns1", "f", "v"),
+        VariantProperty("ns2", "f", "v"),
+    ]
+    assert list(table.property_ids) == [0, 1, 0]
+    assert list(table.offsets) == [0, 2, 3, 3]
+    assert [table.hexdigest(index) for index in range(len(table))] == [
+        vdesc1.hexdigest,
+        vdesc2.hexdigest,
+        VariantDescription().hexdigest,
+    ]
+
+
+def test_conversion() -> None:
+    variant_info = VariantInfo(
+        namespace_priorities=["ns"], providers={"ns": ProviderInfo(requires=["ns-pkg"])}
+    )
+    columnar = ColumnarVariantsJson(variant_info)
+    assert columnar.providers == variant_info.providers
+    assert isinstance(columnar.variants, VariantsTable)
+    assert len(columnar.variants) == 0
+
+
+def test_merge_read_only(variants_json_data: VariantsJsonDict) -> None:
+    columnar = ColumnarVariantsJson(variants_json_data)
+    with pytest.raises(TypeError, match="read-only"):
+        columnar.merge(columnar)
+
+
+@pytest.mark.parametrize(
+    ("variants", "error"),
+    [
+        (
+            {NULL_VARIANT_LABEL: {"x": {"y": ["z"]}}},
+            rf"{NULL_VARIANT_LABEL!r} label can only be used for the null variant",
+        ),
+        ({"zuul": {}}, rf"Null variant must use {NULL_VARIANT_LABEL!r} label"),
+        (
+            {"foo": {"x": {"y": ["z", "z"]}}},
+            r"Duplicate value found: `\('x', 'y', 'z'\)` in list.",
+        ),
+        ({"foo": {"x": {"y": ["Z"]}}}, r"Value `Z` must match regex"),
+    ],
+)
+def test_invalid_variants(variants: dict[str, Any], error: str) -> None:
+    with pytest.raises(ValidationError, match=error):
+        VariantsJson({VARIANTS_JSON_VARIANT_DATA_KEY: variants})
+    with pytest.raises(ValidationError, match=error):
+        ColumnarVariantsJson({VARIANTS_JSON_VARIANT_DATA_KEY: variants})
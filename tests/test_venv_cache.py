@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from variantlib.venv_cache import VENV_CACHE_MARKER_FILENAME
+from variantlib.venv_cache import CachedIsolatedEnv
+
+if TYPE_CHECKING:
+    import pytest_mock
+
+
+@pytest.fixture
+def mocked_env_builder(mocker: pytest_mock.MockerFixture) -> None:
+    def make_builder(**kwargs: Any) -> Any:
+        builder = mocker.Mock()
+        builder.create.side_effect = lambda path: Path(path).mkdir(parents=True)
+        return builder
+
+    mocker.patch("variantlib.venv_cache.venv.EnvBuilder", side_effect=make_builder)
+    mocker.patch.object(CachedIsolatedEnv, "_install")
+
+
+def test_cached_env(tmp_path: Path, mocker: pytest_mock.MockerFixture) -> None:
+    create = mocker.spy(CachedIsolatedEnv, "_create")
+
+    with CachedIsolatedEnv([], cache_dir=tmp_path) as env:
+        assert env.path.parent == tmp_path
+        assert (env.path / VENV_CACHE_MARKER_FILENAME).is_file()
+        prefix = subprocess.check_output(
+            [env.python_executable, "-c", "import sys; print(sys.prefix)"], text=True
+        )
+        assert Path(prefix.strip()) == env.path
+    assert create.call_count == 1
+
+    with CachedIsolatedEnv([], cache_dir=tmp_path) as env2:
+        assert env2.path == env.path
+    assert create.call_count == 1
+
+
+def test_cached_env_key(tmp_path: Path) -> None:
+    env = CachedIsolatedEnv(["foo", "bar"], cache_dir=tmp_path)
+    assert CachedIsolatedEnv(["bar", "foo", "bar"], cache_dir=tmp_path).key == env.key
+    assert CachedIsolatedEnv(["foo"], cache_dir=tmp_path).key != env.key
+    assert (
+        CachedIsolatedEnv(["foo", "bar"], cache_dir=tmp_path, installer="uv").key
+        != env.key
+    )
+
+
+@pytest.mark.usefixtures("mocked_env_builder")
+def test_cached_env_incomplete(tmp_path: Path) -> None:
+    env = CachedIsolatedEnv(["foo"], cache_dir=tmp_path)
+    env.path.mkdir()
+    (env.path / "leftover").touch()
+
+    with env:
+        assert not (env.path / "leftover").exists()
+        assert (env.path / VENV_CACHE_MARKER_FILENAME).is_file()
+
+
+@pytest.mark.usefixtures("mocked_env_builder")
+def test_cached_env_install_failure(
+    tmp_path: Path, mocker: pytest_mock.MockerFixture
+) -> None:
+    mocker.patch.object(
+        CachedIsolatedEnv,
+        "_install",
+        side_effect=subprocess.CalledProcessError(1, "pip"),
+    )
+    env = CachedIsolatedEnv(["foo"], cache_dir=tmp_path)
+    with pytest.raises(subprocess.CalledProcessError), env:
+        pass
+    assert not env.path.exists()
+
+
+@pytest.mark.usefixtures("mocked_env_builder")
+def test_cached_env_eviction(tmp_path: Path) -> None:
+    envs = [
+        CachedIsolatedEnv([req], cache_dir=tmp_path, max_entries=2)
+        for req in ("a", "b", "c")
+    ]
+    for i, env in enumerate(envs[:2]):
+        with env:
+            pass
+        os.utime(env.path / VENV_CACHE_MARKER_FILENAME, (i + 1000, i + 1000))
+
+    with envs[2]:
+        pass
+    assert [env.path.exists() for env in envs] == [False, True, True]
+
+    # Recently used environments are kept.
+    with envs[0]:
+        pass
+    assert [env.path.exists() for env in envs] == [True, False, True]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no shared locks on Windows")
+@pytest.mark.usefixtures("mocked_env_builder")
+def test_cached_env_eviction_in_use(tmp_path: Path) -> None:
+    envs = [
+        CachedIsolatedEnv([req], cache_dir=tmp_path, max_entries=1)
+        for req in ("a", "b", "c")
+    ]
+    with envs[0]:
+        os.utime(envs[0].path / VENV_CACHE_MARKER_FILENAME, (1000, 1000))
+        with envs[1]:
+            pass
+        with envs[2]:
+            pass
+        # The environment in use is not removed, even though it is the least
+        # recently used one.
+        assert [env.path.exists() for env in envs] == [True, False, True]
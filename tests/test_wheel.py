@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import http.server
+import io
+import os
+import re
+import struct
+import threading
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ClassVar
+
+import pytest
+from variantlib.constants import VARIANT_DIST_INFO_FILENAME
+from variantlib.wheel import HTTPRangeReader
+from variantlib.wheel import copy_zip_member_raw
+from variantlib.wheel import get_variant_dist_info_path
+from variantlib.wheel import open_remote_wheel
+from variantlib.wheel import read_variant_dist_info
+from variantlib.wheel import rewrite_wheel_dist_info
+from variantlib.wheel import rewrite_wheel_dist_info_many
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    import pytest_mock
+
+
+def make_zip(names: list[str]) -> zipfile.ZipFile:
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as zip_file:
+        for name in names:
+            zip_file.writestr(name, "")
+    return zipfile.ZipFile(data)
+
+
+@pytest.mark.parametrize(
+    ("names", "namever", "expected"),
+    [
+        (
+            ["foo/__init__.py", "foo-1.dist-info/METADATA", "foo-1.dist-info/x"],
+            "foo-1",
+            None,
+        ),
+        (["foo/__init__.py", "foo-1.dist-info/METADATA"], None, None),
+        (
+            ["foo/__init__.py", f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}"],
+            "foo-1",
+            f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}",
+        ),
+        (
+            ["foo/__init__.py", f"Foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}"],
+            "foo-1",
+            f"Foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}",
+        ),
+        (
+            ["foo/__init__.py", f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}"],
+            None,
+            f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}",
+        ),
+        (
+            [f"foo/bar.dist-info/{VARIANT_DIST_INFO_FILENAME}"],
+            None,
+            None,
+        ),
+    ],
+)
+def test_get_variant_dist_info_path(
+    names: list[str], namever: str | None, expected: str | None
+) -> None:
+    with make_zip(names) as zip_file:
+        assert get_variant_dist_info_path(zip_file, namever) == expected
+
+
+def test_get_variant_dist_info_path_no_scan(
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    with make_zip(
+        ["foo/__init__.py", f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}"]
+    ) as zip_file:
+        namelist = mocker.spy(zip_file, "namelist")
+        assert (
+            get_variant_dist_info_path(zip_file, "foo-1")
+            == f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}"
+        )
+        namelist.assert_not_called()
+
+
+def test_read_variant_dist_info() -> None:
+    wheel = Path(
+        "tests/artifacts/test-package/dist/test_package-0-py3-none-any-5d8be4b9.whl"
+    )
+    with zipfile.ZipFile(wheel) as zip_file:
+        variant_dist_info = read_variant_dist_info(
+            zip_file, "test_package-0", "5d8be4b9"
+        )
+    assert variant_dist_info is not None
+    assert variant_dist_info.variant_label == "5d8be4b9"
+
+    wheel = Path("tests/artifacts/test-package/dist/test_package-0-py3-none-any.whl")
+    with zipfile.ZipFile(wheel) as zip_file:
+        assert read_variant_dist_info(zip_file, "test_package-0") is None
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Minimal HTTP handler serving files with range request support"""
+
+    files: ClassVar[dict[str, bytes]] = {}
+    bytes_sent = 0
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def do_HEAD(self) -> None:
+        if (data := self.files.get(self.path)) is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        if (data := self.files.get(self.path)) is None:
+            self.send_error(404)
+            return
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        assert match is not None, "only range requests are expected"
+        start, end = int(match.group(1)), int(match.group(2))
+        chunk = data[start : end + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(chunk)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.end_headers()
+        self.wfile.write(chunk)
+        RangeRequestHandler.bytes_sent += len(chunk)
+
+
+@pytest.fixture
+def http_server() -> Generator[str]:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        RangeRequestHandler.files.clear()
+        RangeRequestHandler.bytes_sent = 0
+
+
+def test_open_remote_wheel(http_server: str) -> None:
+    wheel = Path(
+        "tests/artifacts/test-package/dist/test_package-0-py3-none-any-5d8be4b9.whl"
+    )
+    with zipfile.ZipFile(wheel) as zip_file:
+        expected = read_variant_dist_info(zip_file, "test_package-0", "5d8be4b9")
+
+    # Add a large incompressible member to the wheel
+    data = io.BytesIO(wheel.read_bytes())
+    with zipfile.ZipFile(data, "a") as zip_file:
+        zip_file.writestr("test_package/large.bin", os.urandom(4 * 1024 * 1024))
+    RangeRequestHandler.files["/test.whl"] = data.getvalue()
+
+    with open_remote_wheel(f"{http_server}/test.whl") as zip_file:
+        assert (
+            read_variant_dist_info(zip_file, "test_package-0", "5d8be4b9") == expected
+        )
+    assert 0 < RangeRequestHandler.bytes_sent < 64 * 1024
+
+
+def test_http_range_reader(http_server: str) -> None:
+    RangeRequestHandler.files["/data"] = bytes(range(256)) * 4
+
+    reader = HTTPRangeReader(f"{http_server}/data")
+    assert reader.size == 1024
+    assert reader.seek(-4, io.SEEK_END) == 1020
+    assert reader.read() == bytes([252, 253, 254, 255])
+    assert reader.read() == b""
+    assert reader.seek(16) == 16
+    assert reader.read(4) == bytes([16, 17, 18, 19])
+    assert reader.seek(2, io.SEEK_CUR) == 22
+    assert reader.read(2) == bytes([22, 23])
+    assert reader.bytes_read == 10
+    with pytest.raises(ValueError, match="Negative seek position"):
+        reader.seek(-1)
+
+
+def make_source_wheel(seekable: bool) -> bytes:
+    class UnseekableIO(io.BytesIO):
+        def seekable(self) -> bool:
+            return False
+
+        def seek(self, *args: Any) -> int:
+            raise OSError("unseekable")
+
+    data = UnseekableIO() if not seekable else io.BytesIO()
+    with zipfile.ZipFile(data, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("foo/__init__.py", b"import bar\n" * 1000)
+        zip_file.writestr(
+            "foo/data.bin", bytes(range(256)), compress_type=zipfile.ZIP_STORED
+        )
+        zip_file.writestr(
+            "foo-1.dist-info/RECORD",
+            "foo/__init__.py,sha256=xxx,11000\n"
+            "foo/data.bin,sha256=yyy,256\n"
+            f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME},sha256=zzz,2\n"
+            "foo-1.dist-info/RECORD,,\n",
+        )
+    return data.getvalue()
+
+
+def read_raw_member(zip_file: zipfile.ZipFile, name: str) -> bytes:
+    zinfo = zip_file.getinfo(name)
+    assert zip_file.fp is not None
+    zip_file.fp.seek(zinfo.header_offset + 26)
+    name_len, extra_len = struct.unpack("<HH", zip_file.fp.read(4))
+    zip_file.fp.seek(name_len + extra_len, io.SEEK_CUR)
+    return zip_file.fp.read(zinfo.compress_size)
+
+
+def check_copy_zip_member_raw(seekable: bool) -> None:
+    output = io.BytesIO()
+    with (
+        zipfile.ZipFile(io.BytesIO(make_source_wheel(seekable))) as input_zip,
+        zipfile.ZipFile(output, "w") as output_zip,
+    ):
+        for zinfo in input_zip.infolist():
+            copy_zip_member_raw(input_zip, output_zip, zinfo)
+
+    with (
+        zipfile.ZipFile(io.BytesIO(make_source_wheel(seekable))) as input_zip,
+        zipfile.ZipFile(output) as output_zip,
+    ):
+        assert output_zip.testzip() is None
+        assert output_zip.namelist() == input_zip.namelist()
+        for zinfo in input_zip.infolist():
+            new_zinfo = output_zip.getinfo(zinfo.filename)
+            assert new_zinfo.compress_type == zinfo.compress_type
+            assert new_zinfo.date_time == zinfo.date_time
+            assert new_zinfo.external_attr == zinfo.external_attr
+            assert read_raw_member(output_zip, zinfo.filename) == read_raw_member(
+                input_zip, zinfo.filename
+            )
+            assert output_zip.read(zinfo.filename) == input_zip.read(zinfo)
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+def test_copy_zip_member_raw(seekable: bool) -> None:
+    check_copy_zip_member_raw(seekable)
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [
+        ("_RAW_COPY_PYTHON_VERSIONS", ((3, 0), (3, 1))),
+        ("_RAW_COPY_ZIPFILE_ATTRIBUTES", ("_seekable", "_nonexistent")),
+    ],
+)
+def test_copy_zip_member_raw_fallback(
+    mocker: pytest_mock.MockerFixture, name: str, value: tuple[Any, ...]
+) -> None:
+    mocker.patch(f"variantlib.wheel.{name}", value)
+    compressor = mocker.spy(zipfile, "_get_compressor")
+    check_copy_zip_member_raw(True)
+    # The data is recompressed instead
+    assert compressor.call_count > 0
+
+
+def test_copy_zip_member_raw_no_decompression(
+    mocker: pytest_mock.MockerFixture,
+) -> None:
+    source = make_source_wheel(True)
+    decompressor = mocker.spy(zipfile, "_get_decompressor")
+    compressor = mocker.spy(zipfile, "_get_compressor")
+    with (
+        zipfile.ZipFile(io.BytesIO(source)) as input_zip,
+        zipfile.ZipFile(io.BytesIO(), "w") as output_zip,
+    ):
+        for zinfo in input_zip.infolist():
+            copy_zip_member_raw(input_zip, output_zip, zinfo)
+    assert decompressor.call_count == 0
+    assert compressor.call_count == 0
+
+
+@pytest.mark.parametrize(
+    ("new_data", "expected_record"),
+    [
+        (
+            b"{}",
+            f"foo/__init__.py,sha256=xxx,11000\nfoo/data.bin,sha256=yyy,256\nfoo-1.dist-info/RECORD,,\nfoo-1.dist-info/{VARIANT_DIST_INFO_FILENAME},sha256=RBNvo1WzZ4oRRq0W9-hknpT7T8If536DEMBg9hyq_4o,2\n",
+        ),
+        (
+            None,
+            "foo/__init__.py,sha256=xxx,11000\nfoo/data.bin,sha256=yyy,256\nfoo-1.dist-info/RECORD,,\n",
+        ),
+    ],
+)
+def test_rewrite_wheel_dist_info(new_data: bytes | None, expected_record: str) -> None:
+    output = io.BytesIO()
+    with (
+        zipfile.ZipFile(io.BytesIO(make_source_wheel(True))) as input_zip,
+        zipfile.ZipFile(output, "w") as output_zip,
+    ):
+        rewrite_wheel_dist_info(
+            input_zip, output_zip, {VARIANT_DIST_INFO_FILENAME: new_data}
+        )
+
+    with zipfile.ZipFile(output) as output_zip:
+        assert output_zip.testzip() is None
+        expected_names = ["foo/__init__.py", "foo/data.bin", "foo-1.dist-info/RECORD"]
+        if new_data is not None:
+            expected_names.insert(2, f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}")
+            assert (
+                output_zip.read(f"foo-1.dist-info/{VARIANT_DIST_INFO_FILENAME}")
+                == new_data
+            )
+        assert output_zip.namelist() == expected_names
+        assert output_zip.read("foo-1.dist-info/RECORD").decode() == expected_record
+        assert output_zip.read("foo/__init__.py") == b"import bar\n" * 1000
+
+
+def test_rewrite_wheel_dist_info_many(mocker: pytest_mock.MockerFixture) -> None:
+    outputs = [io.BytesIO(), io.BytesIO()]
+    with zipfile.ZipFile(io.BytesIO(make_source_wheel(True))) as input_zip:
+        read = mocker.spy(input_zip.fp, "read")
+        with (
+            zipfile.ZipFile(outputs[0], "w") as output_zip1,
+            zipfile.ZipFile(outputs[1], "w") as output_zip2,
+        ):
+            rewrite_wheel_dist_info_many(
+                input_zip,
+                [
+                    (output_zip1, {VARIANT_DIST_INFO_FILENAME: b"{}"}),
+                    (output_zip2, {VARIANT_DIST_INFO_FILENAME: None}),
+                ],
+            )
+        bytes_read = sum(len(x) for x in read.spy_return_list)
+
+    # Every member is read once, regardless of the number of outputs.
+    assert bytes_read < len(make_source_wheel(True))
+
+    for output, new_data in zip(outputs, [b"{}", None], strict=True):
+        expected = io.BytesIO()
+        with (
+            zipfile.ZipFile(io.BytesIO(make_source_wheel(True))) as input_zip,
+            zipfile.ZipFile(expected, "w") as expected_zip,
+        ):
+            rewrite_wheel_dist_info(
+                input_zip, expected_zip, {VARIANT_DIST_INFO_FILENAME: new_data}
+            )
+        with (
+            zipfile.ZipFile(output) as output_zip,
+            zipfile.ZipFile(expected) as expected_zip,
+        ):
+            assert output_zip.testzip() is None
+            assert output_zip.namelist() == expected_zip.namelist()
+            for name in expected_zip.namelist():
+                assert output_zip.read(name) == expected_zip.read(name)
@@ -9,6 +9,7 @@ from typing import runtime_checkable
 
 import pytest
 from variantlib.errors import ValidationError
+from variantlib.validators.base import validate_list_matches_re
 from variantlib.validators.base import validate_type
 
 # ruff: noqa: UP007
@@ -113,3 +114,35 @@ def test_validate_type_bad(value: Any, expected: type, have: type) -> None:
         ValidationError, match=re.escape(f"Expected {expected}, got {have}")
     ):
         validate_type(value, expected)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        re.compile(r"[a-z0-9_.]+"),
+        r"[a-z0-9_.]+",
+        re.compile(r"[a-z0-9_.]{1,4}"),
+        re.compile(r"(?:[a-z0-9_]|\.)+"),
+    ],
+)
+def test_validate_list_matches_re(pattern: str | re.Pattern[str]) -> None:
+    validate_list_matches_re([], pattern)
+    validate_list_matches_re(["a", "b.c", "1_2"], pattern)
+
+    for values, index in [
+        (["a", "B", "c"], 1),
+        (["a", "b", ""], 2),
+        (["a\nb"], 0),
+        (["a", "b\n"], 1),
+        (["\n", "a"], 0),
+    ]:
+        with pytest.raises(
+            ValidationError,
+            match=rf"^foo\[{index}\]: Value `{re.escape(values[index])}` must match",
+        ):
+            validate_list_matches_re(values, pattern, "foo")
+        with pytest.raises(ValidationError, match=r"^Value `"):
+            validate_list_matches_re(values, pattern)
+
+    with pytest.raises(ValidationError, match=r"^foo\[0\]: Value `abcde` must match"):
+        validate_list_matches_re(["abcde"], re.compile(r"[a-z]{1,4}"), "foo")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Union
+
+import pytest
+from variantlib.errors import ValidationError
+from variantlib.validators.keytracking import KeyTrackingValidator
+
+# ruff: noqa: UP007
+
+
+def test_get() -> None:
+    data = {"a": {"b": ["c", "d"], "e": {"f": ["g"]}}}
+    validator = KeyTrackingValidator("top", data)
+    with validator.get("a", dict[str, Any]) as a:
+        assert a is data["a"]
+        with validator.get("b", list[str]) as b:
+            assert b == ["c", "d"]
+            assert validator.key == "top.a.b"
+        with (
+            validator.get("e", dict[str, list[str]]),
+            validator.get("f", list[str]) as f,
+        ):
+            assert f == ["g"]
+        with validator.get("x", list[str], []) as x:
+            assert x == []
+    assert validator.keys == ["top"]
+
+
+def test_required_key() -> None:
+    validator = KeyTrackingValidator("top", {"a": {}})
+    with (
+        pytest.raises(ValidationError, match=r"^top\.a\.b: required key not found$"),
+        validator.get("a", dict[str, Any]),
+        validator.get("b", list[str]),
+    ):
+        pass
+
+
+def test_wrong_type() -> None:
+    validator = KeyTrackingValidator(None, {"a": {"b": ["c", 1]}})
+    expected = dict[str, list[str]]
+    found = dict[str, Union[list[str], list[Union[str, int]]]]
+    with (
+        pytest.raises(ValidationError) as exc,
+        validator.get("a", expected),
+    ):
+        pass
+    assert str(exc.value) == f"a: expected {expected}, got {found}"
+
+
+def test_unexpected_subkeys() -> None:
+    validator = KeyTrackingValidator(None, {"a": {"b": [], "c": []}})
+    with (
+        pytest.raises(
+            ValidationError,
+            match=r"^a: unexpected subkeys: \{'c'\}; expected only: \{'b'\}$",
+        ),
+        validator.get("a", dict[str, list[str]]),
+        validator.get("b", list[str]),
+    ):
+        pass
+
+    validator = KeyTrackingValidator(None, {"a": {"b": [], "c": []}})
+    with (
+        validator.get("a", dict[str, list[str]], ignore_subkeys=True),
+        validator.get("b", list[str]),
+    ):
+        pass
+
+
+def test_skip_validated_children(mocker: Any) -> None:
+    validator = KeyTrackingValidator(None, {"a": {"b": {"c": ["d"]}}})
+    validate = mocker.spy(validator, "validate")
+    with (
+        validator.get("a", dict[str, dict[str, list[str]]]),
+        validator.get("b", dict[str, list[str]]),
+        validator.get("c", list[str]),
+    ):
+        pass
+    validate.assert_called_once()
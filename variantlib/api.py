@@ -2,62 +2,88 @@
 
 from __future__ import annotations
 
-import itertools
 import logging
 import pathlib
+import zipfile
 from typing import TYPE_CHECKING
 
-from variantlib.configuration import VariantConfiguration
 from variantlib.constants import NULL_VARIANT_LABEL
 from variantlib.constants import VALIDATION_VARIANT_LABEL_REGEX
+from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
+from variantlib.constants import VARIANT_DIST_INFO_FILENAME
 from variantlib.constants import VARIANT_LABEL_LENGTH
 from variantlib.constants import VariantsJsonDict
 from variantlib.errors import ValidationError
+from variantlib.models.configuration import VariantConfiguration
 from variantlib.models.provider import ProviderConfig
+from variantlib.models.provider import ProviderConfigSnapshot
 from variantlib.models.provider import VariantFeatureConfig
 from variantlib.models.variant import VariantDescription
-from variantlib.models.variant import VariantFeature
 from variantlib.models.variant import VariantProperty
 from variantlib.models.variant import VariantValidationResult
 from variantlib.models.variant_info import VariantInfo
+from variantlib.platform_snapshot import PlatformSnapshot
 from variantlib.plugins.loader import PluginLoader
-from variantlib.resolver.lib import filter_variants
+from variantlib.resolution_table import ResolutionTable
 from variantlib.resolver.lib import sort_and_filter_supported_variants
+from variantlib.resolver.lib import sort_and_filter_supported_variants_table
+from variantlib.resolver.trace import ResolutionTrace
 from variantlib.utils import aggregate_feature_priorities
 from variantlib.utils import aggregate_namespace_priorities
 from variantlib.utils import aggregate_property_priorities
 from variantlib.variant_dist_info import VariantDistInfo
 from variantlib.variants_json import VariantsJson
+from variantlib.variants_table import VariantsTable
+from variantlib.wheel import read_variant_dist_info
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from variantlib.plugins.loader import BasePluginLoader
     from variantlib.protocols import VariantNamespace
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "VARIANT_LABEL_LENGTH",
+    "PlatformSnapshot",
     "ProviderConfig",
+    "ProviderConfigSnapshot",
+    "ResolutionTable",
+    "ResolutionTrace",
     "VariantDescription",
     "VariantFeatureConfig",
     "VariantProperty",
     "VariantValidationResult",
+    "add_wheels_to_variants_json",
+    "get_platform_snapshot",
     "get_variant_environment_dict",
     "get_variant_label",
     "get_variants_by_priority",
+    "get_wheels_namever",
     "make_variant_dist_info",
     "validate_variant",
+    "validate_variants",
 ]
 
 
-def get_variants_by_priority(
+def get_platform_snapshot(
     *,
-    variants_json: VariantsJsonDict | VariantsJson,
+    variant_info: VariantInfo,
     venv_python_executable: str | pathlib.Path | None = None,
     enable_optional_plugins: bool | list[VariantNamespace] = False,
-) -> list[str]:
-    supported_vprops = []
-    if not isinstance(variants_json, VariantsJson):
-        variants_json = VariantsJson(variants_json)
+) -> PlatformSnapshot:
+    """
+    Capture the variant properties supported by the current platform
+
+    The plugins specified in variant_info are run to obtain the supported
+    properties. The returned snapshot does not include the static properties
+    of AoT providers. It can be passed to get_variants_by_priority()
+    and check_variant_supported() for packages using the same providers,
+    in order to avoid running the plugins again.
+    Snapshots loaded from platform profiles, e.g. ones written by
+    `variantlib analyze-platform --profile`, can be used the same way.
+    """
 
     venv_python_executable = (
         venv_python_executable
@@ -66,41 +92,117 @@ def get_variants_by_priority(
     )
 
     with PluginLoader(
-        variant_info=variants_json,
+        variant_info=variant_info,
         venv_python_executable=venv_python_executable,
         enable_optional_plugins=enable_optional_plugins,
     ) as plugin_loader:
-        supported_vprops = list(
-            itertools.chain.from_iterable(
-                provider_cfg.to_list_of_properties()
-                for provider_cfg in plugin_loader.get_supported_configs().values()
+        return PlatformSnapshot.capture(plugin_loader)
+
+
+def get_variants_by_priority(
+    *,
+    variants_json: VariantsJsonDict | VariantsJson,
+    venv_python_executable: str | pathlib.Path | None = None,
+    enable_optional_plugins: bool | list[VariantNamespace] = False,
+    platform_snapshot: PlatformSnapshot | None = None,
+    trace: ResolutionTrace | None = None,
+) -> list[str]:
+    if not isinstance(variants_json, VariantsJson):
+        variants_json = VariantsJson(variants_json)
+
+    if platform_snapshot is None:
+        platform_snapshot = get_platform_snapshot(
+            variant_info=variants_json,
+            venv_python_executable=venv_python_executable,
+            enable_optional_plugins=enable_optional_plugins,
+        )
+    platform_snapshot = platform_snapshot.for_variant_info(
+        variants_json, enable_optional_plugins=enable_optional_plugins
+    )
+
+    if trace is not None and trace.user_config is None:
+        trace.user_config = VariantConfiguration(
+            namespace_priorities=platform_snapshot.namespace_priorities,
+            feature_priorities=platform_snapshot.feature_priorities,
+            property_priorities=platform_snapshot.property_priorities,
+        )
+
+    # The precomputed and columnar paths do not support tracing
+    resolution_table = variants_json.resolution_table
+    if (
+        trace is None
+        and resolution_table is not None
+        and resolution_table.ranks is not None
+        and not platform_snapshot.namespace_priorities
+        and not platform_snapshot.feature_priorities
+        and not platform_snapshot.property_priorities
+    ):
+        # Fast path: the default priorities apply, so the precomputed ranks
+        # can be used instead of sorting the variants
+        sorted_labels = resolution_table.sort(
+            resolution_table.filter_supported(
+                variants_json.variants, platform_snapshot.all_supported_properties
             )
         )
+        # handle the implicit null variant
+        if NULL_VARIANT_LABEL not in variants_json.variants:
+            sorted_labels.append(NULL_VARIANT_LABEL)
+        return sorted_labels
+
+    supported_vprops = platform_snapshot.supported_properties
+    abi_dependencies = platform_snapshot.abi_dependencies
+    namespace_priorities = aggregate_namespace_priorities(
+        platform_snapshot.namespace_priorities,
+        variants_json.namespace_priorities,
+    )
+    feature_priorities = aggregate_feature_priorities(
+        platform_snapshot.feature_priorities,
+        variants_json.feature_priorities,
+    )
+    property_priorities = aggregate_property_priorities(
+        platform_snapshot.property_priorities,
+        variants_json.property_priorities,
+    )
+    null_variant_hexdigest = VariantDescription([]).hexdigest
+
+    if trace is None and isinstance(variants_json.variants, VariantsTable):
+        # Columnar storage: resolve without creating VariantDescription objects
+        table = variants_json.variants
+        table_label_map = {
+            table.hexdigest(index): label for index, label in enumerate(table.labels)
+        }
+        sorted_labels = [
+            table_label_map[table.hexdigest(index)]
+            for index in sort_and_filter_supported_variants_table(
+                table,
+                supported_vprops,
+                namespace_priorities=namespace_priorities,
+                feature_priorities=feature_priorities,
+                property_priorities=property_priorities,
+                abi_dependencies=abi_dependencies,
+            )
+        ]
+        # handle the implicit null variant
+        if null_variant_hexdigest not in table_label_map:
+            sorted_labels.append(NULL_VARIANT_LABEL)
+        return sorted_labels
 
-    config = VariantConfiguration.get_config()
     label_map = {
         vdesc.hexdigest: label for label, vdesc in variants_json.variants.items()
     }
     # handle the implicit null variant
-    label_map.setdefault(VariantDescription([]).hexdigest, NULL_VARIANT_LABEL)
+    label_map.setdefault(null_variant_hexdigest, NULL_VARIANT_LABEL)
 
     return [
         label_map[vdesc.hexdigest]
         for vdesc in sort_and_filter_supported_variants(
             list(variants_json.variants.values()),
             supported_vprops,
-            namespace_priorities=aggregate_namespace_priorities(
-                config.namespace_priorities,
-                variants_json.namespace_priorities,
-            ),
-            feature_priorities=aggregate_feature_priorities(
-                config.feature_priorities,
-                variants_json.feature_priorities,
-            ),
-            property_priorities=aggregate_property_priorities(
-                config.property_priorities,
-                variants_json.property_priorities,
-            ),
+            namespace_priorities=namespace_priorities,
+            feature_priorities=feature_priorities,
+            property_priorities=property_priorities,
+            abi_dependencies=abi_dependencies,
+            trace=trace,
         )
     ]
 
@@ -109,6 +211,7 @@ def validate_variant(
     variant_desc: VariantDescription,
     variant_info: VariantInfo,
     venv_python_executable: str | pathlib.Path | None = None,
+    plugin_loader: BasePluginLoader | None = None,
 ) -> VariantValidationResult:
     """
     Validate all metas in the variant description
@@ -118,56 +221,64 @@ def validate_variant(
     indicates that the variant is valid, False that it is not, and None
     that no plugin provides given namespace and therefore the variant cannot
     be verified.
+
+    If plugin_loader is specified, it is used instead of loading the plugins
+    anew. It must be entered already, and have ahead-of-time plugins included.
     """
 
-    venv_python_executable = (
-        venv_python_executable
-        if venv_python_executable is None
-        else pathlib.Path(venv_python_executable)
+    (result,) = validate_variants(
+        [variant_desc],
+        variant_info,
+        venv_python_executable=venv_python_executable,
+        plugin_loader=plugin_loader,
     )
+    return result
 
-    with PluginLoader(
-        variant_info=variant_info,
-        venv_python_executable=venv_python_executable,
-        enable_optional_plugins=True,
-        filter_plugins=list({vprop.namespace for vprop in variant_desc.properties}),
-        include_aot_plugins=True,
-    ) as plugin_loader:
-        configs = {
-            namespace: {
-                cfeat.name: (cfeat.values, cfeat.multi_value)
-                for cfeat in configs.configs
-            }
-            for namespace, configs in plugin_loader.get_all_configs().items()
+
+def validate_variants(
+    variant_descs: Iterable[VariantDescription],
+    variant_info: VariantInfo,
+    venv_python_executable: str | pathlib.Path | None = None,
+    plugin_loader: BasePluginLoader | None = None,
+) -> list[VariantValidationResult]:
+    """
+    Validate all metas in multiple variant descriptions
+
+    This is equivalent to calling validate_variant() for every description,
+    except that the plugins for the union of namespaces used by all
+    descriptions are loaded and queried only once. Returns a list of results,
+    in the order of variant_descs.
+
+    If plugin_loader is specified, it is used instead of loading the plugins
+    anew. It must be entered already, and have ahead-of-time plugins included.
+    """
+
+    variant_descs = list(variant_descs)
+
+    if plugin_loader is None:
+        venv_python_executable = (
+            venv_python_executable
+            if venv_python_executable is None
+            else pathlib.Path(venv_python_executable)
+        )
+
+        namespaces = {
+            vprop.namespace: None
+            for vdesc in variant_descs
+            for vprop in vdesc.properties
         }
+        with PluginLoader(
+            variant_info=variant_info,
+            venv_python_executable=venv_python_executable,
+            enable_optional_plugins=True,
+            filter_plugins=list(namespaces),
+            include_aot_plugins=True,
+        ) as loader:
+            return validate_variants(variant_descs, variant_info, plugin_loader=loader)
 
-    return VariantValidationResult(
-        results={
-            vprop: None
-            if vprop.namespace not in configs
-            else (
-                vprop.value
-                in configs[vprop.namespace].get(vprop.feature, ([], False))[0]
-            )
-            for vprop in variant_desc.properties
-        },
-        multi_value_violations=frozenset(
-            {
-                VariantFeature(namespace, feature)
-                for namespace, features in configs.items()
-                for feature, (_, multi_value) in features.items()
-                if not multi_value
-                and len(
-                    [
-                        True
-                        for vprop in variant_desc.properties
-                        if vprop.namespace == namespace and vprop.feature == feature
-                    ]
-                )
-                > 1
-            }
-        ),
-    )
+    return ProviderConfigSnapshot.from_provider_configs(
+        plugin_loader.get_all_configs()
+    ).validate_many(variant_descs)
 
 
 def make_variant_dist_info(
@@ -176,6 +287,7 @@ def make_variant_dist_info(
     variant_label: str | None = None,
     expand_aot_plugin_properties: bool = True,
     venv_python_executable: str | pathlib.Path | None = None,
+    plugin_loader: BasePluginLoader | None = None,
 ) -> str:
     """
     Return the data for *.dist-info/{VARIANT_DIST_INFO_FILENAME} (as str)
@@ -192,6 +304,9 @@ def make_variant_dist_info(
     If expand_aot_plugin_properties is True, then default-priorities
     for ahead-of-time plugins will be filled with the current list
     of supported properties.
+
+    If plugin_loader is specified, it is used to query ahead-of-time plugins
+    instead of loading them anew. It must be entered already.
     """
 
     # If we have been parsed VariantInfo, convert it to DistMetadata.
@@ -203,31 +318,39 @@ def make_variant_dist_info(
     variant_json.variant_label = get_variant_label(vdesc, variant_label)
 
     if expand_aot_plugin_properties:
-        namespaces = {vprop.namespace for vprop in vdesc.properties}
-        build_namespaces = {
-            ns
-            for ns in namespaces
-            if ns in variant_info.providers
-            and not variant_info.providers[ns].install_time
-            and variant_info.providers[ns].requires
-        }
+        build_namespaces = variant_info.get_aot_plugin_namespaces(
+            vprop.namespace for vprop in vdesc.properties
+        )
         if build_namespaces:
-            venv_python_executable = (
-                venv_python_executable
-                if venv_python_executable is None
-                else pathlib.Path(venv_python_executable)
-            )
+            if plugin_loader is None:
+                venv_python_executable = (
+                    venv_python_executable
+                    if venv_python_executable is None
+                    else pathlib.Path(venv_python_executable)
+                )
+
+                with PluginLoader(
+                    variant_info=variant_info,
+                    venv_python_executable=venv_python_executable,
+                    enable_optional_plugins=True,
+                    filter_plugins=list(build_namespaces),
+                    include_aot_plugins=True,
+                ) as loader:
+                    return make_variant_dist_info(
+                        vdesc,
+                        variant_info=variant_info,
+                        variant_label=variant_label,
+                        plugin_loader=loader,
+                    )
 
-            with PluginLoader(
-                variant_info=variant_info,
-                venv_python_executable=venv_python_executable,
-                enable_optional_plugins=True,
-                filter_plugins=list(build_namespaces),
-                include_aot_plugins=True,
-            ) as plugin_loader:
-                configs = plugin_loader.get_supported_configs(
-                    require_fixed=True
-                ).values()
+            # Query all the AoT plugins loaded, so that the query is the same
+            # for all variants, and can be batched with validation queries.
+            configs = plugin_loader.get_supported_configs(
+                require_fixed=True,
+                namespaces=variant_info.get_aot_plugin_namespaces(
+                    plugin_loader.namespaces
+                ),
+            ).values()
 
             for config in configs:
                 if config.namespace not in build_namespaces:
@@ -272,12 +395,89 @@ def make_variant_dist_info(
     return variant_json.to_str()
 
 
+def get_wheels_namever(wheel_files: Iterable[str | pathlib.Path]) -> str:
+    """
+    Get the package name and version of variant wheels
+
+    :param wheel_files: Paths to the wheels.
+    :return: The `{name}-{version}` part of the wheel filenames.
+    :raises ValidationError: If any of the files is not a variant wheel,
+                             or the wheels are not of the same package version.
+    """
+
+    namever: str | None = None
+    for wheel_file in map(pathlib.Path, wheel_files):
+        wheel_info = VALIDATION_WHEEL_NAME_REGEX.fullmatch(wheel_file.name)
+        if wheel_info is None:
+            raise ValidationError(
+                f"The file is not a valid Python wheel: `{wheel_file.name}`"
+            )
+        if wheel_info.group("variant_label") is None:
+            raise ValidationError(
+                f"The file is not a valid Python wheel variant: `{wheel_file.name}`"
+            )
+        if namever is None:
+            namever = wheel_info.group("namever")
+        elif wheel_info.group("namever") != namever:
+            raise ValidationError(
+                f"All wheels must be of the same package version, got `{namever}` "
+                f"and `{wheel_info.group('namever')}`"
+            )
+
+    if namever is None:
+        raise ValueError("No wheels specified")
+    return namever
+
+
+def add_wheels_to_variants_json(
+    wheel_files: Iterable[str | pathlib.Path],
+    variants_json: VariantsJson | None = None,
+) -> VariantsJson:
+    """
+    Merge the variant information from wheels into a `VariantsJson`
+
+    All wheels must be variant wheels of the same package version.
+
+    :param wheel_files: Paths to the wheels to add.
+    :param variants_json: Existing `VariantsJson` to update in place. If not
+                          specified, a new one is created.
+    :return: The updated `VariantsJson`.
+    """
+
+    wheel_paths = list(map(pathlib.Path, wheel_files))
+    namever = get_wheels_namever(wheel_paths)
+
+    for wheel_file in wheel_paths:
+        wheel_info = VALIDATION_WHEEL_NAME_REGEX.fullmatch(wheel_file.name)
+        assert wheel_info is not None
+        vlabel = wheel_info.group("variant_label")
+
+        logger.info(
+            "Processing wheel: `%(wheel)s` with variant label: `%(vlabel)s`",
+            {"wheel": wheel_file.name, "vlabel": vlabel},
+        )
+        with zipfile.ZipFile(wheel_file, "r") as zip_file:
+            variant_dist_info = read_variant_dist_info(zip_file, namever, vlabel)
+        if variant_dist_info is None:
+            raise FileNotFoundError(
+                f"{wheel_file}: no {VARIANT_DIST_INFO_FILENAME} file found"
+            )
+
+        if variants_json is None:
+            variants_json = VariantsJson(variant_dist_info)
+        variants_json.merge(variant_dist_info)
+
+    assert variants_json is not None
+    return variants_json
+
+
 def check_variant_supported(
     *,
     vdesc: VariantDescription | None = None,
     variant_info: VariantInfo,
     venv_python_executable: str | pathlib.Path | None = None,
     enable_optional_plugins: bool | list[VariantNamespace] = False,
+    platform_snapshot: PlatformSnapshot | None = None,
 ) -> bool:
     """Check if variant description is supported
 
@@ -285,6 +485,9 @@ def check_variant_supported(
 
     If `vdesc` is provided, it is tested. Otherwise, `variant_info` must be
     a `DistMetadata` and variant description is inferred from it.
+
+    If `platform_snapshot` is provided, it is used instead of running
+    the plugins.
     """
 
     if vdesc is None:
@@ -296,35 +499,18 @@ def check_variant_supported(
             )
         vdesc = next(iter(variant_info.variants.values()))
 
-    venv_python_executable = (
-        venv_python_executable
-        if venv_python_executable is None
-        else pathlib.Path(venv_python_executable)
-    )
-
-    with PluginLoader(
-        variant_info=variant_info,
-        venv_python_executable=venv_python_executable,
-        enable_optional_plugins=enable_optional_plugins,
-    ) as plugin_loader:
-        supported_vprops = list(
-            itertools.chain.from_iterable(
-                provider_cfg.to_list_of_properties()
-                for provider_cfg in plugin_loader.get_supported_configs().values()
-            )
-        )
-
-    VariantConfiguration.get_config()
-
-    return bool(
-        list(
-            filter_variants(
-                vdescs=[vdesc],
-                allowed_properties=supported_vprops,
-            )
+    if platform_snapshot is None:
+        platform_snapshot = get_platform_snapshot(
+            variant_info=variant_info,
+            venv_python_executable=venv_python_executable,
+            enable_optional_plugins=enable_optional_plugins,
         )
+    platform_snapshot = platform_snapshot.for_variant_info(
+        variant_info, enable_optional_plugins=enable_optional_plugins
     )
 
+    return platform_snapshot.is_supported(vdesc)
+
 
 def get_variant_environment_dict(
     variant_desc: VariantDescription,
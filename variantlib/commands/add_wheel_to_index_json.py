@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import argparse
-import json
+import glob
 import logging
 import pathlib
-import zipfile
 
 from variantlib import __package_name__
-from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
-from variantlib.constants import VARIANT_DIST_INFO_FILENAME
+from variantlib import json_codec
+from variantlib.api import add_wheels_to_variants_json
+from variantlib.api import get_wheels_namever
 from variantlib.errors import ValidationError
-from variantlib.variant_dist_info import VariantDistInfo
+from variantlib.utils import atomic_write_text
+from variantlib.utils import file_lock
+from variantlib.utils import get_lock_path
 from variantlib.variants_json import VariantsJson
 
 logger = logging.getLogger(__name__)
@@ -22,16 +24,20 @@ class NotWheelVariantError(ValidationError):
 
 def add_wheel_to_index_json(args: list[str]) -> None:
     parser = argparse.ArgumentParser(
-        prog=f"{__package_name__} generate-index-json",
-        description="Generate a JSON index of all package variants",
+        prog=f"{__package_name__} add-wheel-to-index-json",
+        description="Add wheel variants to a Wheel Variant JSON file",
     )
 
     parser.add_argument(
         "-f",
         "--wheel-file",
-        type=pathlib.Path,
+        nargs="+",
+        action="extend",
         required=True,
-        help="Wheel file to add to the Wheel Variant JSON file",
+        help=(
+            "Wheel files (or glob patterns) to add to the Wheel Variant JSON file. "
+            "All wheels must be of the same package version."
+        ),
     )
 
     parser.add_argument(
@@ -58,13 +64,25 @@ def add_wheel_to_index_json(args: list[str]) -> None:
         help="Allows overwrite existing `output-json-file` Path. Otherwise, exception.",
     )
 
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON file without indentation",
+    )
+
     parsed_args = parser.parse_args(args)
 
     # =============================== INPUT VALIDATION ============================== #
 
-    wheel_file: pathlib.Path = parsed_args.wheel_file
-    if not wheel_file.exists() or not wheel_file.is_file():
-        raise FileNotFoundError(f"File not found: `{wheel_file}`")
+    wheel_files: dict[pathlib.Path, None] = {}
+    for pattern in parsed_args.wheel_file:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise FileNotFoundError(f"File not found: `{pattern}`")
+        for match in map(pathlib.Path, matches):
+            if not match.is_file():
+                raise FileNotFoundError(f"File not found: `{match}`")
+            wheel_files[match] = None
 
     input_json_file: pathlib.Path | None = parsed_args.input_json_file
     if input_json_file is None:
@@ -79,62 +97,32 @@ def add_wheel_to_index_json(args: list[str]) -> None:
     if not output_directory.exists() or not output_directory.is_dir():
         raise FileExistsError(f"Output directory `{output_directory}` does not exist.")
 
-    wheel_info = VALIDATION_WHEEL_NAME_REGEX.fullmatch(wheel_file.name)
-    if wheel_info is None:
-        raise ValidationError(
-            f"The file is not a valid Python wheel: `{wheel_file.name}`"
-        )
-
-    if (vlabel := wheel_info.group("variant_label")) is None:
-        raise NotWheelVariantError(
-            f"The file is not a valid Python wheel variant: `{wheel_file.name}`"
-        )
-
-    # ==================== Load Existing Wheel Variant JSON file ==================== #
+    try:
+        namever = get_wheels_namever(wheel_files)
+    except ValidationError as err:
+        raise NotWheelVariantError(str(err)) from err
 
-    variant_json: None | VariantsJson = None
-
-    if input_json_file is not None:
-        with input_json_file.open(mode="r") as f:
-            variant_json = VariantsJson(json.load(f))
-
-    # ======================== Wheel Variant JSON Generation ======================== #
-
-    logger.info(
-        "Processing wheel: `%(wheel)s` with variant label: `%(vlabel)s`",
-        {"wheel": wheel_file.name, "vlabel": vlabel},
-    )
+    output_json_file = output_directory / f"{namever}-variants.json"
 
-    with zipfile.ZipFile(wheel_file, "r") as zip_file:
-        # Find the variant dist-info file
-        for name in zip_file.namelist():
-            components = name.split("/", 2)
-            if (
-                len(components) == 2
-                and components[0].endswith(".dist-info")
-                and components[1] == VARIANT_DIST_INFO_FILENAME
-            ):
-                variant_dist_info = VariantDistInfo(zip_file.read(name), vlabel)
-                break
-        else:
-            raise FileNotFoundError(
-                "%(wheel)s: no %(filename)s file found",
-                {"wheel": wheel_file, "filename": VARIANT_DIST_INFO_FILENAME},
+    # Serialize concurrent updates of the same file
+    with file_lock(get_lock_path(output_json_file)):
+        if output_json_file.exists() and not parsed_args.overwrite:
+            raise FileExistsError(
+                f"Output JSON file already exists: `{output_json_file}`, use "
+                "`--overwrite` to proceed."
             )
 
-    if variant_json is None:
-        variant_json = variant_dist_info
-    else:
-        variant_json.merge(variant_dist_info)
+        # ================== Load Existing Wheel Variant JSON file ================== #
 
-    namever = wheel_info.group("namever")
+        variant_json: None | VariantsJson = None
 
-    output_json_file = output_directory / f"{namever}-variants.json"
+        if input_json_file is not None:
+            with input_json_file.open(mode="rb") as f:
+                variant_json = VariantsJson(json_codec.load(f))
 
-    if output_json_file.exists() and not parsed_args.overwrite:
-        raise FileExistsError(
-            f"Output JSON file already exists: `{output_json_file}`, use `--overwrite` "
-            "to proceed."
-        )
+        # ====================== Wheel Variant JSON Generation ====================== #
 
-    output_json_file.write_text(variant_json.to_str())
+        variant_json = add_wheels_to_variants_json(wheel_files, variant_json)
+        atomic_write_text(
+            output_json_file, variant_json.to_str(compact=parsed_args.compact)
+        )
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import argparse
 import logging
+import pathlib
 import sys
 
 from variantlib import __package_name__
+from variantlib.platform_snapshot import PlatformSnapshot
 from variantlib.plugins.loader import EntryPointPluginLoader
+from variantlib.utils import atomic_write_text
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +18,33 @@ def analyze_platform(args: list[str]) -> None:
         prog=f"{__package_name__} analyze-platform",
         description="Analyze the platform and return the variant hashes compatible",
     )
-    parser.parse_args(args)
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Output a machine-readable platform profile (JSON) that can be used "
+            "to resolve variants without running plugins"
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output-file",
+        type=pathlib.Path,
+        help="Write the platform profile into the specified file (implies --profile)",
+    )
+    parsed_args = parser.parse_args(args)
 
     with EntryPointPluginLoader() as loader:
         logger.info("Analyzing the platform ...\n")
+
+        if parsed_args.profile or parsed_args.output_file is not None:
+            profile = PlatformSnapshot.capture(loader).to_str()
+            if parsed_args.output_file is not None:
+                atomic_write_text(parsed_args.output_file, profile)
+            else:
+                sys.stdout.write(f"{profile}\n")
+            return
+
         variant_cfgs = loader.get_supported_configs().values()
 
         # We have to flush the logger handlers to ensure that all logs are printed
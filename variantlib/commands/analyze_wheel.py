@@ -11,7 +11,7 @@ from variantlib import __package_name__
 from variantlib.api import get_variant_label
 from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
 from variantlib.constants import VARIANT_DIST_INFO_FILENAME
-from variantlib.variant_dist_info import VariantDistInfo
+from variantlib.wheel import read_variant_dist_info
 
 if TYPE_CHECKING:
     from variantlib.models.variant import VariantDescription
@@ -70,16 +70,10 @@ def analyze_wheel(args: list[str]) -> None:
     )
 
     with zipfile.ZipFile(input_file, "r") as zip_file:
-        for name in zip_file.namelist():
-            components = name.split("/", 2)
-            if (
-                len(components) == 2
-                and components[0].endswith(".dist-info")
-                and components[1] == VARIANT_DIST_INFO_FILENAME
-            ):
-                variant_dist_info = VariantDistInfo(zip_file.read(name), variant_label)
-                break
-        else:
+        variant_dist_info = read_variant_dist_info(
+            zip_file, wheel_info.group("namever"), variant_label
+        )
+        if variant_dist_info is None:
             raise ValueError(f"Invalid wheel -- no {VARIANT_DIST_INFO_FILENAME} found")
 
         # We have to flush the logger handlers to ensure that all logs are printed
@@ -5,19 +5,91 @@ import logging
 import pathlib
 import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
+from typing import Any
 
 from variantlib import __package_name__
+from variantlib import json_codec
 from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
 from variantlib.constants import VARIANT_DIST_INFO_FILENAME
+from variantlib.constants import VARIANTS_JSON_MANIFEST_FILENAME
 from variantlib.errors import ValidationError
+from variantlib.utils import atomic_write_text
+from variantlib.utils import file_lock
+from variantlib.utils import get_lock_path
 from variantlib.variant_dist_info import VariantDistInfo
+from variantlib.wheel import read_variant_dist_info
 
 if TYPE_CHECKING:
     from variantlib.variants_json import VariantsJson
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_VERSION = 1
+
+
+def _read_wheel(
+    wheel: pathlib.Path, namever: str, vlabel: str
+) -> VariantDistInfo | None:
+    """Read the variant dist-info from a wheel, return None if it is invalid"""
+
+    logger.info(
+        "Processing wheel: `%(wheel)s` with variant label: `%(vlabel)s`",
+        {"wheel": wheel.name, "vlabel": vlabel},
+    )
+
+    try:
+        with zipfile.ZipFile(wheel, "r") as zip_file:
+            variant_dist_info = read_variant_dist_info(zip_file, namever, vlabel)
+    except ValidationError as err:
+        logger.warning(
+            "%(wheel)s: %(err)s",
+            {
+                "wheel": wheel,
+                "err": err,
+            },
+        )
+        return None
+
+    if variant_dist_info is None:
+        logger.warning(
+            "%(wheel)s: no %(filename)s file found",
+            {"wheel": wheel, "filename": VARIANT_DIST_INFO_FILENAME},
+        )
+    return variant_dist_info
+
+
+def _load_manifest(
+    path: pathlib.Path, compact: bool, resolution_table: bool
+) -> dict[str, Any]:
+    """Load the manifest from the previous run, return {} if it can't be used"""
+
+    try:
+        with path.open("rb") as f:
+            manifest = json_codec.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning(
+            "Invalid manifest file `%(path)s`, regenerating all files",
+            {"path": path},
+        )
+        return {}
+
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("compact") != compact
+        or manifest.get("resolution_table", False) != resolution_table
+    ):
+        logger.info(
+            "Manifest file `%(path)s` is outdated, regenerating all files",
+            {"path": path},
+        )
+        return {}
+    return manifest
+
 
 def generate_index_json(args: list[str]) -> None:
     parser = argparse.ArgumentParser(
@@ -32,21 +104,70 @@ def generate_index_json(args: list[str]) -> None:
         help="Directory to process",
     )
 
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the JSON files without indentation",
+    )
+
+    parser.add_argument(
+        "--resolution-table",
+        action="store_true",
+        help=(
+            "Embed a precomputed resolution table, allowing clients to choose "
+            "variants without sorting them"
+        ),
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of wheels to read in parallel (default: 1)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Process only the wheels that changed since the previous run, "
+            f"tracked in `{VARIANTS_JSON_MANIFEST_FILENAME}` manifest"
+        ),
+    )
+
     parsed_args = parser.parse_args(args)
 
     directory: pathlib.Path = parsed_args.directory
+    jobs: int = parsed_args.jobs
+
+    if jobs < 1:
+        parser.error(f"--jobs must be at least 1, got {jobs}")
 
     if not directory.exists():
         raise FileNotFoundError(f"Directory not found: `{directory}`")
     if not directory.is_dir():
         raise NotADirectoryError(f"Directory not found: `{directory}`")
 
-    output_files: dict[str, VariantsJson] = {}
-    seen_variants: dict[str, dict[str, set[str]]] = defaultdict(
-        lambda: defaultdict(set)
-    )
+    manifest_path = directory / VARIANTS_JSON_MANIFEST_FILENAME
+    incremental: bool = parsed_args.incremental
+    manifest: dict[str, Any] = {}
+    if incremental:
+        manifest = _load_manifest(
+            manifest_path,
+            compact=parsed_args.compact,
+            resolution_table=parsed_args.resolution_table,
+        )
+    cached_wheels: dict[str, dict[str, Any]] = manifest.get("wheels", {})
+    new_manifest: dict[str, Any] = {
+        "version": MANIFEST_VERSION,
+        "compact": parsed_args.compact,
+        "resolution_table": parsed_args.resolution_table,
+        "wheels": {},
+    }
 
-    for wheel in directory.glob("*.whl"):
+    wheels: list[tuple[pathlib.Path, str, str]] = []
+    for wheel in sorted(directory.glob("*.whl")):
         # Skip non wheel variants
         if (wheel_info := VALIDATION_WHEEL_NAME_REGEX.fullmatch(wheel.name)) is None:
             logger.exception(
@@ -62,40 +183,84 @@ def generate_index_json(args: list[str]) -> None:
             )
             continue
 
-        logger.info(
-            "Processing wheel: `%(wheel)s` with variant label: `%(vlabel)s`",
-            {"wheel": wheel.name, "vlabel": vlabel},
+        wheels.append((wheel, wheel_info.group("namever"), vlabel))
+
+    # Find the wheels that changed since the last run
+    stats = [wheel.stat() for wheel, _, _ in wheels] if incremental else []
+    changed: list[int] = []
+    unchanged: dict[int, dict[str, Any]] = {}
+    affected_namevers: set[str] = set()
+    for index, (wheel, namever, _) in enumerate(wheels):
+        entry = cached_wheels.pop(wheel.name, None)
+        if entry is not None and (entry["size"], entry["mtime_ns"]) == (
+            stats[index].st_size,
+            stats[index].st_mtime_ns,
+        ):
+            unchanged[index] = entry
+        else:
+            changed.append(index)
+            affected_namevers.add(namever)
+
+    if incremental:
+        # Wheels that were removed since the last run
+        affected_namevers.update(entry["namever"] for entry in cached_wheels.values())
+        # Output files that were removed since the last run
+        affected_namevers.update(
+            namever
+            for _, namever, _ in wheels
+            if not (directory / f"{namever}-variants.json").exists()
         )
 
-        try:
-            with zipfile.ZipFile(wheel, "r") as zip_file:
-                # Find the variant dist-info file
-                for name in zip_file.namelist():
-                    components = name.split("/", 2)
-                    if (
-                        len(components) == 2
-                        and components[0].endswith(".dist-info")
-                        and components[1] == VARIANT_DIST_INFO_FILENAME
-                    ):
-                        variant_dist_info = VariantDistInfo(zip_file.read(name), vlabel)
-                        break
-                else:
-                    logger.warning(
-                        "%(wheel)s: no %(filename)s file found",
-                        {"wheel": wheel, "filename": VARIANT_DIST_INFO_FILENAME},
-                    )
-                    continue
-        except ValidationError as err:
-            logger.warning(
-                "%(wheel)s: %(err)s",
-                {
-                    "wheel": wheel,
-                    "err": err,
-                },
+    results: list[VariantDistInfo | None] = [None] * len(wheels)
+    changed_paths = [wheels[index][0] for index in changed]
+    changed_namevers = [wheels[index][1] for index in changed]
+    changed_labels = [wheels[index][2] for index in changed]
+    if jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            changed_results = list(
+                executor.map(
+                    _read_wheel, changed_paths, changed_namevers, changed_labels
+                )
             )
+    else:
+        changed_results = list(
+            map(_read_wheel, changed_paths, changed_namevers, changed_labels)
+        )
+    for index, variant_dist_info in zip(changed, changed_results, strict=True):
+        results[index] = variant_dist_info
+
+    # Unchanged wheels are only needed to regenerate the affected files
+    for index, entry in unchanged.items():
+        if entry["namever"] in affected_namevers and entry["variant_json"] is not None:
+            results[index] = VariantDistInfo(entry["variant_json"], wheels[index][2])
+
+    if incremental:
+        for index, (wheel, namever, _) in enumerate(wheels):
+            if (entry := unchanged.get(index)) is None:
+                variant_dist_info = results[index]
+                entry = {
+                    "namever": namever,
+                    "size": stats[index].st_size,
+                    "mtime_ns": stats[index].st_mtime_ns,
+                    "variant_json": None,
+                }
+                if variant_dist_info is not None:
+                    entry["variant_json"] = variant_dist_info.to_str(compact=True)
+            new_manifest["wheels"][wheel.name] = entry
+
+    output_files: dict[str, VariantsJson] = {}
+    seen_variants: dict[str, dict[str, set[str]]] = defaultdict(
+        lambda: defaultdict(set)
+    )
+
+    # Merge in the original order, so that the result does not depend
+    # on the number of jobs.
+    for (wheel, namever, vlabel), variant_dist_info in zip(
+        wheels, results, strict=True
+    ):
+        if variant_dist_info is None:
             continue
 
-        namever = wheel_info.group("namever")
         if (variants_json := output_files.get(namever)) is None:
             # Create a new JSON file from the initial wheel.
             output_files[namever] = variant_dist_info
@@ -122,4 +287,18 @@ def generate_index_json(args: list[str]) -> None:
 
     for namever, variants_json in output_files.items():
         path = directory / f"{namever}-variants.json"
-        path.write_text(variants_json.to_str())
+        if parsed_args.resolution_table:
+            variants_json.build_resolution_table()
+        with file_lock(get_lock_path(path)):
+            atomic_write_text(path, variants_json.to_str(compact=parsed_args.compact))
+
+    if incremental:
+        # Remove the files for packages that no longer have any wheels
+        for namever in affected_namevers - output_files.keys():
+            path = directory / f"{namever}-variants.json"
+            with file_lock(get_lock_path(path)):
+                if path.exists():
+                    logger.info("Removing stale `%(path)s`", {"path": path})
+                    path.unlink()
+
+        atomic_write_text(manifest_path, json_codec.dumps(new_manifest, compact=True))
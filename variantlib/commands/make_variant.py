@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 import argparse
-import base64
-import hashlib
 import logging
 import pathlib
-import shutil
 import sys
 import zipfile
-from contextlib import nullcontext
+from contextlib import ExitStack
+from contextlib import suppress
 from subprocess import CalledProcessError
+from typing import TYPE_CHECKING
 
 from build.env import DefaultIsolatedEnv
 
@@ -18,17 +17,65 @@ from variantlib.api import VariantDescription
 from variantlib.api import VariantProperty
 from variantlib.api import get_variant_label
 from variantlib.api import make_variant_dist_info
-from variantlib.api import validate_variant
+from variantlib.api import validate_variants
+from variantlib.constants import NULL_VARIANT_LABEL
 from variantlib.constants import VALIDATION_VARIANT_LABEL_REGEX
 from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
 from variantlib.constants import VARIANT_DIST_INFO_FILENAME
 from variantlib.constants import VARIANT_LABEL_LENGTH
 from variantlib.errors import ValidationError
+from variantlib.plugins.loader import ConfigsQuery
+from variantlib.plugins.loader import PluginLoader
 from variantlib.pyproject_toml import VariantPyProjectToml
+from variantlib.venv_cache import CachedIsolatedEnv
+from variantlib.venv_cache import get_venv_cache_dir
+from variantlib.wheel import rewrite_wheel_dist_info_many
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from types import TracebackType
+
+    from variantlib.plugins.loader import ConfigsMethod
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_variant_spec(value: str) -> tuple[VariantDescription, str | None]:
+    """Parse `[LABEL=]PROPERTY[,PROPERTY...]` or `null`"""
+
+    variant_label: str | None = None
+    if "=" in value:
+        variant_label, value = value.split("=", 1)
+        if variant_label == NULL_VARIANT_LABEL or not (
+            VALIDATION_VARIANT_LABEL_REGEX.fullmatch(variant_label)
+        ):
+            raise argparse.ArgumentTypeError(
+                f"invalid variant label (must be up to {VARIANT_LABEL_LENGTH} "
+                f"alphanumeric characters, and not {NULL_VARIANT_LABEL!r}): "
+                f"{variant_label!r}"
+            )
+
+    if value.strip() == NULL_VARIANT_LABEL:
+        if variant_label is not None:
+            raise argparse.ArgumentTypeError(
+                "custom variant label cannot be used with the null variant"
+            )
+        return VariantDescription(), None
+
+    try:
+        vdesc = VariantDescription(
+            properties=[VariantProperty.from_str(x) for x in value.split(",")]
+        )
+    except ValidationError as err:
+        raise argparse.ArgumentTypeError(str(err)) from err
+    return vdesc, variant_label
+
+
 def make_variant(args: list[str]) -> None:
     parser = argparse.ArgumentParser(
         prog=f"{__package_name__} make-variant",
@@ -38,10 +85,15 @@ def make_variant(args: list[str]) -> None:
     parser.add_argument(
         "-f",
         "--file",
-        dest="input_filepath",
+        dest="input_filepaths",
         type=pathlib.Path,
+        nargs="+",
+        action="extend",
         required=True,
-        help="Wheel file to process",
+        help=(
+            "Wheel files to process. The provider environment is shared between "
+            "all the files"
+        ),
     )
 
     parser.add_argument(
@@ -58,6 +110,24 @@ def make_variant(args: list[str]) -> None:
         help="Use providers already installed in callignPython environment",
     )
 
+    parser.add_argument(
+        "--venv-cache",
+        action="store_true",
+        help=(
+            "Reuse isolated environments with provider dependencies installed "
+            "from a persistent cache"
+        ),
+    )
+
+    parser.add_argument(
+        "--venv-cache-dir",
+        type=pathlib.Path,
+        help=(
+            "Directory to store the isolated environment cache in (implies "
+            "--venv-cache, default: user cache directory)"
+        ),
+    )
+
     parser.add_argument(
         "--installer",
         choices=("pip", "uv"),
@@ -86,6 +156,20 @@ def make_variant(args: list[str]) -> None:
         help="make the variant a `null variant` - no variant property.",
     )
 
+    group.add_argument(
+        "--variant",
+        dest="variants",
+        type=_parse_variant_spec,
+        action="append",
+        metavar="[LABEL=]PROPERTY[,PROPERTY...]",
+        help=(
+            "Create a Wheel Variant with the specified comma-separated variant "
+            "properties, optionally using a custom label, or `null` for the null "
+            "variant. Can be repeated to create multiple Wheel Variants from "
+            "a single pass over the input Wheel"
+        ),
+    )
+
     parser.add_argument(
         "--skip-plugin-validation",
         action="store_true",
@@ -112,6 +196,8 @@ def make_variant(args: list[str]) -> None:
     if parsed_args.variant_label is not None:
         if parsed_args.null_variant:
             parser.error("--variant-label cannot be used with --null-variant")
+        if parsed_args.variants is not None:
+            parser.error("--variant-label cannot be used with --variant")
         if parsed_args.variant_label == "null":
             parser.error(
                 "invalid variant label: 'none' is reserved for the --null-variant"
@@ -126,34 +212,223 @@ def make_variant(args: list[str]) -> None:
         pyproject_toml = VariantPyProjectToml.from_path(parsed_args.pyproject_toml)
     except FileNotFoundError:
         parser.error(f"{str(parsed_args.pyproject_toml)!r} does not exist")
-    input_filepath: pathlib.Path = parsed_args.input_filepath
+    input_filepaths: list[pathlib.Path] = parsed_args.input_filepaths
     output_directory: pathlib.Path = parsed_args.output_directory
 
-    _make_variant(
-        input_filepath,
-        output_directory,
-        is_null_variant=parsed_args.null_variant,
-        properties=parsed_args.properties,
-        validate_properties=not parsed_args.skip_plugin_validation,
-        variant_info=pyproject_toml,
+    variants: list[tuple[VariantDescription, str | None]]
+    if parsed_args.variants is not None:
+        variants = parsed_args.variants
+    elif parsed_args.null_variant:
+        variants = [(VariantDescription(), None)]
+    else:
+        variants = [
+            (
+                VariantDescription(properties=parsed_args.properties),
+                parsed_args.variant_label,
+            )
+        ]
+
+    venv_cache_dir: pathlib.Path | None = parsed_args.venv_cache_dir
+    if venv_cache_dir is None and parsed_args.venv_cache:
+        venv_cache_dir = get_venv_cache_dir()
+
+    with BuildVariantSession(
+        pyproject_toml,
         installer=parsed_args.installer,
         use_isolation=not parsed_args.no_isolation,
-        variant_label=parsed_args.variant_label,
-    )
+        venv_cache_dir=venv_cache_dir,
+    ) as session:
+        for input_filepath in input_filepaths:
+            _make_variants(
+                input_filepath,
+                output_directory,
+                variants,
+                session=session,
+                validate_properties=not parsed_args.skip_plugin_validation,
+            )
+
+
+class BuildVariantSession:
+    """
+    Provider environment and plugins shared between Wheel Variant builds
+
+    An isolated environment is created once per set of provider requirements,
+    and kept until the session is exited. If `venv_cache_dir` is specified,
+    the environments are taken from a persistent cache instead. The same
+    plugin loader is used both to validate variant properties and to expand
+    ahead-of-time plugin properties.
+    """
+
+    def __init__(
+        self,
+        variant_info: VariantPyProjectToml,
+        *,
+        installer: str | None = None,
+        use_isolation: bool = True,
+        venv_cache_dir: pathlib.Path | None = None,
+    ) -> None:
+        if installer not in (None, "pip", "uv"):
+            raise ValueError(f"unexpected installer={installer}")
+
+        self.variant_info = variant_info
+        self._installer = installer
+        self._use_isolation = use_isolation
+        self._venv_cache_dir = venv_cache_dir
+        self._exit_stack: ExitStack | None = None
+        self._venvs: dict[frozenset[str], DefaultIsolatedEnv | CachedIsolatedEnv] = {}
+        self._plugin_loaders: dict[frozenset[str], PluginLoader] = {}
+
+    def __enter__(self) -> Self:
+        if self._exit_stack is not None:
+            raise RuntimeError("Already inside the context manager!")
+        self._exit_stack = ExitStack()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._exit_stack is None:
+            raise RuntimeError("Context manager not entered!")
+        try:
+            self._exit_stack.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._exit_stack = None
+            self._venvs.clear()
+            self._plugin_loaders.clear()
+
+    def _get_venv(
+        self, requires: frozenset[str]
+    ) -> DefaultIsolatedEnv | CachedIsolatedEnv:
+        assert self._exit_stack is not None
+
+        with suppress(KeyError):
+            return self._venvs[requires]
+
+        venv: DefaultIsolatedEnv | CachedIsolatedEnv
+        try:
+            if self._venv_cache_dir is not None:
+                venv = self._exit_stack.enter_context(
+                    CachedIsolatedEnv(
+                        requires,
+                        installer=self._installer,
+                        cache_dir=self._venv_cache_dir,
+                    )
+                )
+            else:
+                # make it really verbose to make mypy happy
+                if self._installer is None:
+                    env_factory = DefaultIsolatedEnv()
+                elif self._installer == "pip":
+                    env_factory = DefaultIsolatedEnv(installer="pip")
+                else:
+                    env_factory = DefaultIsolatedEnv(installer="uv")
+
+                venv = self._exit_stack.enter_context(env_factory)
+                venv.install(sorted(requires))
+        except CalledProcessError as err:
+            sys.stderr.write(
+                "Installing variant provider dependencies failed:\n"
+                f"{err.stderr.decode()}"
+            )
+            raise
+
+        self._venvs[requires] = venv
+        return venv
+
+    def get_plugin_loader(self, namespaces: Collection[str]) -> PluginLoader:
+        """
+        Get a loaded plugin loader for the specified namespaces
+
+        The provider environment is created on first use, and the loader
+        is reused for subsequent calls with the same namespaces.
+        """
+
+        if self._exit_stack is None:
+            raise RuntimeError("Context manager not entered!")
 
+        namespaces = frozenset(namespaces)
+        with suppress(KeyError):
+            return self._plugin_loaders[namespaces]
+
+        venv_python_executable: pathlib.Path | None = None
+        if self._use_isolation:
+            venv = self._get_venv(
+                frozenset(self.variant_info.get_provider_requires(set(namespaces)))
+            )
+            venv_python_executable = pathlib.Path(venv.python_executable)
+
+        plugin_loader = self._exit_stack.enter_context(
+            PluginLoader(
+                variant_info=self.variant_info,
+                venv_python_executable=venv_python_executable,
+                enable_optional_plugins=True,
+                filter_plugins=list(namespaces),
+                include_aot_plugins=True,
+            )
+        )
+
+        # Query the configs needed both to validate variants and to expand
+        # AoT plugin properties in a single plugin invocation. The results
+        # are cached for validate_variants() and make_variant_dist_info().
+        queries: dict[ConfigsMethod, ConfigsQuery] = {"get_all_configs": ConfigsQuery()}
+        if aot_namespaces := self.variant_info.get_aot_plugin_namespaces(
+            plugin_loader.namespaces
+        ):
+            queries["get_supported_configs"] = ConfigsQuery(
+                namespaces=frozenset(aot_namespaces), require_fixed=True
+            )
+        plugin_loader.query_configs(queries)
 
-def _make_variant(
+        self._plugin_loaders[namespaces] = plugin_loader
+        return plugin_loader
+
+
+def _validate_variants(
+    vdescs: list[VariantDescription],
+    plugin_loader: PluginLoader,
+    variant_info: VariantPyProjectToml,
+) -> None:
+    # Verify whether the variant properties are valid
+    for vdesc_valid in validate_variants(
+        vdescs, variant_info=variant_info, plugin_loader=plugin_loader
+    ):
+        if vdesc_valid.invalid_properties:
+            invalid_str = ", ".join(x.to_str() for x in vdesc_valid.invalid_properties)
+            raise ValidationError(
+                "The following variant properties are invalid according to the "
+                f"plugins: {invalid_str}"
+            )
+        if vdesc_valid.unknown_properties:
+            unknown_str = ", ".join(x.to_str() for x in vdesc_valid.unknown_properties)
+            raise ValidationError(
+                "The following variant properties use namespaces that are not "
+                f"provided by any installed plugin: {unknown_str}"
+            )
+
+
+def _make_variants(
     input_filepath: pathlib.Path,
     output_directory: pathlib.Path,
+    variants: list[tuple[VariantDescription, str | None]],
     *,
-    is_null_variant: bool,
-    properties: list[VariantProperty],
+    session: BuildVariantSession,
     validate_properties: bool = True,
-    variant_info: VariantPyProjectToml,
-    installer: str | None = None,
-    use_isolation: bool = True,
-    variant_label: str | None = None,
-) -> None:
+) -> list[pathlib.Path]:
+    """
+    Create multiple Wheel Variants from a single Wheel
+
+    The input wheel is read only once, and its members are copied into
+    all the outputs without being recompressed.
+
+    :param variants: List of variant descriptions to create, along with
+                     custom variant labels (or None to use the variant hash).
+    :param session: Session providing the provider environment and plugins.
+    :return: Paths to the created Wheel Variants.
+    """
+
     # Input Validation
     if not input_filepath.is_file():
         raise FileNotFoundError(f"Input Wheel File `{input_filepath}` does not exists.")
@@ -168,122 +443,50 @@ def _make_variant(
     if wheel_info is None:
         raise ValueError(f"{input_filepath.name!r} is not a valid wheel filename.")
 
-    if not is_null_variant:
-        # Transform properties into a VariantDescription
-        vdesc = VariantDescription(properties=properties)
+    variant_info = session.variant_info
+    plugin_loader: PluginLoader | None = None
+    if validate_properties and (
+        vdescs := [vdesc for vdesc, _ in variants if not vdesc.is_null_variant()]
+    ):
+        # All the variants are validated using a single plugin loader, that is
+        # subsequently used to expand ahead-of-time plugin properties.
+        plugin_loader = session.get_plugin_loader(
+            {vprop.namespace for vdesc in vdescs for vprop in vdesc.properties}
+        )
+        _validate_variants(vdescs, plugin_loader, variant_info)
 
-        if validate_properties:
-            env_factory: DefaultIsolatedEnv | nullcontext[None]
+    outputs: dict[pathlib.Path, bytes] = {}
+    for vdesc, custom_label in variants:
+        variant_label = get_variant_label(vdesc, custom_label)
 
-            if use_isolation:
-                # make it really verbose to make mypy happy
-                if installer is None:
-                    env_factory = DefaultIsolatedEnv()
-                elif installer == "pip":
-                    env_factory = DefaultIsolatedEnv(installer="pip")
-                elif installer == "uv":
-                    env_factory = DefaultIsolatedEnv(installer="uv")
-                else:
-                    raise ValueError(f"unexpected installer={installer}")
-            else:
-                env_factory = nullcontext()
-
-            with env_factory as venv:
-                if venv is not None:
-                    try:
-                        venv.install(
-                            variant_info.get_provider_requires(
-                                {vprop.namespace for vprop in vdesc.properties}
-                            )
-                        )
-                    except CalledProcessError as err:
-                        sys.stderr.write(
-                            "Installing variant provider dependencies failed:\n"
-                            f"{err.stderr.decode()}"
-                        )
-                        raise
-
-                # Verify whether the variant properties are valid
-                vdesc_valid = validate_variant(
-                    vdesc,
-                    variant_info=variant_info,
-                    venv_python_executable=venv.python_executable
-                    if venv is not None
-                    else None,
+        # Determine output wheel filename
+        output_filepath = (
+            output_directory
+            / f"{wheel_info.group('base_wheel_name')}-{variant_label}.whl"
+        )
+        if output_filepath in outputs:
+            raise ValueError(f"Duplicate variant label: `{variant_label}`")
+
+        outputs[output_filepath] = make_variant_dist_info(
+            vdesc,
+            variant_info=variant_info,
+            variant_label=variant_label,
+            plugin_loader=plugin_loader,
+        ).encode("utf-8")
+
+    with ExitStack() as exit_stack:
+        input_zip = exit_stack.enter_context(zipfile.ZipFile(input_filepath, "r"))
+        rewrite_wheel_dist_info_many(
+            input_zip,
+            [
+                (
+                    exit_stack.enter_context(zipfile.ZipFile(output_filepath, "w")),
+                    {VARIANT_DIST_INFO_FILENAME: dist_info_data},
                 )
-                if vdesc_valid.invalid_properties:
-                    invalid_str = ", ".join(
-                        x.to_str() for x in vdesc_valid.invalid_properties
-                    )
-                    raise ValidationError(
-                        "The following variant properties are invalid according to the "
-                        f"plugins: {invalid_str}"
-                    )
-                if vdesc_valid.unknown_properties:
-                    unknown_str = ", ".join(
-                        x.to_str() for x in vdesc_valid.unknown_properties
-                    )
-                    raise ValidationError(
-                        "The following variant properties use namespaces that are not "
-                        f"provided by any installed plugin: {unknown_str}"
-                    )
-    else:
-        # Create a null variant
-        vdesc = VariantDescription()
-
-    variant_label = get_variant_label(vdesc, variant_label)
-
-    # Determine output wheel filename
-    output_filepath = (
-        output_directory / f"{wheel_info.group('base_wheel_name')}-{variant_label}.whl"
-    )
-
-    with (
-        zipfile.ZipFile(input_filepath, "r") as input_zip,
-        zipfile.ZipFile(output_filepath, "w") as output_zip,
-    ):
-        for file_info in input_zip.infolist():
-            components = file_info.filename.split("/", 2)
-            is_dist_info = len(components) == 2 and components[0].endswith(".dist-info")
-
-            if is_dist_info and components[1] == VARIANT_DIST_INFO_FILENAME:
-                # If a wheel dist-info file exists already, discard the existing
-                # copy.
-                continue
-
-            with input_zip.open(file_info, "r") as input_file:
-                if is_dist_info and components[1] == "RECORD":
-                    # First, add new dist-info file prior to RECORD (not strictly
-                    # required, but a nice convention).
-                    dist_info_path = f"{components[0]}/{VARIANT_DIST_INFO_FILENAME}"
-                    dist_info_data = make_variant_dist_info(
-                        vdesc, variant_info=variant_info, variant_label=variant_label
-                    )
-                    output_zip.writestr(dist_info_path, dist_info_data)
-
-                    # Update RECORD for the new checksums.
-                    with output_zip.open(file_info, "w") as output_file:
-                        for line in input_file:
-                            new_line = line
-                            rec_filename, _sha256, _size = line.split(b",")
-                            # Skip existing hash for the discarded copy.
-                            if rec_filename.decode("utf-8") == dist_info_path:
-                                continue
-                            output_file.write(new_line)
-
-                        # Write hash for the new files.
-                        new_sha256 = base64.urlsafe_b64encode(
-                            hashlib.sha256(dist_info_data.encode("utf8")).digest()
-                        ).rstrip(b"=")
-                        output_file.write(
-                            (
-                                f"{dist_info_path},"
-                                f"sha256={new_sha256.decode()},"
-                                f"{len(dist_info_data)}\n"
-                            ).encode()
-                        )
-                else:
-                    with output_zip.open(file_info, "w") as output_file:
-                        shutil.copyfileobj(input_file, output_file)
+                for output_filepath, dist_info_data in outputs.items()
+            ],
+        )
 
-    logger.info("Variant Wheel Created: `%s`", output_filepath.resolve())
+    for output_filepath in outputs:
+        logger.info("Variant Wheel Created: `%s`", output_filepath.resolve())
+    return list(outputs)
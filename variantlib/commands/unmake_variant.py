@@ -5,12 +5,12 @@ import email.parser
 import email.policy
 import logging
 import pathlib
-import shutil
 import zipfile
 
 from variantlib import __package_name__
 from variantlib.constants import VALIDATION_WHEEL_NAME_REGEX
 from variantlib.constants import VARIANT_DIST_INFO_FILENAME
+from variantlib.wheel import rewrite_wheel_dist_info
 
 logger = logging.getLogger(__name__)
 
@@ -92,28 +92,9 @@ def _unmake_variant(
         zipfile.ZipFile(input_filepath, "r") as input_zip,
         zipfile.ZipFile(output_filepath, "w") as output_zip,
     ):
-        for file_info in input_zip.infolist():
-            components = file_info.filename.split("/", 2)
-            is_dist_info = len(components) == 2 and components[0].endswith(".dist-info")
-
-            if is_dist_info and components[1] == VARIANT_DIST_INFO_FILENAME:
-                # This is the variant.json file, we skip it.
-                continue
-
-            with (
-                input_zip.open(file_info, "r") as input_file,
-                output_zip.open(file_info, "w") as output_file,
-            ):
-                if is_dist_info and components[1] == "RECORD":
-                    # Update RECORD to remove the checksum.
-                    variant_dist_info_path = (
-                        f"{components[0]}/{VARIANT_DIST_INFO_FILENAME}"
-                    ).encode()
-                    for line in input_file:
-                        rec_filename, _sha256, _size = line.split(b",")
-                        if rec_filename != variant_dist_info_path:
-                            output_file.write(line)
-                else:
-                    shutil.copyfileobj(input_file, output_file)
+        # Drop variant.json, and its checksum from RECORD.
+        rewrite_wheel_dist_info(
+            input_zip, output_zip, {VARIANT_DIST_INFO_FILENAME: None}
+        )
 
     logger.info("Variant Wheel Created: `%s`", output_filepath.resolve())
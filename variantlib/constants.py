@@ -8,6 +8,7 @@ VARIANT_LABEL_LENGTH = 16
 NULL_VARIANT_LABEL = "null"
 CONFIG_FILENAME = "variants.toml"
 VARIANT_DIST_INFO_FILENAME = "variant.json"
+VARIANTS_JSON_MANIFEST_FILENAME = ".variants-manifest.json"
 
 # Common variant info keys (used in pyproject.toml and variants.json)
 VARIANT_INFO_DEFAULT_PRIO_KEY: Literal["default-priorities"] = "default-priorities"
@@ -27,6 +28,20 @@ PYPROJECT_TOML_TOP_KEY = "variant"
 VARIANTS_JSON_SCHEMA_KEY: Literal["$schema"] = "$schema"
 VARIANTS_JSON_SCHEMA_URL = "https://variants-schema.wheelnext.dev/v0.0.3.json"
 VARIANTS_JSON_VARIANT_DATA_KEY: Literal["variants"] = "variants"
+VARIANTS_JSON_RESOLUTION_TABLE_KEY: Literal["resolution-table"] = "resolution-table"
+
+RESOLUTION_TABLE_PROPERTIES_KEY: Literal["properties"] = "properties"
+RESOLUTION_TABLE_RANKS_KEY: Literal["ranks"] = "ranks"
+
+PLATFORM_SNAPSHOT_VERSION = 1
+PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY: Literal["abi-dependencies"] = "abi-dependencies"
+PLATFORM_SNAPSHOT_ENVIRONMENT_KEY: Literal["environment"] = "environment"
+PLATFORM_SNAPSHOT_PLUGINS_KEY: Literal["plugins"] = "plugins"
+PLATFORM_SNAPSHOT_PRIORITIES_KEY: Literal["priorities"] = "priorities"
+PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: Literal["supported-properties"] = (
+    "supported-properties"
+)
+PLATFORM_SNAPSHOT_VERSION_KEY: Literal["version"] = "version"
 
 VALIDATION_VARIANT_LABEL_REGEX = re.compile(rf"[0-9a-z._]{{1,{VARIANT_LABEL_LENGTH}}}")
 
@@ -126,14 +141,34 @@ ProviderPluginJsonDict = TypedDict(
 VariantInfoJsonDict = dict[str, dict[str, list[str]]]
 
 
+class ResolutionTableJsonDict(TypedDict, total=False):
+    properties: dict[str, list[str]]
+    ranks: dict[str, list[int]]
+
+
 VariantsJsonDict = TypedDict(
     "VariantsJsonDict",
     {
         "$schema": str,
         "default-priorities": PriorityJsonDict,
         "providers": dict[str, ProviderPluginJsonDict],
+        "resolution-table": ResolutionTableJsonDict,
         "static-properties": dict[str, dict[str, list[str]]],
         "variants": dict[str, VariantInfoJsonDict],
     },
     total=False,
 )
+
+
+PlatformSnapshotJsonDict = TypedDict(
+    "PlatformSnapshotJsonDict",
+    {
+        "abi-dependencies": dict[str, str],
+        "environment": dict[str, str],
+        "plugins": dict[str, str],
+        "priorities": PriorityJsonDict,
+        "supported-properties": list[str],
+        "version": int,
+    },
+    total=False,
+)
@@ -0,0 +1,82 @@
+"""
+JSON encoding and decoding for variant metadata files
+
+`orjson` is used when it is installed, with the standard library `json`
+module being used otherwise. Both backends produce byte-identical output.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import IO
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+_INDENT_RE = re.compile(r"^ +", re.MULTILINE)
+
+
+def get_backend() -> str:
+    """Get the name of the JSON backend in use"""
+    return "json" if orjson is None else "orjson"
+
+
+def loads(data: bytes | str) -> Any:
+    """Deserialize a JSON document"""
+
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def load(fp: IO[bytes] | IO[str]) -> Any:
+    """Deserialize a JSON document from a file object"""
+    return loads(fp.read())
+
+
+def _stdlib_dumps(data: Any, compact: bool) -> str:
+    if compact:
+        return json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return json.dumps(data, indent=4, sort_keys=True)
+
+
+def dumps(data: Any, compact: bool = False) -> str:
+    """
+    Serialize data into canonical JSON
+
+    The keys are always sorted, and non-ASCII characters are escaped.
+
+    :param data: Data to serialize.
+    :param compact: If True, the output is a single line without any
+                    whitespace. Otherwise, it is indented with 4 spaces.
+    :return: JSON document as a `str`.
+    """
+
+    if orjson is None:
+        return _stdlib_dumps(data, compact)
+
+    try:
+        if compact:
+            encoded = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        else:
+            encoded = orjson.dumps(
+                data, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+            )
+    except TypeError:
+        # Types not supported by orjson, e.g. integers over 64 bits.
+        return _stdlib_dumps(data, compact)
+
+    if not encoded.isascii():
+        # orjson does not support escaping non-ASCII characters.
+        return _stdlib_dumps(data, compact)
+
+    result = encoded.decode("ascii")
+    if compact:
+        return result
+    # orjson supports only 2-space indentation; the strings can not contain
+    # literal newlines, so every leading whitespace is indentation.
+    return _INDENT_RE.sub(lambda match: match.group() * 2, result)
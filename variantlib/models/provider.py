@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from collections import Counter
 from dataclasses import dataclass
 from dataclasses import field
 from typing import TYPE_CHECKING
@@ -9,7 +10,9 @@ from variantlib.constants import VALIDATION_FEATURE_NAME_REGEX
 from variantlib.constants import VALIDATION_NAMESPACE_REGEX
 from variantlib.constants import VALIDATION_VALUE_REGEX
 from variantlib.models.base import BaseModel
+from variantlib.models.variant import VariantFeature
 from variantlib.models.variant import VariantProperty
+from variantlib.models.variant import VariantValidationResult
 from variantlib.protocols import VariantFeatureName
 from variantlib.protocols import VariantFeatureValue
 from variantlib.protocols import VariantNamespace
@@ -22,11 +25,15 @@ from variantlib.validators.combining import validate_and
 
 if TYPE_CHECKING:
     from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from variantlib.models.variant import VariantDescription
 
 if sys.version_info >= (3, 11):
-    pass
+    from typing import Self
 else:
-    pass
+    from typing_extensions import Self
 
 
 @dataclass(frozen=True)
@@ -107,3 +114,69 @@ class ProviderConfig(BaseModel):
         for feat_cfg in self.configs:
             for value in feat_cfg.values:
                 yield VariantProperty(self.namespace, feat_cfg.name, value)
+
+
+@dataclass(frozen=True)
+class ProviderConfigSnapshot:
+    """
+    Provider configs indexed for validating variant properties
+
+    The snapshot is built once from the configs returned by the plugins,
+    and can be used to validate any number of variant descriptions
+    without querying the plugins again.
+    """
+
+    # Allowed values for every (namespace, feature) pair
+    values: dict[
+        tuple[VariantNamespace, VariantFeatureName], frozenset[VariantFeatureValue]
+    ]
+    # (namespace, feature) pairs that do not permit multiple values
+    single_value_features: frozenset[tuple[VariantNamespace, VariantFeatureName]]
+    namespaces: frozenset[VariantNamespace]
+
+    @classmethod
+    def from_provider_configs(cls, configs: Mapping[str, ProviderConfig]) -> Self:
+        values: dict[
+            tuple[VariantNamespace, VariantFeatureName], frozenset[VariantFeatureValue]
+        ] = {}
+        single_value_features: set[tuple[VariantNamespace, VariantFeatureName]] = set()
+        for namespace, provider_cfg in configs.items():
+            for feat_cfg in provider_cfg.configs:
+                key = (namespace, feat_cfg.name)
+                values[key] = frozenset(feat_cfg.values)
+                if not feat_cfg.multi_value:
+                    single_value_features.add(key)
+
+        return cls(
+            values=values,
+            single_value_features=frozenset(single_value_features),
+            namespaces=frozenset(configs),
+        )
+
+    def validate(self, vdesc: VariantDescription) -> VariantValidationResult:
+        """Validate the properties of a single variant description"""
+
+        results: dict[VariantProperty, bool | None] = {}
+        feature_counts: Counter[tuple[VariantNamespace, VariantFeatureName]] = Counter()
+        for vprop in vdesc.properties:
+            key = (vprop.namespace, vprop.feature)
+            feature_counts[key] += 1
+            if vprop.namespace not in self.namespaces:
+                results[vprop] = None
+            else:
+                results[vprop] = vprop.value in self.values.get(key, ())
+
+        return VariantValidationResult(
+            results=results,
+            multi_value_violations=frozenset(
+                VariantFeature(namespace, feature)
+                for (namespace, feature), count in feature_counts.items()
+                if count > 1 and (namespace, feature) in self.single_value_features
+            ),
+        )
+
+    def validate_many(
+        self, vdescs: Iterable[VariantDescription]
+    ) -> list[VariantValidationResult]:
+        """Validate multiple variant descriptions, in order"""
+        return [self.validate(vdesc) for vdesc in vdescs]
@@ -30,6 +30,8 @@ from variantlib.protocols import VariantFeatureValue
 from variantlib.protocols import VariantNamespace
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from variantlib.validators.keytracking import KeyTrackingValidator
 
 
@@ -129,6 +131,26 @@ class VariantInfo:
             requirements.update(provider.requires)
         return requirements
 
+    def get_aot_plugin_namespaces(
+        self, namespaces: Iterable[VariantNamespace] | None = None
+    ) -> set[VariantNamespace]:
+        """
+        Get the namespaces of ahead-of-time providers that use plugins
+
+        If `namespaces` is not None, only given namespaces are considered.
+        """
+
+        if namespaces is None:
+            namespaces = self.providers.keys()
+
+        return {
+            namespace
+            for namespace in namespaces
+            if namespace in self.providers
+            and not self.providers[namespace].install_time
+            and self.providers[namespace].requires
+        }
+
     def _get_expected_aot_namespaces(self) -> set[VariantNamespace]:
         raise NotImplementedError
 
@@ -0,0 +1,323 @@
+"""
+Serializable snapshot of the variant properties supported by a platform
+
+The snapshot captures everything that depends on the platform when choosing
+variants: the properties reported by the provider plugins, the priorities
+from the user configuration and the package versions for the abi_dependency
+namespace. Once captured, it can be used to check for supported variants
+and to sort them without running any plugins, including on a different
+host than the one where it was captured.
+
+The static properties defined by packages for their AoT providers are
+not a part of the snapshot. They are added when resolving the variants
+of a specific package, via `PlatformSnapshot.for_variant_info()`.
+
+The snapshot can be serialized into a versioned JSON platform profile,
+that also records the packages providing the plugins and the environment
+where it was captured.
+"""
+
+from __future__ import annotations
+
+import platform
+import sys
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from variantlib import __version__
+from variantlib import json_codec
+from variantlib.configuration import VariantConfiguration
+from variantlib.constants import PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_ENVIRONMENT_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_PLUGINS_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_PRIORITIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY
+from variantlib.constants import PLATFORM_SNAPSHOT_VERSION
+from variantlib.constants import PLATFORM_SNAPSHOT_VERSION_KEY
+from variantlib.constants import VALIDATION_NAMESPACE_REGEX
+from variantlib.constants import VARIANT_INFO_FEATURE_KEY
+from variantlib.constants import VARIANT_INFO_NAMESPACE_KEY
+from variantlib.constants import VARIANT_INFO_PROPERTY_KEY
+from variantlib.constants import PlatformSnapshotJsonDict
+from variantlib.constants import PriorityJsonDict
+from variantlib.errors import ValidationError
+from variantlib.models.base import BaseModel
+from variantlib.models.variant import VariantProperty
+from variantlib.protocols import VariantFeatureName
+from variantlib.protocols import VariantFeatureValue
+from variantlib.protocols import VariantNamespace
+from variantlib.resolver.lib import filter_variants
+from variantlib.resolver.lib import get_abi_dependencies
+from variantlib.resolver.lib import inject_abi_dependency
+from variantlib.validators.base import validate_list_matches_re
+from variantlib.validators.base import validate_type
+from variantlib.validators.combining import validate_and
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from variantlib.models.variant import VariantDescription
+    from variantlib.models.variant_info import VariantInfo
+    from variantlib.plugins.loader import BasePluginLoader
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+
+def get_environment_fingerprint() -> dict[str, str]:
+    """Get the description of the environment, for recording in snapshots"""
+    return {
+        "implementation": sys.implementation.name,
+        "machine": platform.machine(),
+        "platform": sys.platform,
+        "python-version": platform.python_version(),
+        "variantlib-version": __version__,
+    }
+
+
+@dataclass(frozen=True)
+class PlatformSnapshot(BaseModel):
+    """
+    Snapshot of the variant properties supported by a platform
+
+    Attributes:
+        supported_properties (list): Properties supported by the provider
+            plugins, in the order reported by them.
+        namespace_priorities (list): Namespace priorities from the user
+            configuration.
+        feature_priorities (dict): Feature priorities from the user
+            configuration.
+        property_priorities (dict): Property priorities from the user
+            configuration.
+        abi_dependencies (dict): Package versions for the abi_dependency
+            namespace.
+        plugin_versions (dict): Packages providing the plugins, as
+            ``name==version`` strings, keyed by namespace. Informational.
+        environment (dict): Description of the environment where the snapshot
+            was captured. Informational.
+    """
+
+    supported_properties: list[VariantProperty] = field(
+        metadata={
+            "validator": lambda val: validate_type(val, list[VariantProperty]),
+        }
+    )
+
+    namespace_priorities: list[VariantNamespace] = field(
+        metadata={
+            "validator": lambda val: validate_and(
+                [
+                    lambda v: validate_type(v, list[VariantNamespace]),
+                    lambda v: validate_list_matches_re(v, VALIDATION_NAMESPACE_REGEX),
+                ],
+                value=val,
+            )
+        },
+        default_factory=list,
+    )
+
+    feature_priorities: dict[VariantNamespace, list[VariantFeatureName]] = field(
+        metadata={
+            "validator": lambda val: validate_type(
+                val, dict[VariantNamespace, list[VariantFeatureName]]
+            ),
+        },
+        default_factory=dict,
+    )
+
+    property_priorities: dict[
+        VariantNamespace, dict[VariantFeatureName, list[VariantFeatureValue]]
+    ] = field(
+        metadata={
+            "validator": lambda val: validate_type(
+                val,
+                dict[
+                    VariantNamespace,
+                    dict[VariantFeatureName, list[VariantFeatureValue]],
+                ],
+            ),
+        },
+        default_factory=dict,
+    )
+
+    abi_dependencies: dict[str, str] = field(
+        metadata={
+            "validator": lambda val: validate_type(val, dict[str, str]),
+        },
+        default_factory=dict,
+    )
+
+    plugin_versions: dict[VariantNamespace, str] = field(
+        metadata={
+            "validator": lambda val: validate_type(val, dict[VariantNamespace, str]),
+        },
+        default_factory=dict,
+    )
+
+    environment: dict[str, str] = field(
+        metadata={
+            "validator": lambda val: validate_type(val, dict[str, str]),
+        },
+        default_factory=dict,
+    )
+
+    @classmethod
+    def capture(cls, plugin_loader: BasePluginLoader) -> Self:
+        """Capture the snapshot using the plugins from an entered loader"""
+
+        config = VariantConfiguration.get_config()
+        return cls(
+            # Package-defined static properties are not platform data,
+            # so only query the loaded plugins
+            supported_properties=[
+                vprop
+                for provider_cfg in plugin_loader.get_supported_configs(
+                    namespaces=plugin_loader.namespaces
+                ).values()
+                for vprop in provider_cfg.to_list_of_properties()
+            ],
+            namespace_priorities=config.namespace_priorities,
+            feature_priorities=config.feature_priorities,
+            property_priorities=config.property_priorities,
+            abi_dependencies=get_abi_dependencies(),
+            plugin_versions=plugin_loader.get_plugin_versions(),
+            environment=get_environment_fingerprint(),
+        )
+
+    @cached_property
+    def all_supported_properties(self) -> list[VariantProperty]:
+        """Supported properties, including the abi_dependency properties"""
+        vprops = self.supported_properties.copy()
+        inject_abi_dependency(vprops, [], self.abi_dependencies)
+        return vprops
+
+    def is_supported(self, vdesc: VariantDescription) -> bool:
+        """
+        Check whether the variant is supported
+
+        The rules are the same as in `filter_variants()`, i.e. at least one
+        value needs to be supported for every feature of the variant.
+        """
+        return bool(list(filter_variants([vdesc], self.all_supported_properties)))
+
+    def filter_supported(
+        self, vdescs: Iterable[VariantDescription]
+    ) -> list[VariantDescription]:
+        """Get the supported variants, in order"""
+        return list(filter_variants(list(vdescs), self.all_supported_properties))
+
+    def for_variant_info(
+        self,
+        variant_info: VariantInfo,
+        enable_optional_plugins: bool | list[VariantNamespace] = False,
+    ) -> Self:
+        """
+        Get the snapshot for resolving variants of a specific package
+
+        The snapshot only holds the properties reported by the plugins
+        available on the platform. This adds the package-defined static
+        properties for the AoT providers of the package, in place of any
+        properties reported by plugins for their namespaces, and removes
+        the properties of namespaces the package does not declare and
+        of optional providers that are not enabled, matching `PluginLoader`.
+        """
+
+        static_properties = [
+            VariantProperty(namespace, feature, value)
+            for namespace, features in variant_info.static_properties.items()
+            if namespace in variant_info.providers
+            and not variant_info.providers[namespace].install_time
+            for feature, values in features.items()
+            for value in values
+        ]
+
+        def plugin_enabled(namespace: VariantNamespace) -> bool:
+            if (provider := variant_info.providers.get(namespace)) is None:
+                return False
+            if not provider.install_time:
+                return False
+            if not provider.optional:
+                return True
+            if isinstance(enable_optional_plugins, bool):
+                return enable_optional_plugins
+            return namespace in enable_optional_plugins
+
+        return replace(
+            self,
+            supported_properties=[
+                *static_properties,
+                *(
+                    vprop
+                    for vprop in self.supported_properties
+                    if plugin_enabled(vprop.namespace)
+                ),
+            ],
+        )
+
+    def to_dict(self) -> PlatformSnapshotJsonDict:
+        priorities: PriorityJsonDict = {
+            VARIANT_INFO_NAMESPACE_KEY: self.namespace_priorities,
+        }
+        if self.feature_priorities:
+            priorities[VARIANT_INFO_FEATURE_KEY] = self.feature_priorities
+        if self.property_priorities:
+            priorities[VARIANT_INFO_PROPERTY_KEY] = self.property_priorities
+
+        return {
+            PLATFORM_SNAPSHOT_VERSION_KEY: PLATFORM_SNAPSHOT_VERSION,
+            # Stored as a list, since the order of properties is significant
+            PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY: [
+                vprop.to_str() for vprop in self.supported_properties
+            ],
+            PLATFORM_SNAPSHOT_PRIORITIES_KEY: priorities,
+            PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY: self.abi_dependencies,
+            PLATFORM_SNAPSHOT_PLUGINS_KEY: self.plugin_versions,
+            PLATFORM_SNAPSHOT_ENVIRONMENT_KEY: self.environment,
+        }
+
+    @classmethod
+    def from_dict(cls, data: PlatformSnapshotJsonDict) -> Self:
+        validate_type(data, dict)
+        if (version := data.get(PLATFORM_SNAPSHOT_VERSION_KEY)) != (
+            PLATFORM_SNAPSHOT_VERSION
+        ):
+            raise ValidationError(
+                f"Unsupported platform snapshot version: {version!r}, expected: "
+                f"{PLATFORM_SNAPSHOT_VERSION}"
+            )
+
+        supported_properties = data.get(PLATFORM_SNAPSHOT_SUPPORTED_PROPERTIES_KEY, [])
+        validate_type(supported_properties, list[str])
+        priorities = data.get(PLATFORM_SNAPSHOT_PRIORITIES_KEY, {})
+        validate_type(priorities, dict)
+
+        return cls(
+            supported_properties=[
+                VariantProperty.from_str(vprop) for vprop in supported_properties
+            ],
+            namespace_priorities=priorities.get(VARIANT_INFO_NAMESPACE_KEY, []),
+            feature_priorities=priorities.get(VARIANT_INFO_FEATURE_KEY, {}),
+            property_priorities=priorities.get(VARIANT_INFO_PROPERTY_KEY, {}),
+            abi_dependencies=data.get(PLATFORM_SNAPSHOT_ABI_DEPENDENCIES_KEY, {}),
+            plugin_versions=data.get(PLATFORM_SNAPSHOT_PLUGINS_KEY, {}),
+            environment=data.get(PLATFORM_SNAPSHOT_ENVIRONMENT_KEY, {}),
+        )
+
+    def to_str(self, compact: bool = False) -> str:
+        """
+        Serialize the snapshot as a canonical JSON platform profile
+
+        :param compact: Output a single line without whitespace, rather than
+                        an indented document.
+        """
+        return json_codec.dumps(self.to_dict(), compact=compact)
+
+    @classmethod
+    def from_str(cls, data: bytes | str) -> Self:
+        """Load the snapshot from a JSON platform profile"""
+        return cls.from_dict(json_codec.loads(data))
@@ -19,6 +19,7 @@ from variantlib.validators.base import validate_type
 
 if TYPE_CHECKING:
     from collections.abc import Generator
+    from collections.abc import Iterable
 
 
 @dataclass(frozen=True)
@@ -73,6 +74,34 @@ def process_configs(
     ]
 
 
+def check_fixed_plugins(plugins: Iterable[PluginType]) -> None:
+    non_fixed_plugins = {
+        plugin.namespace
+        for plugin in plugins
+        if not getattr(plugin, "is_aot_plugin", False)
+    }
+    if non_fixed_plugins:
+        raise TypeError(
+            f"Providers for namespaces {non_fixed_plugins} are not AoT plugins, "
+            f"they cannot be used with install-time = false"
+        )
+
+
+def select_plugins(
+    plugins: dict[str, PluginType], command_args: dict[str, Any]
+) -> dict[str, PluginType]:
+    """Select plugins for a command, according to its arguments"""
+
+    unexpected_args = set(command_args) - {"plugin_apis", "require_fixed"}
+    assert not unexpected_args, f"Unexpected command arguments: {unexpected_args}"
+
+    if (plugin_apis := command_args.get("plugin_apis")) is not None:
+        plugins = {plugin_api: plugins[plugin_api] for plugin_api in plugin_apis}
+    if command_args.get("require_fixed", False):
+        check_fixed_plugins(plugins.values())
+    return plugins
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -91,16 +120,7 @@ def main() -> int:
     plugins = dict(zip(args.plugin_api, load_plugins(args.plugin_api), strict=True))
 
     if args.require_fixed:
-        non_fixed_plugins = {
-            plugin.namespace
-            for plugin in plugins.values()
-            if not getattr(plugin, "is_aot_plugin", False)
-        }
-        if non_fixed_plugins:
-            raise TypeError(
-                f"Providers for namespaces {non_fixed_plugins} are not AoT plugins, "
-                f"they cannot be used with install-time = false"
-            )
+        check_fixed_plugins(plugins.values())
 
     retval: dict[str, Any] = {}
     for command, command_args in commands.items():
@@ -109,25 +129,15 @@ def main() -> int:
             retval[command] = {
                 plugin_api: plugin.namespace for plugin_api, plugin in plugins.items()
             }
-        elif command == "get_all_configs":
-            assert not command_args
-            retval[command] = {  # pyright: ignore[reportArgumentType]
-                plugin_api: process_configs(
-                    plugin.get_all_configs(),
-                    plugin,
-                    command,
-                )
-                for plugin_api, plugin in plugins.items()
-            }
-        elif command == "get_supported_configs":
-            assert not command_args
+        elif command in ("get_all_configs", "get_supported_configs"):
+            selected_plugins = select_plugins(plugins, command_args)
             retval[command] = {  # pyright: ignore[reportArgumentType]
                 plugin_api: process_configs(
-                    plugin.get_supported_configs(),
+                    getattr(plugin, command)(),
                     plugin,
                     command,
                 )
-                for plugin_api, plugin in plugins.items()
+                for plugin_api, plugin in selected_plugins.items()
             }
         else:
             raise ValueError(f"Invalid command: {command}")
@@ -8,9 +8,11 @@ import subprocess
 import sys
 from abc import abstractmethod
 from collections.abc import Collection
-from contextlib import suppress
+from dataclasses import dataclass
 from importlib.metadata import Distribution
 from importlib.metadata import entry_points
+from importlib.metadata import packages_distributions
+from importlib.metadata import version
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING
@@ -28,6 +30,7 @@ from variantlib.models.provider import VariantFeatureConfig
 from variantlib.validators.base import validate_matches_re
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from types import TracebackType
     from typing import Any
     from typing import Literal
@@ -38,6 +41,8 @@ if TYPE_CHECKING:
     from variantlib.protocols import VariantFeatureValue
     from variantlib.protocols import VariantNamespace
 
+    ConfigsMethod = Literal["get_all_configs", "get_supported_configs"]
+
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
@@ -46,7 +51,21 @@ else:
 logger = logging.getLogger(__name__)
 
 
-VARIANT_PROVIDER_CACHE_TABLE: dict[int, dict[str, Any]] = {}
+VARIANT_PROVIDER_CACHE_TABLE: dict[int, Any] = {}
+
+
+@dataclass(frozen=True)
+class ConfigsQuery:
+    """
+    Parameters of a query for `BasePluginLoader.query_configs()`
+
+    :param namespaces: Namespaces to query, or None to query all plugins.
+    :param require_fixed: Require the queried plugins to provide fixed
+                          supported configs, i.e. to be AoT plugins.
+    """
+
+    namespaces: frozenset[str] | None = None
+    require_fixed: bool = False
 
 
 class BasePluginLoader:
@@ -93,20 +112,34 @@ class BasePluginLoader:
         args: Collection[str] = (),
     ) -> dict[str, Any]:
         _plugin_apis: tuple[str] = tuple(plugin_apis)  # type: ignore[assignment]
-        _commands = json.dumps(commands).encode("utf8")
         _args: tuple[str] = tuple(args)  # type: ignore[assignment]
 
-        cache_key = hash((_plugin_apis, _commands, _args))
-
-        with suppress(KeyError):
-            return VARIANT_PROVIDER_CACHE_TABLE[cache_key]
+        # The results are cached per command, so that the commands that have
+        # been run already (possibly as a part of another batch) are skipped.
+        cache_keys = {
+            command: hash(
+                (_plugin_apis, command, json.dumps(command_args, sort_keys=True), _args)
+            )
+            for command, command_args in commands.items()
+        }
 
-        result = self._run_call_subprocess(
-            plugin_apis=_plugin_apis,
-            commands=_commands,
-            args=_args,
-        )
-        VARIANT_PROVIDER_CACHE_TABLE[cache_key] = result
+        result: dict[str, Any] = {}
+        missing_commands: dict[str, Any] = {}
+        for command, command_args in commands.items():
+            try:
+                result[command] = VARIANT_PROVIDER_CACHE_TABLE[cache_keys[command]]
+            except KeyError:
+                missing_commands[command] = command_args
+
+        if missing_commands:
+            new_result = self._run_call_subprocess(
+                plugin_apis=_plugin_apis,
+                commands=json.dumps(missing_commands).encode("utf8"),
+                args=_args,
+            )
+            for command, command_result in new_result.items():
+                VARIANT_PROVIDER_CACHE_TABLE[cache_keys[command]] = command_result
+                result[command] = command_result
         return result
 
     def _run_call_subprocess(
@@ -209,75 +242,116 @@ class BasePluginLoader:
         if self._namespace_map is None:
             raise NoPluginFoundError("No plugin has been loaded in the environment.")
 
-    def _get_configs(
+    def query_configs(
         self,
-        method: Literal["get_all_configs", "get_supported_configs"],
-        require_non_empty: bool,
-        require_fixed: bool,
-    ) -> dict[str, ProviderConfig]:
+        queries: Mapping[ConfigsMethod, ConfigsQuery],
+    ) -> dict[ConfigsMethod, dict[str, ProviderConfig]]:
+        """
+        Run multiple config queries using a single plugin invocation
+
+        :param queries: Mapping of plugin methods (`get_all_configs`
+                        or `get_supported_configs`) to query parameters.
+        :return: Mapping of plugin methods to results, in the same format
+                 as returned by the respective loader methods.
+        """
+
         self._check_plugins_loaded()
         assert self._namespace_map is not None
 
-        # grab supported values from PDP if we don't have the relevant
-        # plugin loaded
-        provider_cfgs = {
-            namespace: ProviderConfig(
-                namespace=namespace,
-                configs=[
-                    VariantFeatureConfig(name=name, values=values, multi_value=False)
-                    for name, values in features.items()
-                ],
-            )
-            for namespace, features in self._package_defined_properties.items()
-            if namespace not in self._namespace_map.values() and features
-        }
-
-        if not self._namespace_map:
-            return provider_cfgs
-
-        configs = self._call_subprocess(
-            list(self._namespace_map.keys()),
-            {method: {}},
-            args=["--require-fixed"] if require_fixed else [],
-        )[method]
-
-        for plugin_api, plugin_configs in configs.items():
-            namespace = self._namespace_map[plugin_api]
-
-            if not plugin_configs:
-                if require_non_empty:
-                    raise PluginError(
-                        f"Provider {namespace}, {method}() returned no valid configs!"
-                    )
-                continue
-
-            provider_cfgs[namespace] = ProviderConfig(
-                namespace,
-                configs=[
-                    VariantFeatureConfig(**vfeat_cfg) for vfeat_cfg in plugin_configs
-                ],
-            )
+        results: dict[ConfigsMethod, dict[str, ProviderConfig]] = {}
+        commands: dict[str, dict[str, Any]] = {}
+        for method, query in queries.items():
+            # grab supported values from PDP if we don't have the relevant
+            # plugin loaded
+            results[method] = {
+                namespace: ProviderConfig(
+                    namespace=namespace,
+                    configs=[
+                        VariantFeatureConfig(
+                            name=name, values=values, multi_value=False
+                        )
+                        for name, values in features.items()
+                    ],
+                )
+                for namespace, features in self._package_defined_properties.items()
+                if namespace not in self._namespace_map.values()
+                and features
+                and (query.namespaces is None or namespace in query.namespaces)
+            }
+
+            plugin_apis = [
+                plugin_api
+                for plugin_api, namespace in self._namespace_map.items()
+                if query.namespaces is None or namespace in query.namespaces
+            ]
+            if plugin_apis:
+                commands[method] = {
+                    "plugin_apis": plugin_apis,
+                    "require_fixed": query.require_fixed,
+                }
+
+        if not commands:
+            return results
+
+        configs = self._call_subprocess(list(self._namespace_map.keys()), commands)
+
+        for method in queries:
+            for plugin_api, plugin_configs in configs.get(method, {}).items():
+                namespace = self._namespace_map[plugin_api]
+
+                if not plugin_configs:
+                    if method == "get_all_configs":
+                        raise PluginError(
+                            f"Provider {namespace}, {method}() returned no valid "
+                            "configs!"
+                        )
+                    continue
+
+                results[method][namespace] = ProviderConfig(
+                    namespace,
+                    configs=[
+                        VariantFeatureConfig(**vfeat_cfg)
+                        for vfeat_cfg in plugin_configs
+                    ],
+                )
 
-        return provider_cfgs
+        return results
 
     def get_all_configs(
         self,
+        namespaces: Collection[str] | None = None,
     ) -> dict[str, ProviderConfig]:
-        """Get a mapping of namespaces to all valid configs"""
-        return self._get_configs(
-            "get_all_configs", require_non_empty=True, require_fixed=False
-        )
+        """
+        Get a mapping of namespaces to all valid configs
+
+        If `namespaces` is specified, only the specified namespaces are queried.
+        """
+        return self.query_configs(
+            {
+                "get_all_configs": ConfigsQuery(
+                    namespaces=None if namespaces is None else frozenset(namespaces)
+                )
+            }
+        )["get_all_configs"]
 
     def get_supported_configs(
         self,
         require_fixed: bool = False,
+        namespaces: Collection[str] | None = None,
     ) -> dict[str, ProviderConfig]:
-        """Get a mapping of namespaces to supported configs"""
-        return self._get_configs(
-            "get_supported_configs",
-            require_non_empty=False,
-            require_fixed=require_fixed,
-        )
+        """
+        Get a mapping of namespaces to supported configs
+
+        If `namespaces` is specified, only the specified namespaces are queried.
+        """
+        return self.query_configs(
+            {
+                "get_supported_configs": ConfigsQuery(
+                    namespaces=None if namespaces is None else frozenset(namespaces),
+                    require_fixed=require_fixed,
+                )
+            }
+        )["get_supported_configs"]
 
     @property
     def plugin_api_values(self) -> dict[str, str]:
@@ -294,6 +368,26 @@ class BasePluginLoader:
         assert self._namespace_map is not None
         return list(self._namespace_map.values())
 
+    def get_plugin_versions(self) -> dict[VariantNamespace, str]:
+        """
+        Get the packages providing the plugins
+
+        Returns a mapping from namespaces to ``name==version`` strings.
+        The packages can only be determined for plugins loaded from the current
+        environment, other plugins are omitted.
+        """
+
+        if self._python_executable != Path(sys.executable):
+            return {}
+
+        module_dists = packages_distributions()
+        result: dict[VariantNamespace, str] = {}
+        for namespace, plugin_api in self.plugin_api_values.items():
+            top_module = plugin_api.partition(":")[0].strip().partition(".")[0]
+            if dist_names := module_dists.get(top_module):
+                result[namespace] = f"{dist_names[0]}=={version(dist_names[0])}"
+        return result
+
 
 class PluginLoader(BasePluginLoader):
     _variant_info: VariantInfo
@@ -379,12 +473,13 @@ class PluginLoader(BasePluginLoader):
 
     def get_all_configs(
         self,
+        namespaces: Collection[str] | None = None,
     ) -> dict[str, ProviderConfig]:
         assert self._include_aot_plugins, (
             "To use get_all_configs(), use PluginLoader(include_aot_plugins=True)"
         )
 
-        return super().get_all_configs()
+        return super().get_all_configs(namespaces=namespaces)
 
 
 class EntryPointPluginLoader(BasePluginLoader):
@@ -431,6 +526,13 @@ class EntryPointPluginLoader(BasePluginLoader):
         assert self._plugin_provider_packages is not None
         return self._plugin_provider_packages
 
+    def get_plugin_versions(self) -> dict[VariantNamespace, str]:
+        return {
+            namespace: f"{dist.name}=={dist.version}"
+            for namespace, plugin_api in self.plugin_api_values.items()
+            if (dist := self.plugin_provider_packages.get(plugin_api)) is not None
+        }
+
 
 class ListPluginLoader(BasePluginLoader):
     """Load plugins from an explicit plugin-api list"""
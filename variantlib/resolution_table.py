@@ -0,0 +1,246 @@
+"""
+Precomputed resolution table for variants.json
+
+The table is generated along with the index, and lets clients choose
+variants without parsing and sorting all of them. It consists of:
+
+- an inverted index mapping every variant property to the labels
+  of the variants using it, that is used to filter the variants supported
+  by the platform via set operations,
+
+- a rank vector for every variant, that is used to sort the supported
+  variants. It is only emitted when the default priorities from variants.json
+  fully determine the order of variants, independently of the plugins.
+
+The rank vectors are only valid for the default priorities. If the user
+configuration overrides any priorities, clients need to use the generic
+resolution path instead.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from variantlib.constants import RESOLUTION_TABLE_PROPERTIES_KEY
+from variantlib.constants import RESOLUTION_TABLE_RANKS_KEY
+from variantlib.constants import VARIANT_ABI_DEPENDENCY_NAMESPACE
+from variantlib.constants import ResolutionTableJsonDict
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantProperty
+from variantlib.protocols import VariantFeatureName
+from variantlib.protocols import VariantFeatureValue
+from variantlib.protocols import VariantNamespace
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from variantlib.models.variant import VariantDescription
+    from variantlib.models.variant_info import VariantInfo
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+
+def _get_rank(priorities: list[str], item: str) -> int:
+    """Get the index of item in priorities, or push it at the end"""
+    try:
+        return priorities.index(item)
+    except ValueError:
+        return len(priorities)
+
+
+def compute_variant_ranks(
+    variants: Mapping[str, VariantDescription], variant_info: VariantInfo
+) -> dict[str, list[int]] | None:
+    """
+    Compute the rank vectors of variants under the default priorities
+
+    Returns None if the default priorities do not fully determine the order
+    of the variants, i.e. when it depends on the order of features or values
+    reported by the plugins, or on the values supported by the platform.
+    """
+
+    namespace_priorities = [
+        *variant_info.namespace_priorities,
+        VARIANT_ABI_DEPENDENCY_NAMESPACE,
+    ]
+
+    used_values: dict[
+        tuple[VariantNamespace, VariantFeatureName], set[VariantFeatureValue]
+    ] = defaultdict(set)
+    for vdesc in variants.values():
+        features = set()
+        for vprop in vdesc.properties:
+            key = (vprop.namespace, vprop.feature)
+            if key in features:
+                # The rank of a multi-value feature depends on which values
+                # are supported.
+                return None
+            features.add(key)
+            used_values[key].add(vprop.value)
+
+    unlisted_features: dict[VariantNamespace, set[VariantFeatureName]] = defaultdict(
+        set
+    )
+    for namespace, feature in used_values:
+        if namespace not in namespace_priorities:
+            return None
+        if feature not in variant_info.feature_priorities.get(namespace, []):
+            unlisted_features[namespace].add(feature)
+    # Unlisted features (and values) are ordered as reported by the plugins.
+    # This is deterministic only if there is at most one of them.
+    if any(len(features) > 1 for features in unlisted_features.values()):
+        return None
+
+    value_priorities = {
+        (namespace, feature): variant_info.property_priorities.get(namespace, {}).get(
+            feature, []
+        )
+        for namespace, feature in used_values
+    }
+    if any(
+        len(values.difference(value_priorities[key])) > 1
+        for key, values in used_values.items()
+    ):
+        return None
+
+    dimensions = sorted(
+        used_values,
+        key=lambda key: (
+            namespace_priorities.index(key[0]),
+            _get_rank(variant_info.feature_priorities.get(key[0], []), key[1]),
+        ),
+    )
+    dimension_indexes = {key: idx for idx, key in enumerate(dimensions)}
+    # Variants not using a feature are ranked after all the values of it
+    missing_ranks = [len(value_priorities[key]) + 1 for key in dimensions]
+
+    ranks: dict[str, list[int]] = {}
+    for label, vdesc in variants.items():
+        rank = missing_ranks.copy()
+        for vprop in vdesc.properties:
+            key = (vprop.namespace, vprop.feature)
+            rank[dimension_indexes[key]] = _get_rank(value_priorities[key], vprop.value)
+        ranks[label] = rank
+    return ranks
+
+
+@dataclass
+class ResolutionTable:
+    """
+    Precomputed resolution table for a set of variants
+
+    Attributes:
+        properties (dict): Labels of the variants using every property,
+            in the variants.json order.
+        ranks (dict): Rank vectors of the variants under the default
+            priorities, or None if they are not fully determined.
+    """
+
+    properties: dict[VariantProperty, list[str]]
+    ranks: dict[str, list[int]] | None = None
+
+    @classmethod
+    def build(
+        cls, variants: Mapping[str, VariantDescription], variant_info: VariantInfo
+    ) -> Self:
+        """Build the table for variants and their default priorities"""
+
+        properties: dict[VariantProperty, list[str]] = defaultdict(list)
+        for label, vdesc in variants.items():
+            for vprop in vdesc.properties:
+                properties[vprop].append(label)
+
+        return cls(
+            properties=dict(properties),
+            ranks=compute_variant_ranks(variants, variant_info),
+        )
+
+    @cached_property
+    def _feature_counts(self) -> dict[str, int]:
+        """Number of distinct features used by every variant"""
+        features: dict[str, set[tuple[VariantNamespace, VariantFeatureName]]] = (
+            defaultdict(set)
+        )
+        for vprop, labels in self.properties.items():
+            for label in labels:
+                features[label].add((vprop.namespace, vprop.feature))
+        return {
+            label: len(label_features) for label, label_features in features.items()
+        }
+
+    def check_labels(self, labels: Collection[str]) -> None:
+        """Verify that the table matches the specified variant labels"""
+
+        expected = set(labels)
+        if not expected.issuperset(self._feature_counts):
+            raise ValidationError(
+                "Resolution table references unknown variants: "
+                f"{set(self._feature_counts) - expected}"
+            )
+        if self.ranks is not None and expected != self.ranks.keys():
+            raise ValidationError(
+                "Resolution table ranks do not match variants: "
+                f"{expected.symmetric_difference(self.ranks)}"
+            )
+
+    def filter_supported(
+        self, labels: Iterable[str], supported_vprops: Iterable[VariantProperty]
+    ) -> list[str]:
+        """
+        Get the labels of the variants supported by the platform, in order
+
+        A variant is supported if at least one of its values is supported
+        for every feature it uses.
+        """
+
+        matched_features: dict[
+            str, set[tuple[VariantNamespace, VariantFeatureName]]
+        ] = defaultdict(set)
+        for vprop in supported_vprops:
+            for label in self.properties.get(vprop, ()):
+                matched_features[label].add((vprop.namespace, vprop.feature))
+
+        feature_counts = self._feature_counts
+        return [
+            label
+            for label in labels
+            if len(matched_features.get(label, ())) == feature_counts.get(label, 0)
+        ]
+
+    def sort(self, labels: Iterable[str]) -> list[str]:
+        """Sort the labels by their rank vectors, keeping the order of ties"""
+
+        if self.ranks is None:
+            raise ValueError("Resolution table does not contain ranks")
+        return sorted(labels, key=self.ranks.__getitem__)
+
+    def to_dict(self) -> ResolutionTableJsonDict:
+        data: ResolutionTableJsonDict = {
+            RESOLUTION_TABLE_PROPERTIES_KEY: {
+                vprop.to_str(): labels for vprop, labels in self.properties.items()
+            },
+        }
+        if self.ranks is not None:
+            data[RESOLUTION_TABLE_RANKS_KEY] = self.ranks
+        return data
+
+    @classmethod
+    def from_dict(cls, data: ResolutionTableJsonDict) -> Self:
+        return cls(
+            properties={
+                VariantProperty.from_str(vprop): labels
+                for vprop, labels in data.get(
+                    RESOLUTION_TABLE_PROPERTIES_KEY, {}
+                ).items()
+            },
+            ranks=data.get(RESOLUTION_TABLE_RANKS_KEY),
+        )
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import logging
 from collections import defaultdict
 from collections.abc import Iterable
 from typing import TYPE_CHECKING
@@ -8,6 +7,8 @@ from typing import TYPE_CHECKING
 from variantlib.models.variant import VariantDescription
 from variantlib.models.variant import VariantFeature
 from variantlib.models.variant import VariantProperty
+from variantlib.resolver.rejections import RejectionLog
+from variantlib.resolver.rejections import RejectionReason
 from variantlib.validators.base import validate_type
 
 if TYPE_CHECKING:
@@ -17,15 +18,16 @@ if TYPE_CHECKING:
     from variantlib.protocols import VariantNamespace
 
 
-logger = logging.getLogger(__name__)
-
-
 def remove_duplicates(
     vdescs: Iterable[VariantDescription],
+    rejections: RejectionLog | None = None,
 ) -> Generator[VariantDescription]:
     # Input validation
     validate_type(vdescs, Iterable)
 
+    if rejections is None:
+        rejections = RejectionLog()
+
     seen = set()
 
     def _should_include(vdesc: VariantDescription) -> bool:
@@ -35,10 +37,7 @@ def remove_duplicates(
         validate_type(vdesc, VariantDescription)
 
         if vdesc.hexdigest in seen:
-            logger.info(
-                "Variant `%(vhash)s` has been removed because it is a duplicate",
-                {"vhash": vdesc.hexdigest},
-            )
+            rejections.add(RejectionReason.DUPLICATE, vdesc.hexdigest)
             return False
 
         seen.add(vdesc.hexdigest)
@@ -50,6 +49,7 @@ def remove_duplicates(
 def filter_variants_by_namespaces(
     vdescs: Iterable[VariantDescription],
     forbidden_namespaces: list[str],
+    rejections: RejectionLog | None = None,
 ) -> Generator[VariantDescription]:
     """
     Filters out `VariantDescription` that contain any unsupported variant namespace.
@@ -59,11 +59,14 @@ def filter_variants_by_namespaces(
 
     :param vdescs: list of `VariantDescription` to filter.
     :param forbidden_namespaces: List of forbidden variant namespaces as `str`.
+    :param rejections: `RejectionLog` collecting the rejected variants.
     :return: Filtered list of `VariantDescription`.
     """
 
     if forbidden_namespaces is None:
         forbidden_namespaces = []
+    if rejections is None:
+        rejections = RejectionLog()
 
     # Input validation
     validate_type(vdescs, Iterable)
@@ -83,13 +86,8 @@ def filter_variants_by_namespaces(
             for vprop in vdesc.properties
             if vprop.namespace in _forbidden_namespaces
         ]:
-            logger.info(
-                "Variant `%(vhash)s` has been rejected because one or many of the "
-                "variant namespaces `[%(vprops)s]` have been explicitly rejected.",
-                {
-                    "vhash": vdesc.hexdigest,
-                    "vprops": ", ".join([vprop.to_str() for vprop in forbidden_vprops]),
-                },
+            rejections.add(
+                RejectionReason.FORBIDDEN_NAMESPACE, vdesc.hexdigest, forbidden_vprops
             )
             return False
 
@@ -101,6 +99,7 @@ def filter_variants_by_namespaces(
 def filter_variants_by_features(
     vdescs: Iterable[VariantDescription],
     forbidden_features: list[VariantFeature],
+    rejections: RejectionLog | None = None,
 ) -> Generator[VariantDescription]:
     """
     Filters out `VariantDescription` that contain any unsupported variant feature.
@@ -110,11 +109,14 @@ def filter_variants_by_features(
 
     :param vdescs: list of `VariantDescription` to filter.
     :param forbidden_features: List of forbidden `VariantFeature`.
+    :param rejections: `RejectionLog` collecting the rejected variants.
     :return: Filtered list of `VariantDescription`.
     """
 
     if forbidden_features is None:
         forbidden_features = []
+    if rejections is None:
+        rejections = RejectionLog()
 
     # Input validation
     validate_type(vdescs, Iterable)
@@ -134,13 +136,8 @@ def filter_variants_by_features(
             for vprop in vdesc.properties
             if vprop.feature_hash in forbidden_feature_hexs
         ]:
-            logger.info(
-                "Variant `%(vhash)s` has been rejected because one or many of the "
-                "variant features `[%(vprops)s]` have been explicitly rejected.",
-                {
-                    "vhash": vdesc.hexdigest,
-                    "vprops": ", ".join([vprop.to_str() for vprop in forbidden_vprops]),
-                },
+            rejections.add(
+                RejectionReason.FORBIDDEN_FEATURE, vdesc.hexdigest, forbidden_vprops
             )
             return False
 
@@ -153,6 +150,7 @@ def filter_variants_by_property(
     vdescs: Iterable[VariantDescription],
     allowed_properties: list[VariantProperty],
     forbidden_properties: list[VariantProperty] | None = None,
+    rejections: RejectionLog | None = None,
 ) -> Generator[VariantDescription]:
     """
     Filters out `VariantDescription` that contain any unsupported variant property.
@@ -166,11 +164,14 @@ def filter_variants_by_property(
     :param vdescs: list of `VariantDescription` to filter.
     :param allowed_properties: List of allowed `VariantProperty`.
     :param forbidden_properties: List of forbidden `VariantProperty`.
+    :param rejections: `RejectionLog` collecting the rejected variants.
     :return: Filtered list of `VariantDescription`.
     """
 
     if forbidden_properties is None:
         forbidden_properties = []
+    if rejections is None:
+        rejections = RejectionLog()
 
     # Input validation
     validate_type(vdescs, Iterable)
@@ -213,14 +214,13 @@ def filter_variants_by_property(
             if not (allowed_props := allowed_props_dict.get((ns, vfeat_name))):
                 # If there are no allowed properties for this feature, we reject
                 # the variant.
-                logger.info(
-                    "Variant `%(vhash)s` has been rejected because the feature "
-                    "`%(ns)s :: %(feature)s` has no allowed properties.",
-                    {
-                        "vhash": vdesc.hexdigest,
-                        "ns": ns,
-                        "feature": vfeat_name,
-                    },
+                rejections.add(
+                    RejectionReason.UNSUPPORTED_FEATURE,
+                    vdesc.hexdigest,
+                    (
+                        VariantProperty(ns, vfeat_name, val)
+                        for val in sorted(property_values)
+                    ),
                 )
                 return False
 
@@ -231,17 +231,13 @@ def filter_variants_by_property(
             else:
                 # We never broke out of the loop, meaning no allowed property
                 # matched. Consequently, we reject this variant.
-                logger.info(
-                    "Variant `%(vhash)s` has been rejected because none of the "
-                    "variant properties are compatible with this platform:"
-                    "\n\t- %(vprops)s",
-                    {
-                        "vhash": vdesc.hexdigest,
-                        "vprops": "\n\t- ".join(
-                            f"`{ns} :: {vfeat_name} :: {val}`"
-                            for val in property_values
-                        ),
-                    },
+                rejections.add(
+                    RejectionReason.UNSUPPORTED_PROPERTY,
+                    vdesc.hexdigest,
+                    (
+                        VariantProperty(ns, vfeat_name, val)
+                        for val in sorted(property_values)
+                    ),
                 )
                 return False
 
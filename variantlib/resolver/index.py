@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.resolver.rejections import RejectionLog
+from variantlib.resolver.rejections import RejectionReason
+from variantlib.validators.base import validate_type
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from variantlib.protocols import VariantFeatureName
+    from variantlib.protocols import VariantNamespace
+
+
+class IndexedVariantSet:
+    """
+    Set of `VariantDescription` objects with an inverted property index
+
+    The index maps every namespace, feature and property to the set
+    of IDs (positions) of the variants using them. It is built once,
+    and can be used to filter the variants any number of times, e.g. with
+    different sets of supported properties. The filters are evaluated
+    as set operations over the index, without iterating over the properties
+    of every variant.
+
+    Duplicate variants are removed when building the set.
+    """
+
+    def __init__(
+        self,
+        vdescs: Iterable[VariantDescription],
+        rejections: RejectionLog | None = None,
+    ) -> None:
+        if rejections is None:
+            rejections = RejectionLog()
+
+        self.vdescs: list[VariantDescription] = []
+        self._namespace_index: dict[VariantNamespace, set[int]] = defaultdict(set)
+        self._feature_index: dict[
+            tuple[VariantNamespace, VariantFeatureName], set[int]
+        ] = defaultdict(set)
+        self._property_index: dict[VariantProperty, set[int]] = defaultdict(set)
+
+        self._hexdigests: set[str] = set()
+        for vdesc in vdescs:
+            validate_type(vdesc, VariantDescription)
+            if vdesc.hexdigest in self._hexdigests:
+                rejections.add(RejectionReason.DUPLICATE, vdesc.hexdigest)
+                continue
+            self._hexdigests.add(vdesc.hexdigest)
+
+            vdesc_id = len(self.vdescs)
+            self.vdescs.append(vdesc)
+            for vprop in vdesc.properties:
+                self._namespace_index[vprop.namespace].add(vdesc_id)
+                self._feature_index[(vprop.namespace, vprop.feature)].add(vdesc_id)
+                self._property_index[vprop].add(vdesc_id)
+
+    def __contains__(self, vdesc: object) -> bool:
+        return (
+            isinstance(vdesc, VariantDescription)
+            and vdesc.hexdigest in self._hexdigests
+        )
+
+    def __iter__(self) -> Iterator[VariantDescription]:
+        return iter(self.vdescs)
+
+    def __len__(self) -> int:
+        return len(self.vdescs)
+
+    def filter_ids(
+        self,
+        allowed_properties: list[VariantProperty],
+        forbidden_namespaces: list[str] | None = None,
+        forbidden_features: list[VariantFeature] | None = None,
+        forbidden_properties: list[VariantProperty] | None = None,
+        rejections: RejectionLog | None = None,
+    ) -> list[int]:
+        """
+        Filter the variants, returning their IDs
+
+        The filters are the same as in `filter_variants()`.
+
+        :param allowed_properties: List of allowed `VariantProperty`.
+        :param forbidden_namespaces: List of forbidden variant namespaces as `str`.
+        :param forbidden_features: List of forbidden `VariantFeature`.
+        :param forbidden_properties: List of forbidden `VariantProperty`.
+        :param rejections: `RejectionLog` collecting the rejected variants.
+        :return: IDs of the variants that passed the filters, in order.
+        """
+
+        validate_type(allowed_properties, list[VariantProperty])
+
+        if forbidden_namespaces is not None:
+            validate_type(forbidden_namespaces, list[str])
+        if forbidden_features is not None:
+            validate_type(forbidden_features, list[VariantFeature])
+        if forbidden_properties is not None:
+            validate_type(forbidden_properties, list[VariantProperty])
+
+        if rejections is None:
+            rejections = RejectionLog()
+        forbidden: dict[int, RejectionReason] = {}
+
+        # Variants using any of the forbidden namespaces or features
+        _forbidden_namespaces = set(forbidden_namespaces or [])
+        for namespace in _forbidden_namespaces:
+            for vdesc_id in self._namespace_index.get(namespace, ()):
+                forbidden[vdesc_id] = RejectionReason.FORBIDDEN_NAMESPACE
+        forbidden_feature_hexs = {
+            vfeat.feature_hash for vfeat in forbidden_features or []
+        }
+        for vfeat in forbidden_features or []:
+            for vdesc_id in self._feature_index.get(
+                (vfeat.namespace, vfeat.feature), ()
+            ):
+                forbidden.setdefault(vdesc_id, RejectionReason.FORBIDDEN_FEATURE)
+
+        # Variants using every feature with at least one allowed value
+        _forbidden_properties = set(forbidden_properties or [])
+        matched: dict[tuple[VariantNamespace, VariantFeatureName], set[int]] = (
+            defaultdict(set)
+        )
+        for vprop in allowed_properties:
+            if vprop not in _forbidden_properties:
+                matched[(vprop.namespace, vprop.feature)].update(
+                    self._property_index.get(vprop, ())
+                )
+
+        unmatched: set[int] = set()
+        for key, vdesc_ids in self._feature_index.items():
+            unmatched.update(vdesc_ids.difference(matched.get(key, ()), forbidden))
+        rejected = unmatched.union(forbidden)
+
+        # Record the rejections in the order of variants, reporting the same
+        # properties as `filter_variants()` does
+        for vdesc_id in sorted(rejected):
+            vdesc = self.vdescs[vdesc_id]
+            reason = forbidden.get(vdesc_id)
+            if reason == RejectionReason.FORBIDDEN_NAMESPACE:
+                rejections.add(
+                    reason,
+                    vdesc.hexdigest,
+                    (
+                        vprop
+                        for vprop in vdesc.properties
+                        if vprop.namespace in _forbidden_namespaces
+                    ),
+                )
+            elif reason == RejectionReason.FORBIDDEN_FEATURE:
+                rejections.add(
+                    reason,
+                    vdesc.hexdigest,
+                    (
+                        vprop
+                        for vprop in vdesc.properties
+                        if vprop.feature_hash in forbidden_feature_hexs
+                    ),
+                )
+            else:
+                # Report the first unmatched feature in the order of properties
+                unmatched_key = next(
+                    (vprop.namespace, vprop.feature)
+                    for vprop in vdesc.properties
+                    if vdesc_id not in matched.get((vprop.namespace, vprop.feature), ())
+                )
+                rejections.add(
+                    RejectionReason.UNSUPPORTED_PROPERTY
+                    if unmatched_key in matched
+                    else RejectionReason.UNSUPPORTED_FEATURE,
+                    vdesc.hexdigest,
+                    (
+                        vprop
+                        for vprop in vdesc.properties
+                        if (vprop.namespace, vprop.feature) == unmatched_key
+                    ),
+                )
+
+        return [
+            vdesc_id for vdesc_id in range(len(self.vdescs)) if vdesc_id not in rejected
+        ]
+
+    def filter(
+        self,
+        allowed_properties: list[VariantProperty],
+        forbidden_namespaces: list[str] | None = None,
+        forbidden_features: list[VariantFeature] | None = None,
+        forbidden_properties: list[VariantProperty] | None = None,
+        rejections: RejectionLog | None = None,
+    ) -> list[VariantDescription]:
+        """
+        Filter the variants
+
+        The filters are the same as in `filter_variants()`.
+
+        :param allowed_properties: List of allowed `VariantProperty`.
+        :param forbidden_namespaces: List of forbidden variant namespaces as `str`.
+        :param forbidden_features: List of forbidden `VariantFeature`.
+        :param forbidden_properties: List of forbidden `VariantProperty`.
+        :param rejections: `RejectionLog` collecting the rejected variants.
+        :return: Filtered list of `VariantDescription`, in order.
+        """
+
+        return [
+            self.vdescs[vdesc_id]
+            for vdesc_id in self.filter_ids(
+                allowed_properties,
+                forbidden_namespaces=forbidden_namespaces,
+                forbidden_features=forbidden_features,
+                forbidden_properties=forbidden_properties,
+                rejections=rejections,
+            )
+        ]
@@ -16,16 +16,23 @@ from variantlib.resolver.filtering import filter_variants_by_features
 from variantlib.resolver.filtering import filter_variants_by_namespaces
 from variantlib.resolver.filtering import filter_variants_by_property
 from variantlib.resolver.filtering import remove_duplicates
+from variantlib.resolver.index import IndexedVariantSet
+from variantlib.resolver.rejections import RejectionLog
 from variantlib.resolver.sorting import sort_variant_properties
 from variantlib.resolver.sorting import sort_variants_descriptions
+from variantlib.resolver.table import filter_variants_table
+from variantlib.resolver.table import sort_variants_table
 from variantlib.validators.base import validate_type
 
 if TYPE_CHECKING:
     from collections.abc import Generator
+    from collections.abc import Mapping
 
     from variantlib.protocols import VariantFeatureName
     from variantlib.protocols import VariantFeatureValue
     from variantlib.protocols import VariantNamespace
+    from variantlib.resolver.trace import ResolutionTrace
+    from variantlib.variants_table import VariantsTable
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +50,12 @@ def _generate_version_matches(version: str) -> Generator[str]:
 
 
 def filter_variants(
-    vdescs: list[VariantDescription],
+    vdescs: list[VariantDescription] | IndexedVariantSet,
     allowed_properties: list[VariantProperty],
     forbidden_namespaces: list[str] | None = None,
     forbidden_features: list[VariantFeature] | None = None,
     forbidden_properties: list[VariantProperty] | None = None,
+    rejections: RejectionLog | None = None,
 ) -> Generator[VariantDescription]:
     """
     Filters out a `list` of `VariantDescription` with the following filters:
@@ -59,14 +67,40 @@ def filter_variants(
     - Forbidden `variant features` removed - if `forbidden_features` is not None
     - Forbidden `variant properties` removed - if `forbidden_properties` is not None
 
-    :param vdescs: list of `VariantDescription` to filter.
+    :param vdescs: list of `VariantDescription` to filter, or an `IndexedVariantSet`
+                   to filter using its inverted index.
     :param allowed_properties: List of allowed `VariantProperty`.
     :param forbidden_namespaces: List of forbidden variant namespaces as `str`.
     :param forbidden_features: List of forbidden `VariantFeature`.
     :param forbidden_properties: List of forbidden `VariantProperty`.
+    :param rejections: `RejectionLog` collecting the rejected variants. If not
+                       specified, a summary is logged after filtering.
     :return: Filtered list of `VariantDescription`.
     """
 
+    if rejections is None:
+        rejections = RejectionLog()
+        yield from filter_variants(
+            vdescs,
+            allowed_properties=allowed_properties,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            forbidden_properties=forbidden_properties,
+            rejections=rejections,
+        )
+        rejections.log_summary()
+        return
+
+    if isinstance(vdescs, IndexedVariantSet):
+        yield from vdescs.filter(
+            allowed_properties,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            forbidden_properties=forbidden_properties,
+            rejections=rejections,
+        )
+        return
+
     # Input validation
     validate_type(vdescs, list[VariantDescription])
     validate_type(allowed_properties, list[VariantProperty])
@@ -87,7 +121,7 @@ def filter_variants(
     #     => Added for safety and to avoid any potential bugs
     #     (Note: In all fairness, even if it was to happen, it would most
     #            likely not be a problem given that we just pick the best match)
-    result = remove_duplicates(vdescs)
+    result = remove_duplicates(vdescs, rejections=rejections)
 
     # Step 2 [Optional]
     # Remove any `VariantDescription` which declares any `VariantProperty` with
@@ -96,6 +130,7 @@ def filter_variants(
         result = filter_variants_by_namespaces(
             vdescs=result,
             forbidden_namespaces=forbidden_namespaces,
+            rejections=rejections,
         )
 
     # Step 3 [Optional]
@@ -105,6 +140,7 @@ def filter_variants(
         result = filter_variants_by_features(
             vdescs=result,
             forbidden_features=forbidden_features,
+            rejections=rejections,
         )
 
     # Step 4 [Optional]
@@ -116,16 +152,14 @@ def filter_variants(
             vdescs=result,
             allowed_properties=allowed_properties,
             forbidden_properties=forbidden_properties,
+            rejections=rejections,
         )
 
     yield from result
 
 
-def inject_abi_dependency(
-    supported_vprops: list[VariantProperty],
-    namespace_priorities: list[VariantNamespace],
-) -> None:
-    """Inject supported vairants for the abi_dependency namespace"""
+def get_abi_dependencies() -> dict[str, str]:
+    """Get the package versions used for the abi_dependency namespace"""
 
     # 1. Automatically populate from the current python environment
     packages = {
@@ -162,7 +196,25 @@ def inject_abi_dependency(
 
             packages[pkg_name] = pkg_version
 
-    for pkg_name, pkg_version in sorted(packages.items()):
+    return packages
+
+
+def inject_abi_dependency(
+    supported_vprops: list[VariantProperty],
+    namespace_priorities: list[VariantNamespace],
+    abi_dependencies: Mapping[str, str] | None = None,
+) -> None:
+    """
+    Inject supported vairants for the abi_dependency namespace
+
+    If `abi_dependencies` is None, the package versions are obtained
+    from the current environment via `get_abi_dependencies()`.
+    """
+
+    if abi_dependencies is None:
+        abi_dependencies = get_abi_dependencies()
+
+    for pkg_name, pkg_version in sorted(abi_dependencies.items()):
         supported_vprops.extend(
             VariantProperty(
                 namespace=VARIANT_ABI_DEPENDENCY_NAMESPACE,
@@ -172,12 +224,12 @@ def inject_abi_dependency(
             for _ver in _generate_version_matches(pkg_version)
         )
 
-    # 3. Adding `VARIANT_ABI_DEPENDENCY_NAMESPACE` at the back of`namespace_priorities`
+    # Adding `VARIANT_ABI_DEPENDENCY_NAMESPACE` at the back of`namespace_priorities`
     namespace_priorities.append(VARIANT_ABI_DEPENDENCY_NAMESPACE)
 
 
 def sort_and_filter_supported_variants(
-    vdescs: list[VariantDescription],
+    vdescs: list[VariantDescription] | IndexedVariantSet,
     supported_vprops: list[VariantProperty],
     namespace_priorities: list[VariantNamespace],
     feature_priorities: dict[VariantNamespace, list[VariantFeatureName]] | None = None,
@@ -188,25 +240,38 @@ def sort_and_filter_supported_variants(
     forbidden_namespaces: list[VariantNamespace] | None = None,
     forbidden_features: list[VariantFeature] | None = None,
     forbidden_properties: list[VariantProperty] | None = None,
+    abi_dependencies: Mapping[str, str] | None = None,
+    trace: ResolutionTrace | None = None,
 ) -> list[VariantDescription]:
     """
     Sort and filter a list of `VariantDescription` objects based on their
     `VariantProperty`s.
 
-    :param vdescs: List of `VariantDescription` objects.
+    :param vdescs: List of `VariantDescription` objects, or an `IndexedVariantSet`
+                   that can be reused across calls.
     :param supported_vprops: List of `VariantProperty` objects supported on the platform
     :param namespace_priorities: Ordered list of `str` objects.
     :param feature_priorities: Ordered list of `VariantFeature` objects.
     :param property_priorities: Ordered list of `VariantProperty` objects.
+    :param abi_dependencies: Package versions for the abi_dependency namespace,
+                             or None to use the current environment.
+    :param trace: `ResolutionTrace` to record the filter decisions and rank
+                  tuples in. Tracing is disabled if None.
     :return: Sorted and filtered list of `VariantDescription` objects.
     """
 
-    validate_type(vdescs, list[VariantDescription])
+    if not isinstance(vdescs, IndexedVariantSet):
+        validate_type(vdescs, list[VariantDescription])
     validate_type(supported_vprops, list[VariantProperty])
 
     if namespace_priorities is None:
         namespace_priorities = []
 
+    if trace is not None:
+        trace.record_priorities(
+            namespace_priorities, feature_priorities, property_priorities
+        )
+
     # Avoiding modification in place
     namespace_priorities = namespace_priorities.copy()
     supported_vprops = supported_vprops.copy()
@@ -215,14 +280,15 @@ def sort_and_filter_supported_variants(
     #                         ABI DEPENDENCY INJECTION                        #
     # ======================================================================= #
 
-    inject_abi_dependency(supported_vprops, namespace_priorities)
+    inject_abi_dependency(supported_vprops, namespace_priorities, abi_dependencies)
 
     # ======================================================================= #
     #                               NULL VARIANT                              #
     # ======================================================================= #
 
     # Adding the `null-variant` to the list - always "compatible"
-    if (null_variant := VariantDescription()) not in vdescs:
+    null_variant = VariantDescription()
+    if isinstance(vdescs, list) and null_variant not in vdescs:
         """Add a null variant description to the list."""
         # This is needed to ensure that we always consider the null variant
         # to fall back on when no other variants are available.
@@ -248,8 +314,14 @@ def sort_and_filter_supported_variants(
             forbidden_namespaces=forbidden_namespaces,
             forbidden_features=forbidden_features,
             forbidden_properties=forbidden_properties,
+            rejections=trace.rejections if trace is not None else None,
         )
     )
+    if trace is not None:
+        trace.rejections.log_summary()
+    # `IndexedVariantSet` is not modified, add the null variant after filtering
+    if null_variant not in vdescs:
+        filtered_vdescs.append(null_variant)
 
     # ======================================================================= #
     #                                 SORTING                                 #
@@ -269,4 +341,67 @@ def sort_and_filter_supported_variants(
     return sort_variants_descriptions(
         filtered_vdescs,
         property_priorities=sorted_supported_vprops,
+        trace=trace,
+    )
+
+
+def sort_and_filter_supported_variants_table(
+    table: VariantsTable,
+    supported_vprops: list[VariantProperty],
+    namespace_priorities: list[VariantNamespace],
+    feature_priorities: dict[VariantNamespace, list[VariantFeatureName]] | None = None,
+    property_priorities: dict[
+        VariantNamespace, dict[VariantFeatureName, list[VariantFeatureValue]]
+    ]
+    | None = None,
+    forbidden_namespaces: list[VariantNamespace] | None = None,
+    forbidden_features: list[VariantFeature] | None = None,
+    forbidden_properties: list[VariantProperty] | None = None,
+    abi_dependencies: Mapping[str, str] | None = None,
+) -> list[int]:
+    """
+    Sort and filter the variants of a `VariantsTable`
+
+    This is the equivalent of `sort_and_filter_supported_variants()` that
+    does not create `VariantDescription` objects. Unlike the former,
+    the implicit null variant is not added: if the table does not contain
+    a null variant, the caller is expected to add it at the end.
+
+    :param table: `VariantsTable` containing the variants.
+    :param supported_vprops: List of `VariantProperty` objects supported on the platform
+    :param namespace_priorities: Ordered list of `str` objects.
+    :param feature_priorities: Ordered list of `VariantFeature` objects.
+    :param property_priorities: Ordered list of `VariantProperty` objects.
+    :param abi_dependencies: Package versions for the abi_dependency namespace,
+                             or None to use the current environment.
+    :return: Sorted and filtered list of variant indexes.
+    """
+
+    validate_type(supported_vprops, list[VariantProperty])
+
+    # Avoiding modification in place
+    namespace_priorities = list(namespace_priorities or [])
+    supported_vprops = supported_vprops.copy()
+
+    inject_abi_dependency(supported_vprops, namespace_priorities, abi_dependencies)
+
+    filtered_indexes = filter_variants_table(
+        table,
+        allowed_properties=supported_vprops,
+        forbidden_namespaces=forbidden_namespaces,
+        forbidden_features=forbidden_features,
+        forbidden_properties=forbidden_properties,
+    )
+
+    sorted_supported_vprops = sort_variant_properties(
+        vprops=supported_vprops,
+        property_priorities=property_priorities,
+        feature_priorities=feature_priorities,
+        namespace_priorities=namespace_priorities,
+    )
+
+    return sort_variants_table(
+        table,
+        filtered_indexes,
+        property_priorities=sorted_supported_vprops,
     )
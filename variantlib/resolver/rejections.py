@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from variantlib.models.variant import VariantProperty
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of per-variant messages logged during a single resolution
+MAX_LOGGED_REJECTIONS = 10
+
+
+class RejectionReason(Enum):
+    DUPLICATE = "duplicate"
+    FORBIDDEN_NAMESPACE = "forbidden-namespace"
+    FORBIDDEN_FEATURE = "forbidden-feature"
+    UNSUPPORTED_FEATURE = "unsupported-feature"
+    UNSUPPORTED_PROPERTY = "unsupported-property"
+
+
+_REJECTION_MESSAGES = {
+    RejectionReason.DUPLICATE: (
+        "Variant `%(vhash)s` has been removed because it is a duplicate"
+    ),
+    RejectionReason.FORBIDDEN_NAMESPACE: (
+        "Variant `%(vhash)s` has been rejected because one or many of the "
+        "variant namespaces `[%(vprops)s]` have been explicitly rejected."
+    ),
+    RejectionReason.FORBIDDEN_FEATURE: (
+        "Variant `%(vhash)s` has been rejected because one or many of the "
+        "variant features `[%(vprops)s]` have been explicitly rejected."
+    ),
+    RejectionReason.UNSUPPORTED_FEATURE: (
+        "Variant `%(vhash)s` has been rejected because the feature of "
+        "`[%(vprops)s]` has no allowed properties."
+    ),
+    RejectionReason.UNSUPPORTED_PROPERTY: (
+        "Variant `%(vhash)s` has been rejected because none of the variant "
+        "properties `[%(vprops)s]` are compatible with this platform."
+    ),
+}
+
+
+@dataclass(frozen=True)
+class VariantRejection:
+    """Reason for rejecting a single variant"""
+
+    reason: RejectionReason
+    vhash: str
+    # Properties of the variant that caused the rejection
+    vprops: tuple[VariantProperty, ...] = ()
+
+    def format(self) -> str:
+        return _REJECTION_MESSAGES[self.reason] % {
+            "vhash": self.vhash,
+            "vprops": ", ".join(vprop.to_str() for vprop in self.vprops),
+        }
+
+
+class RejectionLog:
+    """
+    Collector of the reasons for rejecting variants during a resolution
+
+    Rejections are always counted by reason. Individual `VariantRejection`
+    records are created only if requested via `keep_records`, or if they
+    are going to be logged. Per-variant messages are logged at the debug
+    level, and limited to `max_logged` per resolution. Call `log_summary()`
+    at the end of the resolution to log the counts.
+    """
+
+    def __init__(
+        self, keep_records: bool = False, max_logged: int = MAX_LOGGED_REJECTIONS
+    ) -> None:
+        self.counts: Counter[RejectionReason] = Counter()
+        self.records: list[VariantRejection] | None = [] if keep_records else None
+        self._log_budget = max_logged if logger.isEnabledFor(logging.DEBUG) else 0
+
+    def add(
+        self,
+        reason: RejectionReason,
+        vhash: str,
+        vprops: Iterable[VariantProperty] = (),
+    ) -> None:
+        """
+        Record the rejection of a variant
+
+        :param reason: Reason for the rejection.
+        :param vhash: Hash of the rejected variant.
+        :param vprops: Properties that caused the rejection. It is only
+                       consumed if the rejection is recorded or logged,
+                       so it can be a lazy iterable.
+        """
+
+        self.counts[reason] += 1
+        if self.records is None and self._log_budget <= 0:
+            return
+
+        rejection = VariantRejection(reason, vhash, tuple(vprops))
+        if self.records is not None:
+            self.records.append(rejection)
+        if self._log_budget > 0:
+            self._log_budget -= 1
+            logger.debug("%s", rejection.format())
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def log_summary(self) -> None:
+        """Log the number of rejected variants by reason"""
+
+        if not self.counts or not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            "%(total)d variants have been rejected: %(reasons)s",
+            {
+                "total": self.total,
+                "reasons": ", ".join(
+                    f"{count} {reason.value}"
+                    for reason, count in sorted(
+                        self.counts.items(), key=lambda item: item[0].value
+                    )
+                ),
+            },
+        )
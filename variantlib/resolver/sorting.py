@@ -6,6 +6,7 @@ import sys
 from collections import defaultdict
 from itertools import chain
 from itertools import groupby
+from typing import TYPE_CHECKING
 
 from variantlib.errors import ValidationError
 from variantlib.models.variant import VariantDescription
@@ -15,6 +16,9 @@ from variantlib.protocols import VariantFeatureValue
 from variantlib.protocols import VariantNamespace
 from variantlib.validators.base import validate_type
 
+if TYPE_CHECKING:
+    from variantlib.resolver.trace import ResolutionTrace
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,13 +173,16 @@ def sort_variant_properties(
 
 
 def sort_variants_descriptions(
-    vdescs: list[VariantDescription], property_priorities: list[VariantProperty]
+    vdescs: list[VariantDescription],
+    property_priorities: list[VariantProperty],
+    trace: ResolutionTrace | None = None,
 ) -> list[VariantDescription]:
     """
     Sort a list of `VariantDescription` objects based on their `VariantProperty`s.
 
     :param vdescs: List of `VariantDescription` objects.
     :param property_priorities: ordered list of `VariantProperty` objects.
+    :param trace: `ResolutionTrace` to record the rank tuples in.
     :return: Sorted list of `VariantDescription` objects.
     """
     validate_type(vdescs, list[VariantDescription])
@@ -234,4 +241,12 @@ def sort_variants_descriptions(
 
         return tuple(ranking_array)
 
-    return sorted(vdescs, key=_get_rank_tuple)
+    if trace is None:
+        return sorted(vdescs, key=_get_rank_tuple)
+
+    ranked = sorted(
+        ((vdesc, _get_rank_tuple(vdesc)) for vdesc in vdescs),
+        key=lambda item: item[1],
+    )
+    trace.record_ranks(property_lookup_table, ranked)
+    return [vdesc for vdesc, _ in ranked]
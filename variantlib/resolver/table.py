@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VariantFeature
+from variantlib.models.variant import VariantProperty
+from variantlib.resolver.rejections import RejectionLog
+from variantlib.resolver.rejections import RejectionReason
+from variantlib.validators.base import validate_type
+
+if TYPE_CHECKING:
+    from variantlib.protocols import VariantFeatureName
+    from variantlib.protocols import VariantFeatureValue
+    from variantlib.protocols import VariantNamespace
+    from variantlib.variants_table import VariantsTable
+
+
+def filter_variants_table(
+    table: VariantsTable,
+    allowed_properties: list[VariantProperty],
+    forbidden_namespaces: list[str] | None = None,
+    forbidden_features: list[VariantFeature] | None = None,
+    forbidden_properties: list[VariantProperty] | None = None,
+    rejections: RejectionLog | None = None,
+) -> list[int]:
+    """
+    Filter the variants of a `VariantsTable`
+
+    This is the equivalent of `filter_variants()` for columnar storage.
+    The filters are evaluated once per distinct property in the table,
+    and the variants are matched using property IDs.
+
+    :param table: `VariantsTable` to filter.
+    :param allowed_properties: List of allowed `VariantProperty`.
+    :param forbidden_namespaces: List of forbidden variant namespaces as `str`.
+    :param forbidden_features: List of forbidden `VariantFeature`.
+    :param forbidden_properties: List of forbidden `VariantProperty`.
+    :param rejections: `RejectionLog` collecting the rejected variants. If not
+                       specified, a summary is logged after filtering.
+    :return: Indexes of the variants that passed the filters, in table order.
+    """
+
+    if rejections is None:
+        rejections = RejectionLog()
+        indexes = filter_variants_table(
+            table,
+            allowed_properties,
+            forbidden_namespaces=forbidden_namespaces,
+            forbidden_features=forbidden_features,
+            forbidden_properties=forbidden_properties,
+            rejections=rejections,
+        )
+        rejections.log_summary()
+        return indexes
+
+    validate_type(allowed_properties, list[VariantProperty])
+
+    if forbidden_namespaces is not None:
+        validate_type(forbidden_namespaces, list[str])
+    if forbidden_features is not None:
+        validate_type(forbidden_features, list[VariantFeature])
+    if forbidden_properties is not None:
+        validate_type(forbidden_properties, list[VariantProperty])
+
+    _forbidden_namespaces = set(forbidden_namespaces or [])
+    _forbidden_features = {
+        (vfeat.namespace, vfeat.feature) for vfeat in forbidden_features or []
+    }
+    _forbidden_properties = {
+        (vprop.namespace, vprop.feature, vprop.value)
+        for vprop in forbidden_properties or []
+    }
+
+    allowed_values: set[tuple[str, str, str]] = set()
+    allowed_features: set[tuple[str, str]] = set()
+    for vprop in allowed_properties:
+        key = (vprop.namespace, vprop.feature, vprop.value)
+        if key not in _forbidden_properties:
+            allowed_values.add(key)
+            allowed_features.add(key[:2])
+
+    # Evaluate every distinct property once.
+    property_forbidden: list[RejectionReason | None] = [
+        RejectionReason.FORBIDDEN_NAMESPACE
+        if vprop.namespace in _forbidden_namespaces
+        else RejectionReason.FORBIDDEN_FEATURE
+        if (vprop.namespace, vprop.feature) in _forbidden_features
+        else None
+        for vprop in table.properties
+    ]
+    property_allowed = [
+        (vprop.namespace, vprop.feature, vprop.value) in allowed_values
+        for vprop in table.properties
+    ]
+
+    result: list[int] = []
+    seen_digests: set[int] = set()
+    for index, digest in enumerate(table.digests):
+        if digest in seen_digests:
+            rejections.add(RejectionReason.DUPLICATE, table.hexdigest(index))
+            continue
+        seen_digests.add(digest)
+
+        property_ids = table.get_property_ids(index)
+        if forbidden_ids := [
+            property_id
+            for property_id in property_ids
+            if property_forbidden[property_id] is not None
+        ]:
+            # Forbidden namespaces take precedence, like in `filter_variants()`
+            reason = (
+                RejectionReason.FORBIDDEN_NAMESPACE
+                if any(
+                    property_forbidden[property_id]
+                    is RejectionReason.FORBIDDEN_NAMESPACE
+                    for property_id in forbidden_ids
+                )
+                else RejectionReason.FORBIDDEN_FEATURE
+            )
+            rejections.add(
+                reason,
+                table.hexdigest(index),
+                (
+                    table.properties[property_id]
+                    for property_id in forbidden_ids
+                    if property_forbidden[property_id] is reason
+                ),
+            )
+            continue
+
+        # Properties are sorted, so all values of a feature are adjacent.
+        # At least one value of every feature needs to be allowed.
+        current_feature: tuple[str, str] | None = None
+        feature_matched = True
+        for property_id in property_ids:
+            vprop = table.properties[property_id]
+            if (vprop.namespace, vprop.feature) != current_feature:
+                if not feature_matched:
+                    break
+                current_feature = (vprop.namespace, vprop.feature)
+                feature_matched = False
+                if current_feature not in allowed_features:
+                    break
+            feature_matched = feature_matched or property_allowed[property_id]
+
+        if not feature_matched:
+            assert current_feature is not None
+            rejections.add(
+                RejectionReason.UNSUPPORTED_PROPERTY
+                if current_feature in allowed_features
+                else RejectionReason.UNSUPPORTED_FEATURE,
+                table.hexdigest(index),
+                (
+                    vprop
+                    for vprop in table.iter_properties(index)
+                    if (vprop.namespace, vprop.feature) == current_feature
+                ),
+            )
+            continue
+
+        result.append(index)
+
+    return result
+
+
+def sort_variants_table(
+    table: VariantsTable,
+    indexes: list[int],
+    property_priorities: list[VariantProperty],
+) -> list[int]:
+    """
+    Sort the variants of a `VariantsTable`
+
+    This is the equivalent of `sort_variants_descriptions()` for columnar
+    storage. The ranks are computed once per distinct property in the table.
+
+    :param table: `VariantsTable` containing the variants.
+    :param indexes: Indexes of the variants to sort (i.e. filtering result).
+    :param property_priorities: ordered list of `VariantProperty` objects.
+    :return: Sorted list of variant indexes.
+    """
+
+    validate_type(property_priorities, list[VariantProperty])
+
+    property_lookup_table: dict[
+        tuple[VariantNamespace, VariantFeatureName], list[VariantFeatureValue]
+    ] = {}
+    for vprop in property_priorities:
+        property_lookup_table.setdefault((vprop.namespace, vprop.feature), []).append(
+            vprop.value
+        )
+
+    feature_indexes = {key: idx for idx, key in enumerate(property_lookup_table)}
+    value_ranks: dict[tuple[str, str, str], int] = {}
+    for (namespace, feature), values in property_lookup_table.items():
+        for rank, value in enumerate(values):
+            value_ranks.setdefault((namespace, feature, value), rank)
+
+    lookup_table_size = len(feature_indexes)
+    property_ranks = [
+        (
+            feature_indexes.get((vprop.namespace, vprop.feature)),
+            value_ranks.get((vprop.namespace, vprop.feature, vprop.value), sys.maxsize),
+        )
+        for vprop in table.properties
+    ]
+
+    def _get_rank_tuple(index: int) -> tuple[int, ...]:
+        ranking_array = [sys.maxsize] * lookup_table_size
+        vdesc_feature_indexes: set[int] = set()
+
+        for property_id in table.get_property_ids(index):
+            feature_index, value_rank = property_ranks[property_id]
+            if feature_index is None:
+                raise ValidationError("Filtering should be applied first.")
+            vdesc_feature_indexes.add(feature_index)
+            ranking_array[feature_index] = min(ranking_array[feature_index], value_rank)
+
+        if any(ranking_array[idx] == sys.maxsize for idx in vdesc_feature_indexes):
+            raise ValidationError("Filtering should be applied first.")
+
+        return tuple(ranking_array)
+
+    return sorted(indexes, key=_get_rank_tuple)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING
+from typing import Any
+
+from variantlib import json_codec
+from variantlib.models.variant import VariantFeature
+from variantlib.resolver.rejections import RejectionLog
+
+if TYPE_CHECKING:
+    from variantlib.models.configuration import VariantConfiguration
+    from variantlib.models.variant import VariantDescription
+    from variantlib.protocols import VariantFeatureName
+    from variantlib.protocols import VariantFeatureValue
+    from variantlib.protocols import VariantNamespace
+
+
+class PrioritySource(Enum):
+    USER_CONFIG = "user-config"
+    VARIANTS_JSON = "variants.json"
+    PLUGIN_ORDER = "plugin-order"
+
+
+@dataclass(frozen=True)
+class RankedVariant:
+    """Supported variant along with its rank, in the resolution trace"""
+
+    vhash: str
+    # Rank tuple of the variant, with one entry per sorting dimension
+    rank: tuple[int, ...]
+    # Feature that placed the variant ahead of the next one, and the source
+    # of the priority that decided it. None if the variant tied with the next
+    # one (i.e. kept the variants.json order) or was the last one.
+    decided_by: VariantFeature | None = None
+    source: PrioritySource | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "variant": self.vhash,
+            "rank": [None if rank == sys.maxsize else rank for rank in self.rank],
+            "decided-by": (
+                self.decided_by.to_str() if self.decided_by is not None else None
+            ),
+            "source": self.source.value if self.source is not None else None,
+        }
+
+
+class ResolutionTrace:
+    """
+    Opt-in trace of a single `sort_and_filter_supported_variants()` call
+
+    It records the reasons for rejecting the unsupported variants, the rank
+    tuples of the supported variants, and the source of priorities (user
+    configuration, variants.json or plugin order) that decided their order.
+
+    The priorities passed to `sort_and_filter_supported_variants()` are
+    attributed to the user configuration if they are listed in `user_config`,
+    to variants.json otherwise. Items that are not listed in the priorities
+    are ordered as reported by the plugins.
+    """
+
+    def __init__(self, user_config: VariantConfiguration | None = None) -> None:
+        self.user_config = user_config
+        self.rejections = RejectionLog(keep_records=True)
+        self.namespace_priorities: list[VariantNamespace] = []
+        self.feature_priorities: dict[VariantNamespace, list[VariantFeatureName]] = {}
+        self.property_priorities: dict[
+            VariantNamespace, dict[VariantFeatureName, list[VariantFeatureValue]]
+        ] = {}
+        # Sorting dimensions, with the supported values in priority order
+        self.dimensions: dict[
+            tuple[VariantNamespace, VariantFeatureName], list[VariantFeatureValue]
+        ] = {}
+        self.ranked: list[RankedVariant] = []
+
+    def record_priorities(
+        self,
+        namespace_priorities: list[VariantNamespace],
+        feature_priorities: dict[VariantNamespace, list[VariantFeatureName]] | None,
+        property_priorities: dict[
+            VariantNamespace, dict[VariantFeatureName, list[VariantFeatureValue]]
+        ]
+        | None,
+    ) -> None:
+        self.namespace_priorities = list(namespace_priorities)
+        self.feature_priorities = dict(feature_priorities or {})
+        self.property_priorities = dict(property_priorities or {})
+
+    def record_ranks(
+        self,
+        dimensions: dict[
+            tuple[VariantNamespace, VariantFeatureName], list[VariantFeatureValue]
+        ],
+        ranked: list[tuple[VariantDescription, tuple[int, ...]]],
+    ) -> None:
+        """Record the sorted variants along with their rank tuples"""
+
+        self.dimensions = dimensions
+        dimension_keys = list(dimensions)
+        self.ranked = []
+        for index, (vdesc, rank) in enumerate(ranked):
+            decided_by = None
+            source = None
+            if index + 1 < len(ranked):
+                next_rank = ranked[index + 1][1]
+                for dim_index, (value_rank, next_value_rank) in enumerate(
+                    zip(rank, next_rank, strict=True)
+                ):
+                    if value_rank != next_value_rank:
+                        namespace, feature = dimension_keys[dim_index]
+                        decided_by = VariantFeature(namespace, feature)
+                        source = self.get_property_source(
+                            namespace,
+                            feature,
+                            dimensions[(namespace, feature)][value_rank],
+                        )
+                        break
+            self.ranked.append(RankedVariant(vdesc.hexdigest, rank, decided_by, source))
+
+    def get_namespace_source(self, namespace: VariantNamespace) -> PrioritySource:
+        if self.user_config is not None and (
+            namespace in self.user_config.namespace_priorities
+        ):
+            return PrioritySource.USER_CONFIG
+        if namespace in self.namespace_priorities:
+            return PrioritySource.VARIANTS_JSON
+        return PrioritySource.PLUGIN_ORDER
+
+    def get_feature_source(
+        self, namespace: VariantNamespace, feature: VariantFeatureName
+    ) -> PrioritySource:
+        if self.user_config is not None and (
+            feature in self.user_config.feature_priorities.get(namespace, [])
+        ):
+            return PrioritySource.USER_CONFIG
+        if feature in self.feature_priorities.get(namespace, []):
+            return PrioritySource.VARIANTS_JSON
+        return PrioritySource.PLUGIN_ORDER
+
+    def get_property_source(
+        self,
+        namespace: VariantNamespace,
+        feature: VariantFeatureName,
+        value: VariantFeatureValue,
+    ) -> PrioritySource:
+        if self.user_config is not None and (
+            value
+            in self.user_config.property_priorities.get(namespace, {}).get(feature, [])
+        ):
+            return PrioritySource.USER_CONFIG
+        if value in self.property_priorities.get(namespace, {}).get(feature, []):
+            return PrioritySource.VARIANTS_JSON
+        return PrioritySource.PLUGIN_ORDER
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rejected": [
+                {
+                    "variant": rejection.vhash,
+                    "reason": rejection.reason.value,
+                    "properties": [vprop.to_str() for vprop in rejection.vprops],
+                }
+                for rejection in self.rejections.records or []
+            ],
+            "dimensions": [
+                {
+                    "feature": f"{namespace} :: {feature}",
+                    "values": values,
+                    "namespace-source": self.get_namespace_source(namespace).value,
+                    "feature-source": self.get_feature_source(namespace, feature).value,
+                }
+                for (namespace, feature), values in self.dimensions.items()
+            ],
+            "ranked": [ranked.to_dict() for ranked in self.ranked],
+        }
+
+    def to_str(self, compact: bool = False) -> str:
+        """
+        Serialize the trace as JSON
+
+        :param compact: Output a single line without whitespace, rather than
+                        an indented document.
+        """
+        return json_codec.dumps(self.to_dict(), compact=compact)
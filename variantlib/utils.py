@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import os
+import secrets
+import stat
+import sys
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 from typing import Generic
 from typing import TypeVar
 
 if TYPE_CHECKING:
+    import pathlib
     from collections.abc import Callable
+    from collections.abc import Generator
 
 T = TypeVar("T")
 RT = TypeVar("RT")
@@ -92,3 +99,118 @@ def aggregate_property_priorities(
                         value for value in values if value not in ret_value
                     )
     return result
+
+
+def atomic_write_text(path: pathlib.Path, data: str) -> None:
+    """
+    Write a text file atomically
+
+    The data is written to a temporary file in the same directory, flushed
+    to the disk and then renamed over the destination. Readers see either
+    the old or the new file, never a partially written one.
+    """
+
+    try:
+        mode: int | None = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    # Unlike mkstemp(), create the file with the default permissions (i.e. 0o666
+    # masked by the umask), so that a new file gets the same mode as with open().
+    while True:
+        temp_path = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+        try:
+            fd = os.open(
+                temp_path,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                0o666,
+            )
+        except FileExistsError:
+            continue
+        break
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Preserve the mode of the file being replaced
+        if mode is not None:
+            temp_path.chmod(mode)
+        temp_path.replace(path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    # Make the rename itself durable.
+    if sys.platform != "win32":
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def get_lock_path(path: pathlib.Path) -> pathlib.Path:
+    """
+    Get the path of the lock file guarding the specified file
+
+    The lock file is a hidden file next to the guarded file, so that every
+    process updating it takes the same lock, whichever user or host it runs
+    on, provided the filesystem supports locking.
+    """
+
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def file_lock(
+    path: pathlib.Path, shared: bool = False, blocking: bool = True
+) -> Generator[None]:
+    """
+    Hold an advisory lock on the specified lock file
+
+    The lock file is created if it does not exist, and is never removed.
+
+    :param path: Path to the lock file.
+    :param shared: If True, acquire a shared lock that can be held by multiple
+                   processes at once, but not along with an exclusive lock.
+                   Shared locks are not supported on Windows, and exclusive
+                   locks are used instead.
+    :param blocking: If True, block until the lock can be acquired. Otherwise,
+                     raise `BlockingIOError` if it is held already.
+    """
+
+    with path.open("a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(
+                        f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1
+                    )
+                    break
+                except OSError as err:
+                    if not blocking:
+                        raise BlockingIOError(f"{path} is locked already") from err
+                    # LK_LOCK gives up after 10 seconds
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(
+                f.fileno(),
+                (fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                | (0 if blocking else fcntl.LOCK_NB),
+            )
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
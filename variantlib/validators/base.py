@@ -10,7 +10,9 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from collections.abc import Iterable
+from functools import cache
 from types import GenericAlias
 from typing import Any
 from typing import Protocol
@@ -23,10 +25,22 @@ class ValidationError(ValueError):
     pass
 
 
+# Patterns consisting of a single character class with a quantifier,
+# e.g. `[a-z0-9_]+` or `[a-z]{1,8}`.
+_CHARSET_PATTERN_RE = re.compile(r"(\[(?:[^\\\]]|\\.)+\])(\+|\{[1-9][0-9]*,[0-9]*\})")
+
+# Separator used to join values for batch validation.
+_BATCH_SEPARATOR = "\n"
+
+
 def validate_matches_re(
     value: str, pattern: str | re.Pattern[str], message_prefix: str | None = None
 ) -> re.Match[str]:
-    if (match := re.fullmatch(pattern, value)) is None:
+    if isinstance(pattern, re.Pattern):
+        match = pattern.fullmatch(value)
+    else:
+        match = re.fullmatch(pattern, value)
+    if match is None:
         raise ValidationError(
             f"{message_prefix + ': ' if message_prefix is not None else ''}"
             f"Value `{value}` must match regex {pattern}"
@@ -34,17 +48,55 @@ def validate_matches_re(
     return match
 
 
+@cache
+def _compile_list_pattern(
+    pattern: str | re.Pattern[str],
+) -> tuple[re.Pattern[str], re.Pattern[str] | None]:
+    """
+    Compile the pattern for list validation
+
+    Returns a tuple of the compiled pattern and, if the pattern is a simple
+    character class pattern, a pattern matching all values joined using
+    `_BATCH_SEPARATOR`.
+    """
+
+    compiled = re.compile(pattern)
+    if (match := _CHARSET_PATTERN_RE.fullmatch(compiled.pattern)) is None or re.match(
+        match.group(1), _BATCH_SEPARATOR, compiled.flags
+    ):
+        return compiled, None
+
+    item = compiled.pattern
+    return compiled, re.compile(
+        f"{item}(?:{re.escape(_BATCH_SEPARATOR)}{item})*", compiled.flags
+    )
+
+
 def validate_list_matches_re(
     values: list[str], pattern: str | re.Pattern[str], message_prefix: str | None = None
 ) -> None:
+    compiled, joined_pattern = _compile_list_pattern(pattern)
+
+    if not values:
+        return
+    if joined_pattern is not None:
+        joined = _BATCH_SEPARATOR.join(values)
+        # Verify the count, in case the separator was present in the values.
+        if (
+            joined_pattern.fullmatch(joined) is not None
+            and joined.count(_BATCH_SEPARATOR) == len(values) - 1
+        ):
+            return
+
     for i, value in enumerate(values):
-        validate_matches_re(
-            value,
-            pattern,
-            message_prefix=f"{message_prefix}[{i}]"
-            if message_prefix is not None
-            else None,
-        )
+        if compiled.fullmatch(value) is None:
+            validate_matches_re(
+                value,
+                pattern,
+                message_prefix=f"{message_prefix}[{i}]"
+                if message_prefix is not None
+                else None,
+            )
 
 
 def validate_list_min_len(values: list[Any], min_length: int) -> None:
@@ -75,53 +127,86 @@ def validate_list_all_unique(values: list[Any], keys: list[str] | None = None) -
         seen.add(_value)
 
 
-def _validate_type(value: Any, expected_type: type) -> type | None:
-    if isinstance(expected_type, GenericAlias):
-        list_type = get_origin(expected_type)
+def _find_incorrect_types(
+    values: Iterable[Any], validator: Callable[[Any], type | None] | None
+) -> set[type]:
+    if validator is None:
+        return set()
+    incorrect_types = {validator(value) for value in values}
+    incorrect_types.discard(None)
+    return incorrect_types  # type: ignore[return-value]
 
-        if not isinstance(value, list_type):
-            return type(value)
 
-        if list_type is dict:
-            assert isinstance(value, dict)
+@cache
+def _compile_type_validator(expected_type: type) -> Callable[[Any], type | None]:
+    """
+    Compile a validator function for the specified type
+
+    The type is introspected only once, and the returned function can be
+    used to validate multiple values. The function returns None if
+    the value matches the type, or the type that was found otherwise.
+    """
+
+    if isinstance(expected_type, GenericAlias):
+        container_type: Any = get_origin(expected_type)
+
+        if container_type is dict:
             key_type, value_type = get_args(expected_type)
-            if key_type is not Any:
-                incorrect_key_types = {_validate_type(key, key_type) for key in value}
-                incorrect_key_types.discard(None)
-            else:
-                incorrect_key_types = set()
-            if value_type is not Any:
-                incorrect_value_types = {
-                    _validate_type(v, value_type) for v in value.values()
-                }
-                incorrect_value_types.discard(None)
-            else:
-                incorrect_value_types = set()
-            if incorrect_key_types or incorrect_value_types:
-                key_ored = Union.__getitem__((key_type, *incorrect_key_types))
-                value_ored = Union.__getitem__((value_type, *incorrect_value_types))
-                return list_type[key_ored, value_ored]  # type: ignore[no-any-return,index]
-
-        else:
-            (item_type,) = get_args(expected_type)
-            assert isinstance(value, Iterable)
-            if item_type is not Any:
-                incorrect_types = {_validate_type(item, item_type) for item in value}
-                incorrect_types.discard(None)
-                if incorrect_types:
-                    ored = Union.__getitem__((item_type, *incorrect_types))
-                    return list_type[ored]  # type: ignore[no-any-return,index]
+            key_validator = (
+                None if key_type is Any else _compile_type_validator(key_type)
+            )
+            value_validator = (
+                None if value_type is Any else _compile_type_validator(value_type)
+            )
+
+            def validate_dict(value: Any) -> type | None:
+                if not isinstance(value, dict):
+                    return type(value)
+                incorrect_key_types = _find_incorrect_types(value, key_validator)
+                incorrect_value_types = _find_incorrect_types(
+                    value.values(), value_validator
+                )
+                if incorrect_key_types or incorrect_value_types:
+                    key_ored = Union.__getitem__((key_type, *incorrect_key_types))
+                    value_ored = Union.__getitem__((value_type, *incorrect_value_types))
+                    return dict[key_ored, value_ored]  # type: ignore[valid-type]
+                return None
+
+            return validate_dict
+
+        (item_type,) = get_args(expected_type)
+        item_validator = (
+            None if item_type is Any else _compile_type_validator(item_type)
+        )
+
+        def validate_container(value: Any) -> type | None:
+            if not isinstance(value, container_type):
+                return type(value)
+            incorrect_types = _find_incorrect_types(value, item_validator)
+            if incorrect_types:
+                ored = Union.__getitem__((item_type, *incorrect_types))
+                return container_type[ored]  # type: ignore[no-any-return]
+            return None
+
+        return validate_container
 
     # Protocols and Iterable must enable subclassing to pass
-    elif issubclass(expected_type, (Protocol, Iterable)):  # type: ignore[arg-type]
-        if not isinstance(value, expected_type):
-            return type(value)
+    if issubclass(expected_type, (Protocol, Iterable)):  # type: ignore[arg-type]
+
+        def validate_instance(value: Any) -> type | None:
+            return None if isinstance(value, expected_type) else type(value)
+
+        return validate_instance
 
     # Do not use isinstance here - we want to reject subclasses
-    elif type(value) is not expected_type:
-        return type(value)
+    def validate_exact_type(value: Any) -> type | None:
+        return None if type(value) is expected_type else type(value)
 
-    return None
+    return validate_exact_type
+
+
+def _validate_type(value: Any, expected_type: type) -> type | None:
+    return _compile_type_validator(expected_type)(value)
 
 
 def validate_type(value: Any, expected_type: type) -> None:
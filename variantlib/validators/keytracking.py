@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
+from functools import cache
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import get_args
+from typing import get_origin
 
 from variantlib.errors import ValidationError
 from variantlib.validators.base import _validate_type
@@ -12,6 +14,7 @@ from variantlib.validators.base import validate_matches_re
 if TYPE_CHECKING:
     import re
     from enum import Enum
+    from types import TracebackType
 
 
 class KeyTrackingValidator:
@@ -23,6 +26,8 @@ class KeyTrackingValidator:
         self.keys = [top_key] if top_key else []
         self._data: list[Any] = [top_data]
         self._expected_keys: list[set[str]] = [set()]
+        # type of values of the dicts on the stack, if validated already
+        self._validated_types: list[type | None] = [None]
         self.validate(top_data, dict[str, Any])
 
     @property
@@ -49,42 +54,102 @@ class KeyTrackingValidator:
                 f"{self.key}: Expected one of {allowed}, got {self._data[-1]!r}"
             )
 
-    @contextmanager
     def get(
         self,
         key: str,
         expected_type: type,
         default: Any = RequiredKey,
         ignore_subkeys: bool = False,
-    ) -> Any:
+    ) -> _KeyContext:
+        """
+        Get a context manager validating the value of specified key
+
+        The value is pushed to the stack and returned upon entering
+        the context. Upon exiting, the validator verifies that the value
+        (if it is a dict) did not contain unexpected keys.
+        """
+        return _KeyContext(self, key, expected_type, default, ignore_subkeys)
+
+
+@cache
+def _get_dict_value_type(expected_type: type) -> type | None:
+    if get_origin(expected_type) is dict:
+        return get_args(expected_type)[1]  # type: ignore[no-any-return]
+    return None
+
+
+class _KeyContext:
+    """Context manager returned by `KeyTrackingValidator.get()`"""
+
+    __slots__ = ("default", "expected_type", "ignore_subkeys", "key", "validator")
+
+    def __init__(
+        self,
+        validator: KeyTrackingValidator,
+        key: str,
+        expected_type: type,
+        default: Any,
+        ignore_subkeys: bool,
+    ) -> None:
+        self.validator = validator
+        self.key = key
+        self.expected_type = expected_type
+        self.default = default
+        self.ignore_subkeys = ignore_subkeys
+
+    def __enter__(self) -> Any:
+        validator = self.validator
+        key = self.key
+
         # add to list of expected keys of current dict
-        self._expected_keys[-1].add(key)
+        validator._expected_keys[-1].add(key)
 
         # push the value to the stack
-        self.keys.append(key)
-        self._data.append(self._data[-1].get(key, default))
+        validator.keys.append(key)
+        value = validator._data[-1].get(key, self.default)
+        validator._data.append(value)
 
-        if self._data[-1] is self.RequiredKey:
-            raise ValidationError(f"{self.key}: required key not found")
+        if value is KeyTrackingValidator.RequiredKey:
+            raise ValidationError(f"{validator.key}: required key not found")
 
-        self._expected_keys.append(set())
+        validated_type = validator._validated_types[-1]
+        validator._expected_keys.append(set())
         # validate only non-default type -- this makes optional keys easier
         # (since type validator can't handle optional types)
-        if self._data[-1] is not default:
-            self.validate(self._data[-1], expected_type)
+        if value is self.default:
+            validator._validated_types.append(None)
+        else:
+            # skip values that were already validated as a part of the parent
+            if validated_type != self.expected_type:
+                validator.validate(value, self.expected_type)
+            validator._validated_types.append(_get_dict_value_type(self.expected_type))
 
         # return the value
-        yield self._data[-1]
+        return value
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        validator = self.validator
 
         # pop the value
-        expected_keys = self._expected_keys.pop()
-        last_data = self._data.pop()
+        expected_keys = validator._expected_keys.pop()
+        last_data = validator._data.pop()
+        validator._validated_types.pop()
+
         # if it was a dict, verify that we didn't get any unwelcome keys
-        if isinstance(last_data, dict) and not ignore_subkeys:
+        if (
+            exc_type is None
+            and not self.ignore_subkeys
+            and isinstance(last_data, dict)
+            and not expected_keys.issuperset(last_data)
+        ):
             unexpected_keys = last_data.keys() - expected_keys
-            if unexpected_keys:
-                raise ValidationError(
-                    f"{self.key}: unexpected subkeys: {unexpected_keys}; "
-                    f"expected only: {expected_keys}"
-                )
-        self.keys.pop()
+            raise ValidationError(
+                f"{validator.key}: unexpected subkeys: {unexpected_keys}; "
+                f"expected only: {expected_keys}"
+            )
+        validator.keys.pop()
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from variantlib import json_codec
 from variantlib.constants import VARIANT_DIST_INFO_FILENAME
 from variantlib.errors import ValidationError
 from variantlib.models.variant_info import VariantInfo
@@ -27,7 +27,7 @@ class VariantDistInfo(VariantsJson):
             super().__init__(dist_info_file)
             return
 
-        self._process(json.loads(dist_info_file))
+        self._process(json_codec.loads(dist_info_file))
 
         if len(self.variants) != 1:
             raise ValidationError(
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import json
 import sys
+from collections.abc import MutableMapping
 from dataclasses import dataclass
 from dataclasses import field
+from functools import cached_property
 from typing import TYPE_CHECKING
 from typing import Any
 
+from variantlib import json_codec
 from variantlib.constants import NULL_VARIANT_LABEL
+from variantlib.constants import RESOLUTION_TABLE_PROPERTIES_KEY
+from variantlib.constants import RESOLUTION_TABLE_RANKS_KEY
+from variantlib.constants import VALIDATION_PROPERTY_REGEX
 from variantlib.constants import VALIDATION_VARIANT_LABEL_REGEX
 from variantlib.constants import VARIANT_INFO_DEFAULT_PRIO_KEY
 from variantlib.constants import VARIANT_INFO_FEATURE_KEY
@@ -20,6 +25,7 @@ from variantlib.constants import VARIANT_INFO_PROVIDER_OPTIONAL_KEY
 from variantlib.constants import VARIANT_INFO_PROVIDER_PLUGIN_API_KEY
 from variantlib.constants import VARIANT_INFO_PROVIDER_REQUIRES_KEY
 from variantlib.constants import VARIANT_INFO_STATIC_PROPERTIES_KEY
+from variantlib.constants import VARIANTS_JSON_RESOLUTION_TABLE_KEY
 from variantlib.constants import VARIANTS_JSON_SCHEMA_KEY
 from variantlib.constants import VARIANTS_JSON_SCHEMA_URL
 from variantlib.constants import VARIANTS_JSON_VARIANT_DATA_KEY
@@ -29,10 +35,15 @@ from variantlib.errors import ValidationError
 from variantlib.models.variant import VariantDescription
 from variantlib.models.variant_info import ProviderInfo
 from variantlib.models.variant_info import VariantInfo
+from variantlib.resolution_table import ResolutionTable
+from variantlib.validators.base import validate_list_matches_re
+from variantlib.validators.base import validate_matches_re
 from variantlib.validators.keytracking import KeyTrackingValidator
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
     from collections.abc import Generator
+    from collections.abc import Iterator
 
     from variantlib.protocols import VariantNamespace
 
@@ -46,10 +57,13 @@ else:
 @dataclass(init=False)
 class VariantsJson(VariantInfo):
     variants: dict[str, VariantDescription] = field(default_factory=dict)
+    # Optional precomputed resolution table, see `ResolutionTable`
+    resolution_table: ResolutionTable | None = field(default=None, compare=False)
 
     def __init__(self, variants_json: VariantsJsonDict | VariantInfo) -> None:
         """Init from pre-read ``variants.json`` data or another class"""
 
+        self.resolution_table = None
         if isinstance(variants_json, VariantInfo):
             # Convert from another related class.
             super().__init__(**variants_json.copy_as_kwargs())
@@ -87,8 +101,13 @@ class VariantsJson(VariantInfo):
             for namespace, provider_info in self.providers.items()
         }
 
-    def to_str(self) -> str:
-        """Serialize variants.json as a JSON string"""
+    def to_str(self, compact: bool = False) -> str:
+        """
+        Serialize variants.json as a JSON string
+
+        :param compact: Output a single line without whitespace, rather than
+                        an indented document.
+        """
 
         data: dict[str, Any] = {
             VARIANTS_JSON_SCHEMA_KEY: VARIANTS_JSON_SCHEMA_URL,
@@ -100,20 +119,54 @@ class VariantsJson(VariantInfo):
         }
         if self.static_properties:
             data[VARIANT_INFO_STATIC_PROPERTIES_KEY] = self.static_properties
+        if self.resolution_table is not None:
+            data[VARIANTS_JSON_RESOLUTION_TABLE_KEY] = self.resolution_table.to_dict()
+
+        return json_codec.dumps(data, compact=compact)
 
-        return json.dumps(data, indent=4, sort_keys=True)
+    def build_resolution_table(self) -> ResolutionTable:
+        """Build and attach the resolution table for the current variants"""
+        self.resolution_table = ResolutionTable.build(self.variants, self)
+        return self.resolution_table
 
     @property
     def provider_hash(self) -> int:
-        encoded_dict = json.dumps(self.providers_dict(), sort_keys=True).encode("utf-8")
+        encoded_dict = json_codec.dumps(self.providers_dict(), compact=True).encode(
+            "utf-8"
+        )
 
         return hash(encoded_dict)
 
+    @cached_property
+    def _merge_fingerprint(self) -> str:
+        """
+        Canonical serialization of the data that needs to match for merging
+
+        It is computed once per instance. Modifying priorities or providers
+        after the first `merge()` call is not supported.
+        """
+
+        return json_codec.dumps(
+            [
+                self.namespace_priorities,
+                self.feature_priorities,
+                self.property_priorities,
+                self.providers_dict(),
+            ],
+            compact=True,
+        )
+
     def merge(self, variant_dist_info: Self) -> None:
         """Merge info from another wheel (VariantsJson instance)"""
 
         # Merge the variant properties
         self.variants.update(variant_dist_info.variants)
+        # The resolution table needs to be rebuilt for the merged variants
+        self.resolution_table = None
+
+        # Fast path: priorities and providers are identical
+        if self._merge_fingerprint == variant_dist_info._merge_fingerprint:
+            return
 
         # Verify consistency of default priorities
         for attribute in (
@@ -142,8 +195,10 @@ class VariantsJson(VariantInfo):
 
             else:
                 # Otherwise, merge requirements and verify consistency
+                known_requires = set(old_provider_info.requires)
                 for req_str in provider_info.requires:
-                    if req_str not in old_provider_info.requires:
+                    if req_str not in known_requires:
+                        known_requires.add(req_str)
                         old_provider_info.requires.append(req_str)
                 for attribute in ("enable_if", "optional", "plugin_api"):
                     new = getattr(provider_info, attribute)
@@ -154,6 +209,9 @@ class VariantsJson(VariantInfo):
                             f"Expected: {old!r}, found: {new!r}"
                         )
 
+        # Providers have changed, invalidate the cache
+        self.__dict__.pop("_merge_fingerprint", None)
+
     def _get_expected_aot_namespaces(self) -> set[VariantNamespace]:
         return {
             namespace
@@ -170,26 +228,184 @@ class VariantsJson(VariantInfo):
             dict[str, VariantInfoJsonDict],
         ) as variants:
             validator.list_matches_re(VALIDATION_VARIANT_LABEL_REGEX)
-            variant_labels = list(variants.keys())
-            self.variants = {}
+            self._process_variants(validator, list(variants.keys()))
 
-            for variant_label in variant_labels:
-                with validator.get(
-                    variant_label,
-                    VariantInfoJsonDict,
-                    ignore_subkeys=True,
-                ) as packed_vdesc:
-                    vdesc = VariantDescription.from_dict(packed_vdesc)
-                    if vdesc.is_null_variant() and variant_label != NULL_VARIANT_LABEL:
-                        raise ValidationError(
-                            f"Null variant must use {NULL_VARIANT_LABEL!r} label"
-                        )
-                    if (
-                        not vdesc.is_null_variant()
-                        and variant_label == NULL_VARIANT_LABEL
-                    ):
-                        raise ValidationError(
-                            f"{NULL_VARIANT_LABEL!r} label can only be used for "
-                            "the null variant"
-                        )
-                    self.variants[variant_label] = vdesc
+        self._process_resolution_table(validator, variants.keys())
+
+    def _process_resolution_table(
+        self, validator: KeyTrackingValidator, variant_labels: Collection[str]
+    ) -> None:
+        with validator.get(
+            VARIANTS_JSON_RESOLUTION_TABLE_KEY, dict[str, Any], None
+        ) as resolution_table:
+            if resolution_table is None:
+                self.resolution_table = None
+                return
+
+            with validator.get(
+                RESOLUTION_TABLE_PROPERTIES_KEY,
+                dict[str, list[str]],
+                ignore_subkeys=True,
+            ):
+                validator.list_matches_re(VALIDATION_PROPERTY_REGEX)
+            with validator.get(
+                RESOLUTION_TABLE_RANKS_KEY,
+                dict[str, list[int]],
+                None,
+                ignore_subkeys=True,
+            ):
+                pass
+
+            self.resolution_table = ResolutionTable.from_dict(resolution_table)
+            try:
+                self.resolution_table.check_labels(variant_labels)
+            except ValidationError as err:
+                raise ValidationError(f"{validator.key}: {err}") from None
+
+    def _process_variants(
+        self, validator: KeyTrackingValidator, variant_labels: list[str]
+    ) -> None:
+        self.variants = {}
+
+        for variant_label in variant_labels:
+            self.variants[variant_label] = parse_variant(validator, variant_label)
+
+
+def parse_variant(
+    validator: KeyTrackingValidator, variant_label: str
+) -> VariantDescription:
+    """Parse and validate a single variant entry from the variants dict"""
+
+    with validator.get(
+        variant_label,
+        VariantInfoJsonDict,
+        ignore_subkeys=True,
+    ) as packed_vdesc:
+        vdesc = VariantDescription.from_dict(packed_vdesc)
+        check_variant_label(variant_label, vdesc.is_null_variant())
+    return vdesc
+
+
+def check_variant_label(variant_label: str, is_null_variant: bool) -> None:
+    """Verify that the null variant label is used if and only if appropriate"""
+
+    if is_null_variant and variant_label != NULL_VARIANT_LABEL:
+        raise ValidationError(f"Null variant must use {NULL_VARIANT_LABEL!r} label")
+    if not is_null_variant and variant_label == NULL_VARIANT_LABEL:
+        raise ValidationError(
+            f"{NULL_VARIANT_LABEL!r} label can only be used for the null variant"
+        )
+
+
+class LazyVariants(MutableMapping[str, VariantDescription]):
+    """
+    Mapping of variant labels to variant descriptions that parses
+    and validates every variant upon first access.
+
+    The raw ``variants.json`` data is kept until the variant is accessed
+    via `__getitem__()` (or any method using it), or `validate()` is
+    called. Iteration and membership checks do not parse the variants.
+    """
+
+    def __init__(self, raw_variants: dict[str, Any] | None = None) -> None:
+        self._entries: dict[str, Any] = dict(raw_variants or {})
+
+    def _parse(self, variant_label: str, data: Any) -> VariantDescription:
+        if VALIDATION_VARIANT_LABEL_REGEX.fullmatch(variant_label) is None:
+            # Report the same position as the eager validation would
+            validate_matches_re(
+                variant_label,
+                VALIDATION_VARIANT_LABEL_REGEX,
+                f"{VARIANTS_JSON_VARIANT_DATA_KEY}"
+                f"[{list(self._entries).index(variant_label)}]",
+            )
+
+        validator = KeyTrackingValidator(
+            VARIANTS_JSON_VARIANT_DATA_KEY, {variant_label: data}
+        )
+        return parse_variant(validator, variant_label)
+
+    def validate(self) -> None:
+        """Parse and validate all the variants that were not accessed yet"""
+
+        validate_list_matches_re(
+            list(self._entries),
+            VALIDATION_VARIANT_LABEL_REGEX,
+            VARIANTS_JSON_VARIANT_DATA_KEY,
+        )
+
+        unparsed = {
+            variant_label: data
+            for variant_label, data in self._entries.items()
+            if not isinstance(data, VariantDescription)
+        }
+        validator = KeyTrackingValidator(
+            None, {VARIANTS_JSON_VARIANT_DATA_KEY: unparsed}
+        )
+        with validator.get(
+            VARIANTS_JSON_VARIANT_DATA_KEY,
+            dict[str, VariantInfoJsonDict],
+        ):
+            for variant_label in unparsed:
+                self._entries[variant_label] = parse_variant(validator, variant_label)
+
+    def __getitem__(self, variant_label: str) -> VariantDescription:
+        data = self._entries[variant_label]
+        if isinstance(data, VariantDescription):
+            return data
+        vdesc = self._parse(variant_label, data)
+        self._entries[variant_label] = vdesc
+        return vdesc
+
+    def __setitem__(self, variant_label: str, vdesc: VariantDescription) -> None:
+        self._entries[variant_label] = vdesc
+
+    def __delitem__(self, variant_label: str) -> None:
+        del self._entries[variant_label]
+
+    def __contains__(self, variant_label: object) -> bool:
+        return variant_label in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+
+@dataclass(init=False)
+class LazyVariantsJson(VariantsJson):
+    """
+    `VariantsJson` that defers parsing the variants until they are used
+
+    The default priorities, providers and static properties are validated
+    immediately. The variants are validated upon first access, or when
+    `validate()` is called.
+    """
+
+    variants: LazyVariants = field(default_factory=LazyVariants)  # type: ignore[assignment]
+
+    def __init__(self, variants_json: VariantsJsonDict | VariantInfo) -> None:
+        super().__init__(variants_json)
+        if not isinstance(self.variants, LazyVariants):
+            self.variants = LazyVariants(self.variants)
+
+    def validate(self) -> None:
+        """Validate all the variants, with the same strictness as `VariantsJson`"""
+        self.variants.validate()
+
+    def _process(self, variant_table: VariantsJsonDict) -> None:
+        validator = KeyTrackingValidator(None, variant_table)  # type: ignore[arg-type]
+        self._process_common(validator)
+
+        with validator.get(
+            VARIANTS_JSON_VARIANT_DATA_KEY,
+            dict[str, Any],
+            ignore_subkeys=True,
+        ) as variants:
+            self.variants = LazyVariants(variants)
+
+        self._process_resolution_table(validator, variants.keys())
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+from variantlib.constants import VariantInfoJsonDict
+from variantlib.constants import VariantsJsonDict
+from variantlib.errors import ValidationError
+from variantlib.models.variant import VARIANT_HASH_LENGTH
+from variantlib.models.variant import VariantDescription
+from variantlib.models.variant import VariantProperty
+from variantlib.variants_json import VariantsJson
+from variantlib.variants_json import check_variant_label
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Iterator
+
+    from variantlib.models.variant_info import VariantInfo
+    from variantlib.validators.keytracking import KeyTrackingValidator
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+# Digests are stored as integers, they must fit in an unsigned 32-bit value
+assert VARIANT_HASH_LENGTH <= 8
+
+
+class VariantsTable(Mapping[str, VariantDescription]):
+    """
+    Read-only mapping of variant labels to variant descriptions, stored
+    in a columnar form.
+
+    Every distinct `VariantProperty` is stored only once in `properties`,
+    and variants refer to them by their index ("property ID"). The IDs
+    of the properties of the i-th variant are stored in
+    `property_ids[offsets[i]:offsets[i + 1]]`, in the same order as in
+    `VariantDescription.properties`.
+
+    `VariantDescription` objects are only created when variants are
+    accessed via the mapping API. The resolver can process the table
+    directly using the index-based methods.
+    """
+
+    def __init__(self) -> None:
+        self.properties: list[VariantProperty] = []
+        self.labels: list[str] = []
+        self.digests = array("L")
+        self.offsets = array("L", [0])
+        self.property_ids = array("L")
+        self._property_index: dict[tuple[str, str, str], int] = {}
+        self._label_index: dict[str, int] = {}
+
+    @classmethod
+    def from_mapping(cls, variants: Mapping[str, VariantDescription]) -> Self:
+        """Create a table from a mapping of labels to variant descriptions"""
+
+        table = cls()
+        for label, vdesc in variants.items():
+            table._append(
+                label,
+                [
+                    (vprop.namespace, vprop.feature, vprop.value)
+                    for vprop in vdesc.properties
+                ],
+            )
+        return table
+
+    def add(self, label: str, data: VariantInfoJsonDict) -> int:
+        """Add a variant from ``variants.json`` data, return its index"""
+
+        return self._append(
+            label,
+            [
+                (namespace, feature, value)
+                for namespace, features in data.items()
+                for feature, values in features.items()
+                for value in values
+            ],
+        )
+
+    def _intern_property(self, key: tuple[str, str, str]) -> int:
+        if (property_id := self._property_index.get(key)) is None:
+            namespace, feature, value = key
+            # VariantProperty validates the components
+            vprop = VariantProperty(
+                namespace=sys.intern(namespace),
+                feature=sys.intern(feature),
+                value=value,
+            )
+            property_id = len(self.properties)
+            self.properties.append(vprop)
+            self._property_index[key] = property_id
+        return property_id
+
+    def _append(self, label: str, keys: list[tuple[str, str, str]]) -> int:
+        if label in self._label_index:
+            raise ValidationError(f"Duplicate variant label: {label!r}")
+
+        # Use the same order as VariantDescription
+        keys.sort()
+        property_ids = [self._intern_property(key) for key in keys]
+        for prev_key, key in pairwise(keys):
+            if prev_key == key:
+                raise ValidationError(f"Duplicate value found: `{key}` in list.")
+
+        # Same algorithm as VariantDescription.hexdigest
+        hash_object = hashlib.sha256()
+        for property_id in property_ids:
+            hash_object.update(f"{self.properties[property_id].to_str()}\n".encode())
+
+        index = len(self.labels)
+        self.labels.append(label)
+        self._label_index[label] = index
+        self.digests.append(int(hash_object.hexdigest()[:VARIANT_HASH_LENGTH], 16))
+        self.property_ids.extend(property_ids)
+        self.offsets.append(len(self.property_ids))
+        return index
+
+    def index(self, label: str) -> int:
+        """Get the index of the variant with specified label"""
+        return self._label_index[label]
+
+    def get_property_ids(self, index: int) -> array[int]:
+        """Get the property IDs of the i-th variant"""
+        return self.property_ids[self.offsets[index] : self.offsets[index + 1]]
+
+    def iter_properties(self, index: int) -> Generator[VariantProperty]:
+        """Iterate over the properties of the i-th variant"""
+        for property_id in self.get_property_ids(index):
+            yield self.properties[property_id]
+
+    def is_null_variant(self, index: int) -> bool:
+        """Check if the i-th variant is a null variant"""
+        return self.offsets[index] == self.offsets[index + 1]
+
+    def hexdigest(self, index: int) -> str:
+        """Get the variant hash of the i-th variant"""
+        return f"{self.digests[index]:0{VARIANT_HASH_LENGTH}x}"
+
+    def get_description(self, index: int) -> VariantDescription:
+        """Create a `VariantDescription` for the i-th variant"""
+        return VariantDescription(list(self.iter_properties(index)))
+
+    def __getitem__(self, label: str) -> VariantDescription:
+        return self.get_description(self._label_index[label])
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._label_index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+
+@dataclass(init=False)
+class ColumnarVariantsJson(VariantsJson):
+    """
+    Read-only `VariantsJson` storing variants in a `VariantsTable`
+
+    It reduces the memory use for indexes with a large number of variants.
+    """
+
+    variants: VariantsTable = field(default_factory=VariantsTable)  # type: ignore[assignment]
+
+    def __init__(self, variants_json: VariantsJsonDict | VariantInfo) -> None:
+        super().__init__(variants_json)
+        if not isinstance(self.variants, VariantsTable):
+            self.variants = VariantsTable.from_mapping(self.variants)
+
+    def merge(self, variant_dist_info: Self) -> None:
+        raise TypeError(f"{self.__class__.__name__} is read-only")
+
+    def _process_variants(
+        self, validator: KeyTrackingValidator, variant_labels: list[str]
+    ) -> None:
+        self.variants = VariantsTable()
+
+        for variant_label in variant_labels:
+            with validator.get(
+                variant_label,
+                VariantInfoJsonDict,
+                ignore_subkeys=True,
+            ) as packed_vdesc:
+                index = self.variants.add(variant_label, packed_vdesc)
+                check_variant_label(variant_label, self.variants.is_null_variant(index))
@@ -0,0 +1,235 @@
+"""
+Persistent cache of isolated environments for variant provider plugins
+
+The environments are content-addressed, i.e. keyed by the set of provider
+requirements installed in them, the installer and the Python interpreter.
+They are stored in the user cache directory, and the least recently used
+environments are removed when the number of entries exceeds the limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import venv
+from contextlib import ExitStack
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+import platformdirs
+
+from variantlib import __package_name__
+from variantlib import json_codec
+from variantlib.utils import atomic_write_text
+from variantlib.utils import file_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from types import TracebackType
+
+if sys.version_info >= (3, 11):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of cached environments.
+VENV_CACHE_MAX_ENTRIES = 8
+
+# File marking a complete environment, holding its metadata. Its modification
+# time is used as the last use time.
+VENV_CACHE_MARKER_FILENAME = "variantlib-venv.json"
+
+
+def get_venv_cache_dir() -> pathlib.Path:
+    """Get the default cache directory for isolated environments"""
+    return platformdirs.user_cache_path(__package_name__, appauthor=False) / "venvs"
+
+
+def _find_uv() -> str:
+    try:
+        uv = importlib.import_module("uv")
+    except ModuleNotFoundError:
+        pass
+    else:
+        return str(uv.find_uv_bin())
+
+    if (uv_bin := shutil.which("uv")) is None:
+        raise RuntimeError("uv installer requested, but uv could not be found")
+    return uv_bin
+
+
+class CachedIsolatedEnv:
+    """
+    Isolated environment with provider requirements, stored in a persistent cache
+
+    The environment is created on the first use, and reused subsequently.
+    While the context manager is entered, a shared lock is held on the cache
+    entry, to prevent it from being removed by other processes.
+    """
+
+    def __init__(
+        self,
+        requirements: Collection[str],
+        *,
+        installer: str | None = None,
+        cache_dir: pathlib.Path | None = None,
+        max_entries: int = VENV_CACHE_MAX_ENTRIES,
+    ) -> None:
+        if installer not in (None, "pip", "uv"):
+            raise ValueError(f"unexpected installer={installer}")
+
+        self.requirements = sorted(set(requirements))
+        self.installer = installer or "pip"
+        self.cache_dir = cache_dir if cache_dir is not None else get_venv_cache_dir()
+        self.max_entries = max_entries
+        self._exit_stack: ExitStack | None = None
+
+        self._metadata = {
+            "installer": self.installer,
+            "python": sys.executable,
+            "python_version": sys.version,
+            "requirements": self.requirements,
+        }
+        self.key = hashlib.sha256(
+            json_codec.dumps(self._metadata, compact=True).encode()
+        ).hexdigest()[:32]
+
+    @property
+    def path(self) -> pathlib.Path:
+        """The location of the environment"""
+        return self.cache_dir / self.key
+
+    @property
+    def python_executable(self) -> str:
+        """The Python executable of the environment"""
+        if sys.platform == "win32":
+            return str(self.path / "Scripts" / "python.exe")
+        return str(self.path / "bin" / "python")
+
+    @property
+    def _lock_path(self) -> pathlib.Path:
+        return self.cache_dir / f"{self.key}.lock"
+
+    @property
+    def _marker_path(self) -> pathlib.Path:
+        return self.path / VENV_CACHE_MARKER_FILENAME
+
+    def __enter__(self) -> Self:
+        if self._exit_stack is not None:
+            raise RuntimeError("Already inside the context manager!")
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        exit_stack = ExitStack()
+        try:
+            while True:
+                with file_lock(self._lock_path):
+                    if not self._marker_path.exists():
+                        self._create()
+
+                # The environment may have been evicted after the exclusive lock
+                # was released, and before the shared lock was acquired.
+                exit_stack.enter_context(file_lock(self._lock_path, shared=True))
+                if self._marker_path.exists():
+                    break
+                exit_stack.close()
+
+            logger.info(
+                "Using cached isolated environment: %(path)s",
+                {"path": self.path},
+            )
+            os.utime(self._marker_path)
+            self._evict()
+        except BaseException:
+            exit_stack.close()
+            raise
+
+        self._exit_stack = exit_stack
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._exit_stack is None:
+            raise RuntimeError("Context manager not entered!")
+        self._exit_stack.close()
+        self._exit_stack = None
+
+    def _create(self) -> None:
+        # Remove the remnants of an incomplete environment, if any.
+        shutil.rmtree(self.path, ignore_errors=True)
+
+        logger.info(
+            "Creating cached isolated environment: %(path)s",
+            {"path": self.path},
+        )
+        try:
+            venv.EnvBuilder(
+                symlinks=sys.platform != "win32",
+                with_pip=self.installer == "pip" and bool(self.requirements),
+            ).create(self.path)
+            if self.requirements:
+                self._install(self.requirements)
+        except BaseException:
+            shutil.rmtree(self.path, ignore_errors=True)
+            raise
+
+        atomic_write_text(self._marker_path, json_codec.dumps(self._metadata))
+
+    def _install(self, requirements: list[str]) -> None:
+        logger.info(
+            "Installing packages in cached isolated environment: %(reqs)s",
+            {"reqs": ", ".join(requirements)},
+        )
+        if self.installer == "uv":
+            cmd = [_find_uv(), "pip", "install", "--python", self.python_executable]
+        else:
+            cmd = [
+                self.python_executable,
+                "-m",
+                "pip",
+                "install",
+                "--disable-pip-version-check",
+                "--no-input",
+            ]
+        subprocess.run(
+            [*cmd, *requirements],
+            capture_output=True,
+            check=True,
+        )
+
+    def _evict(self) -> None:
+        """Remove the least recently used environments over the limit"""
+
+        with file_lock(self.cache_dir / ".lock"):
+            entries: list[tuple[float, pathlib.Path]] = []
+            for path in self.cache_dir.iterdir():
+                with suppress(FileNotFoundError, NotADirectoryError):
+                    mtime = (path / VENV_CACHE_MARKER_FILENAME).stat().st_mtime
+                    entries.append((mtime, path))
+            entries.sort(reverse=True)
+
+            for _, path in entries[self.max_entries :]:
+                try:
+                    with file_lock(
+                        self.cache_dir / f"{path.name}.lock", blocking=False
+                    ):
+                        logger.info(
+                            "Removing unused cached isolated environment: %(path)s",
+                            {"path": path},
+                        )
+                        (path / VENV_CACHE_MARKER_FILENAME).unlink()
+                        shutil.rmtree(path, ignore_errors=True)
+                except BlockingIOError:
+                    # The environment is in use.
+                    continue
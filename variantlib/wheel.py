@@ -0,0 +1,377 @@
+"""Utilities for reading and rewriting variant metadata in wheels"""
+
+from __future__ import annotations
+
+import base64
+import copy
+import hashlib
+import io
+import struct
+import sys
+import urllib.request
+import zipfile
+from typing import TYPE_CHECKING
+
+from variantlib.constants import VARIANT_DIST_INFO_FILENAME
+from variantlib.variant_dist_info import VariantDistInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+    from _typeshed import WriteableBuffer
+
+# Buffer size used for remote wheels. zipfile does many small reads
+# when parsing member headers, the buffer lets us combine them.
+REMOTE_WHEEL_BUFFER_SIZE = 8192
+
+# Chunk size used when copying raw member data between wheels.
+RAW_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Local file header: signature, versions, flags, compression, time, date,
+# CRC, sizes, and the lengths of the file name and extra field.
+_LOCAL_HEADER_STRUCT = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_EXTRA_FIELD_STRUCT = struct.Struct("<HH")
+_ZIP64_EXTRA_ID = 0x0001
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+# Raw copies add members to `ZipFile` objects using their private attributes.
+# Other Python versions, or implementations lacking these attributes, fall
+# back to decompressing and recompressing the data.
+_RAW_COPY_PYTHON_VERSIONS = ((3, 10), (3, 13))
+_RAW_COPY_ZIPFILE_ATTRIBUTES = ("_seekable", "_writecheck", "_didModify", "start_dir")
+
+
+class HTTPRangeReader(io.RawIOBase):
+    """
+    Seekable read-only file object reading a remote file using HTTP range requests
+
+    Every `read()` call results in a single range request for the requested
+    bytes. The server must support range requests and report the file size
+    via ``Content-Length``.
+    """
+
+    def __init__(self, url: str, timeout: float | None = None) -> None:
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+        self.bytes_read = 0
+        self._position = 0
+
+        request = urllib.request.Request(url, method="HEAD")  # noqa: S310
+        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+            content_length = response.headers.get("Content-Length")
+        if content_length is None:
+            raise OSError(f"{url}: server did not report Content-Length")
+        self.size = int(content_length)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self.size - self._position)
+        if size <= 0:
+            return 0
+
+        request = urllib.request.Request(  # noqa: S310
+            self.url,
+            headers={"Range": f"bytes={self._position}-{self._position + size - 1}"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:  # noqa: S310
+            if response.status != 206:
+                raise OSError(f"{self.url}: server does not support range requests")
+            data = response.read(size)
+
+        view[: len(data)] = data
+        self._position += len(data)
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def open_remote_wheel(url: str, timeout: float | None = None) -> zipfile.ZipFile:
+    """
+    Open a remote wheel using HTTP range requests
+
+    Only the parts of the wheel that are actually read are downloaded,
+    i.e. the central directory and the members that are opened.
+
+    :param url: URL of the wheel.
+    :param timeout: Timeout for HTTP requests, in seconds.
+    :return: `zipfile.ZipFile` for reading the wheel.
+    """
+
+    return zipfile.ZipFile(
+        io.BufferedReader(
+            HTTPRangeReader(url, timeout=timeout),
+            buffer_size=REMOTE_WHEEL_BUFFER_SIZE,
+        )
+    )
+
+
+def get_variant_dist_info_path(
+    zip_file: zipfile.ZipFile, namever: str | None = None
+) -> str | None:
+    """
+    Find the path to the variant dist-info file in a wheel
+
+    The `{namever}.dist-info` directory is tried first. The wheel members
+    are scanned only if the directory does not match the wheel filename.
+
+    :param zip_file: Wheel opened as a `zipfile.ZipFile`.
+    :param namever: The `{name}-{version}` part of the wheel filename.
+    :return: Path to the file inside the wheel, or None if not found.
+    """
+
+    if namever is not None:
+        dist_info_dir = f"{namever}.dist-info"
+        path = f"{dist_info_dir}/{VARIANT_DIST_INFO_FILENAME}"
+        # ZipFile.getinfo() is a dict lookup.
+        for candidate in (path, f"{dist_info_dir}/METADATA"):
+            try:
+                zip_file.getinfo(candidate)
+            except KeyError:
+                continue
+            # If the dist-info directory exists, but there is no variant
+            # dist-info file, there is no point in scanning the wheel.
+            return path if candidate == path else None
+
+    for name in zip_file.namelist():
+        components = name.split("/", 2)
+        if (
+            len(components) == 2
+            and components[0].endswith(".dist-info")
+            and components[1] == VARIANT_DIST_INFO_FILENAME
+        ):
+            return name
+    return None
+
+
+def read_variant_dist_info(
+    zip_file: zipfile.ZipFile,
+    namever: str | None = None,
+    variant_label: str | None = None,
+) -> VariantDistInfo | None:
+    """
+    Read the variant dist-info file from a wheel
+
+    :param zip_file: Wheel opened as a `zipfile.ZipFile`.
+    :param namever: The `{name}-{version}` part of the wheel filename.
+    :param variant_label: Expected variant label, if any.
+    :return: Parsed `VariantDistInfo`, or None if the wheel has no variant
+             dist-info file.
+    """
+
+    if (path := get_variant_dist_info_path(zip_file, namever)) is None:
+        return None
+    return VariantDistInfo(zip_file.read(path), variant_label)
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Remove ZIP64 extra fields, they are regenerated when writing"""
+
+    fields = []
+    position = 0
+    while position + _EXTRA_FIELD_STRUCT.size <= len(extra):
+        field_id, field_size = _EXTRA_FIELD_STRUCT.unpack_from(extra, position)
+        end = position + _EXTRA_FIELD_STRUCT.size + field_size
+        if field_id != _ZIP64_EXTRA_ID:
+            fields.append(extra[position:end])
+        position = end
+    return b"".join(fields)
+
+
+def copy_zip_member_raw(
+    input_zip: zipfile.ZipFile,
+    output_zip: zipfile.ZipFile,
+    zinfo: zipfile.ZipInfo,
+) -> None:
+    """
+    Copy a member between zip files without recompressing it
+
+    The compressed data is transferred verbatim, along with the member
+    metadata (timestamps, permissions, compression method, CRC). If this
+    is not supported by the `zipfile` module in use, the data is
+    recompressed instead.
+
+    :param input_zip: Zip file opened for reading.
+    :param output_zip: Zip file opened for writing.
+    :param zinfo: Member of `input_zip` to copy.
+    """
+
+    _copy_zip_member_raw(input_zip, [output_zip], zinfo)
+
+
+def _zipfile_supports_raw_copy(zip_file: zipfile.ZipFile) -> bool:
+    """Check whether members can be added to the zip file without recompressing"""
+
+    min_version, max_version = _RAW_COPY_PYTHON_VERSIONS
+    return min_version <= sys.version_info[:2] <= max_version and all(
+        hasattr(zip_file, name) for name in _RAW_COPY_ZIPFILE_ATTRIBUTES
+    )
+
+
+def _copy_zip_member_raw(
+    input_zip: zipfile.ZipFile,
+    output_zips: Sequence[zipfile.ZipFile],
+    zinfo: zipfile.ZipInfo,
+) -> None:
+    # The compressed data is read once, and written to all outputs.
+    if input_zip.fp is None or any(output_zip.fp is None for output_zip in output_zips):
+        raise ValueError("Attempt to copy from or to a closed zip file")
+
+    new_zinfos = []
+    for _ in output_zips:
+        # The CRC and sizes are known already, so they are written into
+        # the local header instead of a trailing data descriptor.
+        new_zinfo = copy.copy(zinfo)
+        new_zinfo.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+        new_zinfo.extra = _strip_zip64_extra(zinfo.extra)
+        new_zinfos.append(new_zinfo)
+
+    if not all(map(_zipfile_supports_raw_copy, output_zips)):
+        data = input_zip.read(zinfo)
+        for output_zip, new_zinfo in zip(output_zips, new_zinfos, strict=True):
+            output_zip.writestr(new_zinfo, data)
+        return
+
+    input_fp = input_zip.fp
+    input_fp.seek(zinfo.header_offset)
+    header = input_fp.read(_LOCAL_HEADER_STRUCT.size)
+    if len(header) != _LOCAL_HEADER_STRUCT.size:
+        raise zipfile.BadZipFile(f"Truncated file header for {zinfo.filename!r}")
+    fields = _LOCAL_HEADER_STRUCT.unpack(header)
+    if fields[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad magic number for {zinfo.filename!r}")
+    # Skip the file name and the extra field.
+    input_fp.seek(fields[-2] + fields[-1], io.SEEK_CUR)
+
+    for output_zip, new_zinfo in zip(output_zips, new_zinfos, strict=True):
+        # This follows what `ZipFile.mkdir()` does to add a member.
+        output_fp = output_zip.fp
+        assert output_fp is not None
+        if output_zip._seekable:  # type: ignore[attr-defined]
+            output_fp.seek(output_zip.start_dir)
+        new_zinfo.header_offset = output_fp.tell()
+        output_zip._writecheck(new_zinfo)  # type: ignore[attr-defined]
+        output_zip._didModify = True  # type: ignore[attr-defined]
+        output_fp.write(new_zinfo.FileHeader())
+
+    remaining = zinfo.compress_size
+    while remaining > 0:
+        chunk = input_fp.read(min(remaining, RAW_COPY_CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for {zinfo.filename!r}")
+        for output_zip in output_zips:
+            output_zip.fp.write(chunk)  # type: ignore[union-attr]
+        remaining -= len(chunk)
+
+    for output_zip, new_zinfo in zip(output_zips, new_zinfos, strict=True):
+        output_zip.filelist.append(new_zinfo)
+        output_zip.NameToInfo[new_zinfo.filename] = new_zinfo
+        output_zip.start_dir = output_zip.fp.tell()  # type: ignore[union-attr]
+
+
+def _record_line(path: str, data: bytes) -> bytes:
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=")
+    return f"{path},sha256={digest.decode()},{len(data)}\n".encode()
+
+
+def rewrite_wheel_dist_info(
+    input_zip: zipfile.ZipFile,
+    output_zip: zipfile.ZipFile,
+    dist_info_files: Mapping[str, bytes | None],
+) -> None:
+    """
+    Copy a wheel, replacing files in its dist-info directory
+
+    All members are copied without recompressing them, except for
+    the dist-info `RECORD` file that is updated to match the changed
+    files. New files are added right before `RECORD`.
+
+    :param input_zip: Wheel opened for reading.
+    :param output_zip: Zip file opened for writing.
+    :param dist_info_files: Mapping of dist-info file names to their new
+                            contents, or to None to remove them.
+    """
+
+    rewrite_wheel_dist_info_many(input_zip, [(output_zip, dist_info_files)])
+
+
+def rewrite_wheel_dist_info_many(
+    input_zip: zipfile.ZipFile,
+    outputs: Sequence[tuple[zipfile.ZipFile, Mapping[str, bytes | None]]],
+) -> None:
+    """
+    Copy a wheel into multiple outputs, replacing files in its dist-info directory
+
+    This is equivalent to calling `rewrite_wheel_dist_info()` for every
+    output, except that the input wheel is read only once.
+
+    :param input_zip: Wheel opened for reading.
+    :param outputs: Sequence of zip files opened for writing, along with
+                    the mapping of dist-info file names to their new contents
+                    (or to None to remove them) for the respective output.
+    """
+
+    for file_info in input_zip.infolist():
+        components = file_info.filename.split("/", 2)
+        is_dist_info = len(components) == 2 and components[0].endswith(".dist-info")
+
+        if not is_dist_info or components[1] != "RECORD":
+            _copy_zip_member_raw(
+                input_zip,
+                [
+                    output_zip
+                    for output_zip, dist_info_files in outputs
+                    # Discard the existing copies of the replaced files, if any.
+                    if not is_dist_info or components[1] not in dist_info_files
+                ],
+                file_info,
+            )
+            continue
+
+        record = input_zip.read(file_info).splitlines(keepends=True)
+        for output_zip, dist_info_files in outputs:
+            # First, add new dist-info files prior to RECORD (not strictly
+            # required, but a nice convention).
+            new_paths = {
+                f"{components[0]}/{filename}".encode(): data
+                for filename, data in dist_info_files.items()
+            }
+            for path, data in new_paths.items():
+                if data is not None:
+                    output_zip.writestr(path.decode(), data)
+
+            # Update RECORD for the new checksums, skipping existing hashes
+            # for the discarded files.
+            new_record = [
+                line for line in record if line.rsplit(b",", 2)[0] not in new_paths
+            ]
+            new_record.extend(
+                _record_line(path.decode(), data)
+                for path, data in new_paths.items()
+                if data is not None
+            )
+            output_zip.writestr(copy.copy(file_info), b"".join(new_record))